@@ -2,26 +2,25 @@
 Context processors for the Horilla application.
 
 Provides sidebar, company, language, recently viewed items, notifications,
-and menu context for templates.
+and menu context for templates. The layout values are built once per user
+from a cached bundle (see ``horilla.utils.layout_context``) and are only
+evaluated on demand for HTMX partials.
 """
 
+import functools
+
 from django.conf import settings
 from django.utils.translation import get_language
 
 from horilla import __version__ as horilla_version
-from horilla.menu.floating_menu import get_floating_menu
-from horilla.menu.main_section_menu import get_main_section_menu
-from horilla.menu.my_settings_menu import get_my_settings_menu
-from horilla.menu.settings_menu import get_settings_menu
-from horilla.menu.sub_section_menu import get_sub_section_menu
-from horilla.utils.branding import load_branding
-from horilla_core.models import Company, RecentlyViewed
-from horilla_notifications.models import Notification
+from horilla.utils.branding import DEFAULTS as BRANDING_DEFAULTS
+from horilla.utils.layout_context import MENU_KEYS, is_partial_request, layout_values
+from horilla_core.models import RecentlyViewed
 
 
 def company_list(request):
     """Return all available companies."""
-    return {"available_companies": Company.objects.all()}
+    return layout_values(request, ["available_companies"])
 
 
 def allowed_languages(request):
@@ -43,30 +42,21 @@ def allowed_languages(request):
 
 def recently_viewed_items(request):
     """
-    Return the user's 6 most recently viewed items, cleaning invalid references.
+    Return the user's 6 most recently viewed items, resolved per content type
+    from a cached list of keys refreshed when the user views another record.
     """
     if request.user.is_authenticated:
-        items = []
-        for rv in RecentlyViewed.objects.filter(user=request.user).order_by(
-            "-viewed_at"
-        )[:6]:
-            try:
-                if rv.content_object:
-                    items.append(rv)
-            except Exception:
-                rv.delete()
-        return {"recently_viewed_items": items}
+        items = functools.partial(RecentlyViewed.objects.get_recent_items, request.user)
+        return {
+            "recently_viewed_items": items if is_partial_request(request) else items()
+        }
     return {}
 
 
 def unread_notifications(request):
     """Return unread notifications for the current user."""
     if request.user.is_authenticated:
-        return {
-            "unread_notifications": Notification.objects.filter(
-                user=request.user, read=False
-            ).order_by("-created_at")
-        }
+        return layout_values(request, ["unread_notifications"])
     return {}
 
 
@@ -79,11 +69,7 @@ def menu_context_processor(request):
     section_param = request.GET.get("section")
 
     return {
-        "main_section_menu": get_main_section_menu(request),
-        "sub_section_menu": get_sub_section_menu(request),
-        "settings_menu": get_settings_menu(request),
-        "floating_menu": get_floating_menu(request),
-        "my_settings_menu": get_my_settings_menu(request),
+        **layout_values(request, MENU_KEYS),
         "current_section": section_param,
         "current_app_label": current_app_label,
     }
@@ -96,19 +82,7 @@ def currency_context(request):
     """
     if not request.user.is_authenticated:
         return {}
-
-    from horilla_core.models import MultipleCurrency
-
-    user_currency = MultipleCurrency.get_user_currency(request.user)
-    default_currency = None
-
-    if hasattr(request.user, "company") and request.user.company:
-        default_currency = MultipleCurrency.get_default_currency(request.user.company)
-
-    return {
-        "user_currency": user_currency,
-        "default_currency": default_currency,
-    }
+    return layout_values(request, ["user_currency", "default_currency"])
 
 
 def branding(request):
@@ -117,4 +91,4 @@ def branding(request):
     dictionary containing branding configuration values such as
     TITLE, LOGIN_WELCOME_LINE, LOGO_PATH, etc.
     """
-    return load_branding()
+    return layout_values(request, BRANDING_DEFAULTS.keys())
@@ -0,0 +1,91 @@
+"""
+Helpers to compile Horilla's menu registries.
+
+Each registry flattens its registered classes once into an immutable tuple
+of entries (compiled on first use, after every app has registered its menus,
+and again if a menu registers later). A menu is then rendered for a frozen
+set of user permissions and memoized by that set, so users sharing a role
+share one rendered menu and no ``has_perm`` call is made per item.
+
+Rendered menus are shared between users and must be treated as read-only.
+"""
+
+# Standard library imports
+from types import MappingProxyType
+
+# Third-party imports (Django)
+from django.conf import settings
+
+# ``None`` stands for "every permission" (active superusers).
+ALL_PERMISSIONS = None
+
+
+def menu_cache_size():
+    """Number of distinct permission sets remembered per menu."""
+    return getattr(settings, "HORILLA_MENU_CACHE_SIZE", 256)
+
+
+def freeze(value):
+    """Return an immutable copy of a menu entry value."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Return a plain (template and pickle friendly) copy of a frozen value."""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def as_perm_list(perms):
+    """Normalise a ``perm`` attribute to a tuple of permission names."""
+    if not perms:
+        return ()
+    if isinstance(perms, str):
+        return (perms,)
+    return tuple(perms)
+
+
+def user_permission_set(user):
+    """
+    Return the frozen permission set of ``user``.
+
+    Matches ``user.has_perm`` under the model backend: inactive and anonymous
+    users have no permission, active superusers have all of them.
+    """
+    if user is None or not user.is_active:
+        return frozenset()
+    if user.is_superuser:
+        return ALL_PERMISSIONS
+    return frozenset(user.get_all_permissions())
+
+
+def request_permission_set(request):
+    """Return the permission set of the request's user, once per request."""
+    if not hasattr(request, "_menu_permissions"):
+        request._menu_permissions = user_permission_set(getattr(request, "user", None))
+    return request._menu_permissions
+
+
+def has_all_perms(perms, required):
+    """Return True when ``perms`` grants every permission in ``required``."""
+    return perms is ALL_PERMISSIONS or perms.issuperset(required)
+
+
+def has_any_perm(perms, required):
+    """Return True when ``perms`` grants one of ``required``, or none is needed."""
+    return not required or perms is ALL_PERMISSIONS or not perms.isdisjoint(required)
+
+
+def order_key(order):
+    """Sort key used by the registries: positives, then unset, then negatives."""
+    return (
+        0 if order is not None and order >= 0 else 1 if order is None else 2,
+        order if order is not None else 0,
+    )
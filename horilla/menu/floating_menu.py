@@ -2,33 +2,45 @@
 Floating menu system for Horilla, with registration and permission-based filtering.
 """
 
+from functools import lru_cache
 from typing import Any, Dict, List, Type
 
+from horilla.menu.compiler import (
+    as_perm_list,
+    freeze,
+    has_all_perms,
+    menu_cache_size,
+    request_permission_set,
+    thaw,
+)
+
 floating_registry: List[Any] = []
 
 
 def register(cls: Type[Any]):
     """Decorator to register a floating menu class."""
     floating_registry.append(cls)
+    compile_floating_menu.cache_clear()
+    _render_floating_menu.cache_clear()
     return cls
 
 
-def get_floating_menu(request=None) -> List[Dict]:
-    """Return all registered pages as dicts (optionally filter by request)."""
+@lru_cache(maxsize=None)
+def compile_floating_menu() -> tuple:
+    """
+    Flatten the registered classes into immutable ``(perms, page)`` entries.
+
+    Only pages whose ``items`` declare a ``perm`` can ever be shown.
+    """
     pages = []
     for cls in floating_registry:
         obj = cls()
         items = getattr(obj, "items", {}) or {}
-
-        perm_list = []
-        if "perm" in items:
-            if isinstance(items["perm"], str):
-                perm_list = [items["perm"]]
-            elif isinstance(items["perm"], (list, tuple)):
-                perm_list = items["perm"]
-
-        if callable(items):
-            items = items(request) or {}
+        if callable(items) or not isinstance(items.get("perm"), (str, list, tuple)):
+            continue
+        perm_list = as_perm_list(items["perm"])
+        if not perm_list:
+            continue
 
         data = {
             "title": getattr(obj, "title", None),
@@ -36,13 +48,25 @@ def get_floating_menu(request=None) -> List[Dict]:
             "icon": getattr(obj, "icon", None),
             "items": items,
         }
+        pages.append((perm_list, freeze(data)))
+    return tuple(pages)
 
-        if (
-            request
-            and request.user.is_authenticated
-            and perm_list
-            and request.user.has_perms(perm_list)
-        ):
-            pages.append(data)
 
-    return pages
+@lru_cache(maxsize=menu_cache_size())
+def _render_floating_menu(perms) -> List[Dict]:
+    return [
+        thaw(data)
+        for perm_list, data in compile_floating_menu()
+        if has_all_perms(perms, perm_list)
+    ]
+
+
+def get_floating_menu(request=None) -> List[Dict]:
+    """
+    Return all registered pages as dicts (optionally filter by request).
+
+    The result is memoized per permission set and must not be modified.
+    """
+    if not request or not request.user.is_authenticated:
+        return []
+    return _render_floating_menu(request_permission_set(request))
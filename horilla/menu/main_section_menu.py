@@ -2,8 +2,11 @@
 This module defines a registry for managing main section menu entries in Horilla.
 """
 
+from functools import lru_cache
 from typing import Any, Dict, List, Type
 
+from horilla.menu.compiler import freeze, order_key, thaw
+
 # Registry to hold all main section menu classes
 main_section_menu: List[Any] = []
 
@@ -11,36 +14,41 @@ main_section_menu: List[Any] = []
 def register(cls: Type[Any]):
     """Decorator to register a main section menu class."""
     main_section_menu.append(cls)
+    compile_main_section_menu.cache_clear()
+    _render_main_section_menu.cache_clear()
     return cls
 
 
+@lru_cache(maxsize=None)
+def compile_main_section_menu() -> tuple:
+    """Flatten the registered classes into immutable entries, sorted by position."""
+    pages = []
+    for cls in main_section_menu:
+        obj = cls()
+        pages.append(
+            {
+                "section": getattr(obj, "section", None),
+                "name": getattr(obj, "name", None),
+                "url": getattr(obj, "url", None),
+                "icon": getattr(obj, "icon", None),
+                "position": getattr(obj, "position", None),
+            }
+        )
+    pages.sort(key=lambda x: order_key(x["position"]))
+    return freeze(pages)
+
+
+@lru_cache(maxsize=None)
+def _render_main_section_menu() -> List[Dict]:
+    return thaw(compile_main_section_menu())
+
+
 def get_main_section_menu(request=None) -> List[Dict]:
     """
     Return all registered main section menu items.
 
     Returns:
         A list of dictionaries representing menu items, sorted by position.
+        The list is shared between requests and must not be modified.
     """
-    pages = []
-    for cls in main_section_menu:
-        obj = cls()
-        item = {
-            "section": getattr(obj, "section", None),
-            "name": getattr(obj, "name", None),
-            "url": getattr(obj, "url", None),
-            "icon": getattr(obj, "icon", None),
-            "position": getattr(obj, "position", None),
-        }
-        pages.append(item)
-
-    pages.sort(
-        key=lambda x: (
-            (
-                0
-                if x["position"] is not None and x["position"] >= 0
-                else 1 if x["position"] is None else 2
-            ),
-            x["position"] if x["position"] is not None else 0,
-        )
-    )
-    return pages
+    return _render_main_section_menu()
@@ -2,35 +2,45 @@
 My settings menu system for Horilla, with registration and permission-based filtering.
 """
 
+from functools import lru_cache
 from typing import Any, List, Type
 
+from horilla.menu.compiler import (
+    ALL_PERMISSIONS,
+    as_perm_list,
+    freeze,
+    has_all_perms,
+    menu_cache_size,
+    order_key,
+    request_permission_set,
+    thaw,
+)
+
 my_settings_menu: List[Any] = []
 
 
 def register(cls: Type[Any]):
     """Decorator to register a settings menu class."""
     my_settings_menu.append(cls)
+    compile_my_settings_menu.cache_clear()
+    _render_my_settings_menu.cache_clear()
     return cls
 
 
-def get_my_settings_menu(request=None) -> list[dict]:
-    """Return registered settings menu items, filtered by conditions and permissions."""
-    items = []
+@lru_cache(maxsize=None)
+def compile_my_settings_menu() -> tuple:
+    """
+    Flatten the registered classes into immutable ``(condition, perms, item)``
+    entries sorted by order. Request dependent conditions stay callables.
+    """
+    entries = []
     for cls in my_settings_menu:
         obj = cls()
 
         condition = getattr(obj, "condition", True)
-        if callable(condition):
-            if not request or not condition(request):
-                continue
-        elif not condition:
+        if not callable(condition) and not condition:
             continue
 
-        perms = getattr(obj, "permissions", [])
-        if perms and request:
-            if not request.user.is_authenticated or not request.user.has_perms(perms):
-                continue
-
         data = {
             "title": getattr(obj, "title", None),
             "url": getattr(obj, "url", None),
@@ -39,16 +49,31 @@ def get_my_settings_menu(request=None) -> list[dict]:
             "order": getattr(obj, "order", 100),
             "attrs": getattr(obj, "attrs", {}),
         }
-        items.append(data)
-
-    return sorted(
-        items,
-        key=lambda x: (
-            (
-                0
-                if x["order"] is not None and x["order"] >= 0
-                else 1 if x["order"] is None else 2
-            ),
-            x["order"] if x["order"] is not None else 0,
-        ),
+        perms = as_perm_list(getattr(obj, "permissions", []))
+        entries.append((condition, perms, freeze(data)))
+
+    entries.sort(key=lambda x: order_key(x[2]["order"]))
+    return tuple(entries)
+
+
+@lru_cache(maxsize=menu_cache_size())
+def _render_my_settings_menu(perms) -> tuple:
+    return tuple(
+        (condition, thaw(data))
+        for condition, required, data in compile_my_settings_menu()
+        if has_all_perms(perms, required)
     )
+
+
+def get_my_settings_menu(request=None) -> list[dict]:
+    """
+    Return registered settings menu items, filtered by conditions and permissions.
+
+    The items are memoized per permission set and must not be modified.
+    """
+    perms = request_permission_set(request) if request else ALL_PERMISSIONS
+    return [
+        data
+        for condition, data in _render_my_settings_menu(perms)
+        if not callable(condition) or (request and condition(request))
+    ]
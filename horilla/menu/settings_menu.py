@@ -2,84 +2,128 @@
 Settings menu registry for Horilla, managing settings pages with permissions and ordering.
 """
 
+from collections import namedtuple
+from functools import lru_cache
 from typing import Any, Dict, List, Type
 
+from horilla.menu.compiler import (
+    freeze,
+    has_any_perm,
+    menu_cache_size,
+    order_key,
+    request_permission_set,
+    thaw,
+)
+
 settings_registry: List[Any] = []
 
+# ``dynamic`` pages have request dependent conditions or items and are
+# evaluated per request; the others are memoized per permission set.
+SettingsPage = namedtuple("SettingsPage", "condition title icon items dynamic")
+
 
 def register(cls: Type[Any]):
     """Decorator to register a settings page class."""
     settings_registry.append(cls)
+    compile_settings_menu.cache_clear()
+    _render_static_settings_menu.cache_clear()
     return cls
 
 
-def get_settings_menu(request=None) -> List[Dict]:
-    """Return all registered settings pages as dicts (optionally filter by request)."""
-    pages = []
+def _item_order(item):
+    return order_key(item.get("order") if isinstance(item, dict) else None)
+
 
+@lru_cache(maxsize=None)
+def compile_settings_menu() -> tuple:
+    """Flatten the registered settings pages into immutable, ordered entries."""
+    pages = []
     for cls in sorted(
-        settings_registry,
-        key=lambda c: (
-            (
-                0
-                if hasattr(c, "order") and getattr(c, "order") >= 0
-                else 1 if not hasattr(c, "order") else 2
-            ),
-            getattr(c, "order", 0),
-        ),
+        settings_registry, key=lambda c: order_key(getattr(c, "order", None))
     ):
         obj = cls()
 
         condition = getattr(obj, "condition", True)
-        if callable(condition):
-            if not request or not condition(request):
-                continue
-        elif not condition:
+        if not callable(condition) and not condition:
             continue
 
-        data = {
-            "title": getattr(obj, "title", None),
-            "icon": getattr(obj, "icon", None),
-            "items": [],
-        }
-
-        perm_list = []
-        items = getattr(obj, "items", [])
-        items = sorted(
-            items,
-            key=lambda i: (
-                0 if "order" in i and i["order"] >= 0 else 1 if "order" not in i else 2,
-                i.get("order", 0),
-            ),
+        items = tuple(
+            item if callable(item) else freeze(item)
+            for item in sorted(getattr(obj, "items", []), key=_item_order)
+        )
+        dynamic = callable(condition) or any(
+            callable(item) or callable(item.get("condition", True)) for item in items
+        )
+        pages.append(
+            SettingsPage(
+                condition,
+                getattr(obj, "title", None),
+                getattr(obj, "icon", None),
+                items,
+                dynamic,
+            )
         )
+    return tuple(pages)
+
+
+def _page_data(page, perms, request=None):
+    """Return the page dict for ``perms``, or None when it is not visible."""
+    if callable(page.condition) and (not request or not page.condition(request)):
+        return None
+
+    data = {
+        "title": page.title,
+        "icon": page.icon,
+        "items": [],
+    }
 
-        for item in items:
-            if callable(item):
-                item = item(request) or {}
-                if not item:
-                    continue
-
-            item_condition = item.get("condition", True)
-            if callable(item_condition):
-                if not request or not item_condition(request):
-                    continue
-            elif not item_condition:
+    perm_list = []
+    for item in page.items:
+        if callable(item):
+            item = item(request) or {}
+            if not item:
                 continue
 
-            data["items"].append(item)
+        item_condition = item.get("condition", True)
+        if callable(item_condition):
+            if not request or not item_condition(request):
+                continue
+        elif not item_condition:
+            continue
 
-            if (
-                isinstance(item, dict)
-                and item.get("perm")
-                and isinstance(item["perm"], str)
-            ):
-                perm_list.append(item["perm"])
+        data["items"].append(thaw(item))
 
-        if (
-            request
-            and request.user.is_authenticated
-            and (not perm_list or request.user.has_any_perms(perm_list))
-        ):
-            pages.append(data)
+        if item.get("perm") and isinstance(item["perm"], str):
+            perm_list.append(item["perm"])
+
+    if has_any_perm(perms, perm_list):
+        return data
+    return None
+
+
+@lru_cache(maxsize=menu_cache_size())
+def _render_static_settings_menu(perms) -> tuple:
+    return tuple(
+        None if page.dynamic else _page_data(page, perms)
+        for page in compile_settings_menu()
+    )
 
+
+def get_settings_menu(request=None) -> List[Dict]:
+    """
+    Return all registered settings pages as dicts (optionally filter by request).
+
+    Pages without request dependent conditions are memoized per permission
+    set and must not be modified.
+    """
+    if not request or not request.user.is_authenticated:
+        return []
+
+    perms = request_permission_set(request)
+    pages = []
+    for page, data in zip(compile_settings_menu(), _render_static_settings_menu(perms)):
+        if page.dynamic:
+            data = _page_data(page, perms, request)
+        if data:
+            pages.append(data)
     return pages
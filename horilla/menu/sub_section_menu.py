@@ -3,8 +3,20 @@ Module that provides a registry for managing and retrieving sub-section in the s
 """
 
 from collections import defaultdict
+from functools import lru_cache
 from typing import Any, Dict, List, Type
 
+from horilla.menu.compiler import (
+    ALL_PERMISSIONS,
+    as_perm_list,
+    freeze,
+    has_all_perms,
+    has_any_perm,
+    menu_cache_size,
+    request_permission_set,
+    thaw,
+)
+
 # Registry to hold all subsection menu classes
 sub_section_menu: List[Any] = []
 
@@ -12,37 +24,25 @@ sub_section_menu: List[Any] = []
 def register(cls: Type[Any]):
     """Decorator to register a main sub-section menu class."""
     sub_section_menu.append(cls)
+    compile_sub_section_menu.cache_clear()
+    _render_sub_section_menu.cache_clear()
     return cls
 
 
-def get_sub_section_menu(request=None) -> Dict[str, List[Dict]]:
+@lru_cache(maxsize=None)
+def compile_sub_section_menu() -> tuple:
     """
-    Return all registered main sub-sections grouped by section name,
-    filtered by user permissions.
+    Flatten the registered classes into immutable
+    ``(section, perms, all_perms, item)`` entries, sorted by position.
     """
-    sections = defaultdict(list)
-
+    entries = []
     for cls in sub_section_menu:
         obj = cls()
         section_name = getattr(obj, "section", None)
-        perm = getattr(obj, "perm", [])
-
-        if isinstance(perm, str):
-            perm = [perm]
-
+        if not section_name:
+            continue
+        perm = as_perm_list(getattr(obj, "perm", []))
         all_perms = getattr(obj, "all_perms", False)
-
-        # Skip items if user doesn't have required perms
-        if request and request.user:
-            if all_perms:
-                # user must have ALL permissions
-                if not all(request.user.has_perm(p) for p in perm):
-                    continue
-            else:
-                # user must have at least ONE permission
-                if perm and not any(request.user.has_perm(p) for p in perm):
-                    continue
-
         item = {
             "label": getattr(obj, "verbose_name", None),
             "icon": getattr(obj, "icon", None),
@@ -50,19 +50,43 @@ def get_sub_section_menu(request=None) -> Dict[str, List[Dict]]:
             "class": getattr(obj, "css_class", "sidebar-link"),
             "app_label": getattr(obj, "app_label", None),
             "perm": {
-                "perms": perm,
+                "perms": list(perm),
                 "all_perms": all_perms,
             },
             "position": getattr(obj, "position", None),
             "attrs": getattr(obj, "attrs", {}),
         }
+        entries.append((section_name, perm, all_perms, freeze(item)))
 
-        if section_name:
-            sections[section_name].append(item)
+    entries.sort(key=lambda x: (x[3]["position"] is None, x[3]["position"]))
+    return tuple(entries)
 
-    for items in sections.values():
-        items.sort(key=lambda x: (x["position"] is None, x["position"]))
-    return sections
+
+@lru_cache(maxsize=menu_cache_size())
+def _render_sub_section_menu(perms) -> Dict[str, List[Dict]]:
+    sections = defaultdict(list)
+    for section_name, perm, all_perms, item in compile_sub_section_menu():
+        if all_perms:
+            # user must have ALL permissions
+            if not has_all_perms(perms, perm):
+                continue
+        # user must have at least ONE permission
+        elif not has_any_perm(perms, perm):
+            continue
+        sections[section_name].append(thaw(item))
+    return dict(sections)
+
+
+def get_sub_section_menu(request=None) -> Dict[str, List[Dict]]:
+    """
+    Return all registered main sub-sections grouped by section name,
+    filtered by user permissions.
+
+    The result is memoized per permission set and must not be modified.
+    """
+    if request and request.user:
+        return _render_sub_section_menu(request_permission_set(request))
+    return _render_sub_section_menu(ALL_PERMISSIONS)
 
 
 # def get_sub_section_menu(request=None) -> Dict[str, List[Dict]]:
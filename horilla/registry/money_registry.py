@@ -0,0 +1,55 @@
+"""
+Money field registry for Horilla.
+
+Apps register the fields that store amounts in the company's base
+currency. When a company switches its base currency, every registered
+field of the company's records is re-converted in one statement per field
+(see ``horilla_core.services.currency_conversion``).
+"""
+
+from collections import namedtuple
+
+from django.apps import apps
+
+MoneyFields = namedtuple("MoneyFields", ["model", "fields", "company_lookup"])
+
+# (app_label, model_name) -> (fields or None, company_lookup)
+MONEY_FIELD_REGISTRY = {}
+
+
+def register_money_fields(app_label, model_name, fields=None, company_lookup="company"):
+    """
+    Register the money fields of a model.
+
+    Args:
+        app_label: App label of the model (e.g., "leads")
+        model_name: Model class name (e.g., "Lead")
+        fields: Field names; defaults to the model's ``CURRENCY_FIELDS``
+        company_lookup: Lookup from the model to its company
+            (e.g., "owner__company")
+
+    Example:
+        register_money_fields("leads", "Lead")
+        register_money_fields(
+            "forecast", "Forecast", ["target_amount"], "owner__company"
+        )
+    """
+    MONEY_FIELD_REGISTRY[(app_label, model_name)] = (
+        tuple(fields) if fields is not None else None,
+        company_lookup,
+    )
+
+
+def get_money_fields():
+    """Return a ``MoneyFields`` entry for every registered, installed model."""
+    entries = []
+    for (app_label, model_name), (fields, lookup) in MONEY_FIELD_REGISTRY.items():
+        try:
+            model = apps.get_model(app_label, model_name)
+        except LookupError:
+            continue
+        if fields is None:
+            fields = tuple(getattr(model, "CURRENCY_FIELDS", ()))
+        if fields:
+            entries.append(MoneyFields(model, fields, lookup))
+    return entries
@@ -0,0 +1,70 @@
+"""
+Relation registry for Horilla models.
+
+Maps every model to the models that reference it through a ForeignKey and
+lists the models carrying a GenericForeignKey. The graph is built once per
+process (warmed when horilla_core is ready), so history lookups do not walk
+``apps.get_models()`` and every model's fields on each request.
+"""
+
+from collections import defaultdict
+
+from django.apps import apps
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.db import models
+
+_RELATION_GRAPH = None
+
+
+def build_relation_graph():
+    """
+    Build and store the relation graph.
+
+    Returns a ``(fk_relations, generic_relations)`` pair where
+    ``fk_relations`` maps a target model to ``{model: [fk field names]}``
+    and ``generic_relations`` lists ``(model, [(ct_field, fk_field), ...])``.
+    """
+    global _RELATION_GRAPH
+
+    fk_relations = defaultdict(dict)
+    generic_relations = []
+    for model in apps.get_models():
+        opts = model._meta
+        for field in opts.get_fields():
+            if isinstance(field, models.ForeignKey):
+                fk_relations[field.related_model].setdefault(model, []).append(
+                    field.name
+                )
+        gfks = [
+            (field.ct_field, field.fk_field)
+            for field in opts.private_fields
+            if isinstance(field, GenericForeignKey)
+        ]
+        if gfks:
+            generic_relations.append((model, gfks))
+
+    _RELATION_GRAPH = (dict(fk_relations), generic_relations)
+    return _RELATION_GRAPH
+
+
+def get_relation_graph():
+    """Return the relation graph, building it on first use."""
+    if _RELATION_GRAPH is None:
+        return build_relation_graph()
+    return _RELATION_GRAPH
+
+
+def fk_relations_to(model):
+    """Return ``{model: [fk field names]}`` of the ForeignKeys to ``model``."""
+    return get_relation_graph()[0].get(model, {})
+
+
+def generic_relations():
+    """Return the models with GenericForeignKeys and their field pairs."""
+    return get_relation_graph()[1]
+
+
+def clear_relation_graph():
+    """Drop the graph, e.g. after models were registered at runtime."""
+    global _RELATION_GRAPH
+    _RELATION_GRAPH = None
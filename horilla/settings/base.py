@@ -201,6 +201,21 @@ else:
 # Connection persistence for better performance
 DATABASES["default"]["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
 
+# Cache
+# Permission matrices, layout and scoring versions are shared between
+# processes through the cache, so multi-process deployments should set
+# CACHE_URL (e.g. redis://127.0.0.1:6379/1). Without it each process keeps
+# its own cache and trusts cached values for HORILLA_PROCESS_CACHE_TIMEOUT
+# seconds only.
+if env("CACHE_URL", default=None):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env("CACHE_URL"),
+        }
+    }
+HORILLA_PROCESS_CACHE_TIMEOUT = env.int("HORILLA_PROCESS_CACHE_TIMEOUT", default=30)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -373,6 +388,13 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Scheduled export files are only served through signed download links, so
+# they are kept outside MEDIA_ROOT, which is served without authentication.
+HORILLA_EXPORT_ROOT = env(
+    "HORILLA_EXPORT_ROOT",
+    default=str(BASE_DIR / "private_media" / "scheduled_exports"),
+)
+
 TIME_ZONE = "UTC"
 
 AUDITLOG_INCLUDE_ALL_MODELS = True
@@ -380,6 +402,7 @@ AUDITLOG_EXCLUDE_TRACKING_MODELS = (
     "horilla_core.RecentlyViewed",
     "horilla_core.ActiveTab",
     "horilla_core.ListColumnVisibility",
+    "forecast.ForecastFact",
 )
 
 
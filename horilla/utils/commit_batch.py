@@ -0,0 +1,62 @@
+"""
+Work collected during a transaction and run once after it commits.
+
+Signal handlers that refresh derived data (campaign metrics, module
+rescoring, forecast facts) are called once per saved record. A
+:class:`CommitBatch` gathers the items they name and hands them to its
+``flush`` callable in one call when the transaction commits, right away in
+autocommit mode::
+
+    campaign_batch = CommitBatch(refresh_campaign_metrics)
+    campaign_batch.add([campaign_id])
+
+Every ``add`` registers its own ``transaction.on_commit`` callback, so a
+savepoint rolled back with its callbacks never leaves the batch without
+one; the first callback that runs takes every pending item and the others
+find nothing left. Items added inside a rolled back block are flushed with
+the next commit of the thread, which only costs a redundant refresh.
+"""
+
+# Standard library imports
+import threading
+
+# Third-party imports (Django)
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+
+class CommitBatch:
+    """Items pending per thread and database, flushed once per commit."""
+
+    def __init__(self, flush):
+        self.flush = flush
+        self._state = threading.local()
+
+    def _pending(self, using):
+        pending = getattr(self._state, using, None)
+        if pending is None:
+            pending = {}
+            setattr(self._state, using, pending)
+        return pending
+
+    def add(self, items, using=DEFAULT_DB_ALIAS):
+        """Flush ``items`` with the rest of the batch once the transaction commits."""
+        pending = self._pending(using)
+        added = False
+        for item in items:
+            pending[item] = None
+            added = True
+        if added:
+            transaction.on_commit(lambda: self.run(using), using=using)
+
+    def take(self, using=DEFAULT_DB_ALIAS):
+        """Remove and return the pending items."""
+        pending = self._pending(using)
+        items = list(pending)
+        pending.clear()
+        return items
+
+    def run(self, using=DEFAULT_DB_ALIAS):
+        """Flush the pending items now."""
+        items = self.take(using)
+        if items:
+            self.flush(items)
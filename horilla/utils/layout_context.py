@@ -0,0 +1,199 @@
+"""
+Per-user layout context for Horilla's global context processors.
+
+Every full page renders the same header and sidebars: companies, unread
+notifications, the registered menus filtered by the user's permissions,
+currencies and branding. ``get_layout_context`` builds these values once per
+(user, company, language, layout version) and keeps the bundle in the cache.
+Signal handlers retire cached bundles by bumping the global layout version
+(permissions, roles, groups, companies, currencies, settings read by menu
+conditions) or a user's own version (the user's permissions, profile and
+notifications); bumps take effect when the change commits. Without a shared
+cache other processes never see the bumps, so bundles are then kept for
+``HORILLA_PROCESS_CACHE_TIMEOUT`` seconds at most.
+
+HTMX partials rarely render the layout, so for them each value is handed to
+the template as a callable that is only evaluated when the partial uses it.
+"""
+
+# Standard library imports
+import functools
+import uuid
+
+# Third-party imports (Django)
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import get_language
+
+# First-party / Horilla imports
+from horilla.menu.floating_menu import get_floating_menu
+from horilla.menu.main_section_menu import get_main_section_menu
+from horilla.menu.my_settings_menu import get_my_settings_menu
+from horilla.menu.settings_menu import get_settings_menu
+from horilla.menu.sub_section_menu import get_sub_section_menu
+from horilla.utils.branding import load_branding
+from horilla.utils.process_cache import shared_timeout
+from horilla_core.models import MultipleCurrency
+from horilla_core.services.company_registry import company_list
+from horilla_notifications.models import Notification
+
+LAYOUT_VERSION_KEY = "layout_context:version"
+USER_LAYOUT_VERSION_KEY = "layout_context:user:{}"
+
+MENU_KEYS = (
+    "main_section_menu",
+    "sub_section_menu",
+    "settings_menu",
+    "floating_menu",
+    "my_settings_menu",
+)
+
+
+class NotificationList(list):
+    """Cached unread notifications that still answer ``.count`` in templates."""
+
+    def count(self, *args):
+        if args:
+            return super().count(*args)
+        return len(self)
+
+
+def layout_cache_timeout():
+    """Seconds a layout bundle is kept when no change retires it earlier."""
+    return getattr(settings, "HORILLA_LAYOUT_CONTEXT_TIMEOUT", 300)
+
+
+def _version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_layout_version():
+    """
+    Retire the layout bundles of every user once the current transaction
+    commits, so no request can cache the old rows under the new version.
+    """
+    transaction.on_commit(
+        lambda: cache.set(LAYOUT_VERSION_KEY, uuid.uuid4().hex, None), robust=True
+    )
+
+
+def bump_user_layout_version(*user_ids):
+    """Retire the layout bundles of the given users once the change commits."""
+    versions = {
+        USER_LAYOUT_VERSION_KEY.format(pk): uuid.uuid4().hex for pk in user_ids if pk
+    }
+    if versions:
+        transaction.on_commit(lambda: cache.set_many(versions, None), robust=True)
+
+
+def layout_version(user_id):
+    """Return the (global, per-user) version pair of ``user_id``'s layout."""
+    return _version(LAYOUT_VERSION_KEY), _version(
+        USER_LAYOUT_VERSION_KEY.format(user_id)
+    )
+
+
+def is_partial_request(request):
+    """Return True for HTMX requests that swap a fragment, not a whole page."""
+    headers = request.headers
+    return (
+        headers.get("HX-Request") == "true"
+        and headers.get("HX-Boosted") != "true"
+        and headers.get("HX-History-Restore-Request") != "true"
+    )
+
+
+def _without_callables(value):
+    """Drop callables (already evaluated conditions) so the bundle pickles."""
+    if isinstance(value, dict):
+        return {k: _without_callables(v) for k, v in value.items() if not callable(v)}
+    if isinstance(value, list):
+        return [_without_callables(v) for v in value]
+    return value
+
+
+def build_layout_context(request):
+    """Compute the layout values for ``request`` without using the cache."""
+    user = request.user
+    context = {
+        "available_companies": company_list(),
+        "main_section_menu": get_main_section_menu(request),
+        "sub_section_menu": get_sub_section_menu(request),
+        "settings_menu": _without_callables(get_settings_menu(request)),
+        "floating_menu": get_floating_menu(request),
+        "my_settings_menu": get_my_settings_menu(request),
+    }
+    context.update(load_branding())
+
+    if user.is_authenticated:
+        context["unread_notifications"] = NotificationList(
+            Notification.objects.filter(user=user, read=False).order_by("-created_at")
+        )
+        context["user_currency"] = MultipleCurrency.get_user_currency(user)
+        context["default_currency"] = (
+            MultipleCurrency.get_default_currency(user.company)
+            if getattr(user, "company", None)
+            else None
+        )
+    return context
+
+
+def layout_cache_key(request):
+    """Cache key of the bundle for the request's user, company and language."""
+    user = request.user
+    company = getattr(request, "active_company", None)
+    return ":".join(
+        str(part)
+        for part in (
+            "layout_context",
+            user.pk,
+            company.pk if company else None,
+            get_language(),
+            *layout_version(user.pk),
+        )
+    )
+
+
+def get_layout_context(request):
+    """
+    Return the layout values for ``request``.
+
+    The bundle is computed at most once per request and, for signed-in users,
+    shared through the cache until it expires or a change retires it.
+    """
+    context = getattr(request, "_layout_context", None)
+    if context is not None:
+        return context
+
+    if not request.user.is_authenticated:
+        context = build_layout_context(request)
+    else:
+        key = layout_cache_key(request)
+        context = cache.get(key)
+        if context is None:
+            context = build_layout_context(request)
+            cache.set(key, context, shared_timeout(layout_cache_timeout()))
+    request._layout_context = context
+    return context
+
+
+def _layout_value(request, name):
+    return get_layout_context(request).get(name)
+
+
+def layout_values(request, names):
+    """
+    Return ``{name: value}`` for the context processors.
+
+    For HTMX partials each value is a callable, which Django templates call
+    when the variable is used, so untouched values are never computed.
+    """
+    if is_partial_request(request):
+        return {name: functools.partial(_layout_value, request, name) for name in names}
+    context = get_layout_context(request)
+    return {name: context[name] for name in names if name in context}
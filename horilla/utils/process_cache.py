@@ -0,0 +1,37 @@
+"""
+Helpers for values compiled and kept in process memory.
+
+Registries such as the field-permission matrices and the compiled scoring
+programs keep values per process and retire them through a version token in
+``django.core.cache``. The token only reaches other processes when the cache
+backend is shared (``CACHE_URL``, e.g. Redis); with the default per-process
+``LocMemCache`` a change made in one worker is never seen by the others.
+Process-local values are therefore only trusted for ``local_timeout()``
+seconds, and values put in a per-process cache no longer than that.
+"""
+
+# Third-party imports (Django)
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def cache_is_shared(alias=DEFAULT_CACHE_ALIAS):
+    """Return True when the cache backend is shared between processes."""
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+def local_timeout():
+    """Seconds a process-local value is trusted before it is reloaded."""
+    return getattr(settings, "HORILLA_PROCESS_CACHE_TIMEOUT", 30)
+
+
+def shared_timeout(timeout):
+    """
+    Return ``timeout`` for the cache, capped to ``local_timeout()`` when the
+    cache backend lives in each process.
+    """
+    if cache_is_shared():
+        return timeout
+    return min(timeout, local_timeout())
@@ -63,6 +63,10 @@ class HorillaCoreConfig(AppConfig):
             __import__("horilla_core.login_history")
             __import__("horilla_core.menu")
 
+            from horilla.registry.relation_registry import build_relation_graph
+
+            build_relation_graph()
+
             from django.conf import settings
 
             from .celery_schedules import HORILLA_BEAT_SCHEDULE
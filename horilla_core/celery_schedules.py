@@ -2,7 +2,8 @@
 Celery beat schedules for the Horilla Core app.
 
 Defines periodic tasks used by the core system,
-such as processing scheduled exports.
+such as processing scheduled exports and expiring their files, and
+requeueing imports whose worker died.
 """
 
 from datetime import timedelta
@@ -12,4 +13,12 @@ HORILLA_BEAT_SCHEDULE = {
         "task": "horilla_core.tasks.process_scheduled_exports",
         "schedule": timedelta(seconds=10),
     },
+    "cleanup-scheduled-export-files": {
+        "task": "horilla_core.tasks.cleanup_scheduled_export_files",
+        "schedule": timedelta(days=1),
+    },
+    "recover-stale-imports": {
+        "task": "horilla_core.tasks.recover_stale_imports",
+        "schedule": timedelta(minutes=5),
+    },
 }
@@ -15,7 +15,7 @@ import pytz
 from django.apps import apps
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.shortcuts import render
 from django.utils import timezone
 from django.utils.decorators import method_decorator
@@ -28,11 +28,13 @@ from openpyxl.styles import Alignment, Font, PatternFill
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 
+from horilla.exceptions import HorillaHttp404
 from horilla.registry.feature import FEATURE_REGISTRY
 
 # First-party (Horilla)
 from horilla_core.decorators import htmx_required, permission_required_or_denied
 from horilla_core.models import ExportSchedule
+from horilla_core.services.export_writer import resolve_download_token
 from horilla_generics.views import HorillaListView, HorillaSingleDeleteView
 
 logger = logging.getLogger(__name__)
@@ -412,6 +414,7 @@ class ExportScheduleModalView(LoginRequiredMixin, View):
                 modules = schedule.modules
                 export_format = schedule.export_format
                 selected_frequency_option = schedule.frequency
+                selected_export_mode = schedule.export_mode
                 start_date = (
                     schedule.start_date.strftime("%Y-%m-%d")
                     if schedule.start_date
@@ -445,6 +448,7 @@ class ExportScheduleModalView(LoginRequiredMixin, View):
 
             export_format = request.GET.get("export_format", "xlsx")
             selected_frequency_option = request.GET.get("frequency", "daily")
+            selected_export_mode = "full"
             form_data = {}
         context = {
             "selected_modules": modules,
@@ -452,6 +456,7 @@ class ExportScheduleModalView(LoginRequiredMixin, View):
             "schedule_id": schedule_id,
             "selected_format": export_format,
             "selected_frequency_option": selected_frequency_option,
+            "selected_export_mode": selected_export_mode,
             "form_data": form_data,
             "weekdays": [
                 "monday",
@@ -507,6 +512,9 @@ class ExportScheduleCreateView(LoginRequiredMixin, View):
             modules = request.POST.getlist("module")
             export_format = request.POST["export_format"]
             frequency = request.POST["frequency"]
+            export_mode = request.POST.get("export_mode", "full")
+            if export_mode not in dict(ExportSchedule.EXPORT_MODE_CHOICES):
+                export_mode = "full"
 
             day_of_month = None
             weekday = None
@@ -579,6 +587,7 @@ class ExportScheduleCreateView(LoginRequiredMixin, View):
                 schedule.modules = modules
                 schedule.export_format = export_format
                 schedule.frequency = frequency
+                schedule.export_mode = export_mode
                 schedule.day_of_month = day_of_month
                 schedule.weekday = weekday
                 schedule.yearly_day_of_month = yearly_day_of_month
@@ -595,6 +604,7 @@ class ExportScheduleCreateView(LoginRequiredMixin, View):
                     modules=modules,
                     export_format=export_format,
                     frequency=frequency,
+                    export_mode=export_mode,
                     day_of_month=day_of_month,
                     weekday=weekday,
                     yearly_day_of_month=yearly_day_of_month,
@@ -631,6 +641,7 @@ class ExportScheduleCreateView(LoginRequiredMixin, View):
                 "selected_modules": request.POST.getlist("module"),
                 "selected_format": request.POST.get("export_format", "xlsx"),
                 "selected_frequency_option": request.POST.get("frequency", "daily"),
+                "selected_export_mode": request.POST.get("export_mode", "full"),
                 "field_errors": field_errors,
                 "non_field_error": non_field_error,
                 "weekdays": [
@@ -694,6 +705,7 @@ class ScheduleExportListView(LoginRequiredMixin, HorillaListView):
         (_("Modules"), "module_names_display"),
         "export_format",
         "frequency",
+        "export_mode",
         (_("Schedule Details"), "frequency_display"),
         (_("Last Executed On"), "last_executed"),
     ]
@@ -744,3 +756,21 @@ class ScheduleExportDeleteView(LoginRequiredMixin, HorillaSingleDeleteView):
         return HttpResponse(
             "<script>$('#reloadScheduleListButton').click();$('#reloadButton').click();$('#reloadMessagesButton').click();closeModal();</script>"
         )
+
+
+class ScheduledExportDownloadView(LoginRequiredMixin, View):
+    """
+    Serves a scheduled export that was too large to attach to its email.
+
+    The signed token names the file and the user it was sent to, and
+    expires after HORILLA_EXPORT_LINK_MAX_AGE.
+    """
+
+    def get(self, request, token, *args, **kwargs):
+        """Stream the export file behind a signed link."""
+        path = resolve_download_token(token, request.user)
+        if not path:
+            raise HorillaHttp404(_("This export link is invalid or has expired."))
+        return FileResponse(
+            open(path, "rb"), as_attachment=True, filename=path.rsplit("/", 1)[-1]
+        )
@@ -27,6 +27,9 @@ from horilla.auth.models import User
 from horilla.registry.permission_registry import PERMISSION_EXEMPT_MODELS
 from horilla_core.decorators import htmx_required, permission_required_or_denied
 from horilla_core.models import FieldPermission, Role
+from horilla_core.services.field_permission_matrix import (
+    bump_field_permission_version,
+)
 from horilla_generics.views import HorillaListView, HorillaTabView
 
 
@@ -413,6 +416,9 @@ class SaveBulkFieldPermissionsView(LoginRequiredMixin, View):
                         field_name=field_name,
                         defaults={"permission_type": permission_type},
                     )
+            # Each row bumps the version as it is saved; bump once more so a
+            # matrix compiled from a half-applied batch is not kept.
+            bump_field_permission_version()
 
             messages.success(
                 request,
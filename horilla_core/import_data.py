@@ -11,27 +11,21 @@ handling import history, and managing bulk import operations.
 import csv
 import difflib
 import logging
-import time
 import traceback
-from collections import defaultdict
-from datetime import datetime
-from decimal import Decimal
-from io import StringIO
 
 # Third-party imports
 import pandas as pd
 
 # Django imports (third-party)
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
-from django.db import connection, transaction
 from django.db.models import CharField, EmailField, ForeignKey, URLField
 from django.http import HttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
-from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
@@ -42,6 +36,13 @@ from horilla.exceptions import HorillaHttp404
 from horilla.registry.feature import FEATURE_REGISTRY
 from horilla_core.decorators import htmx_required, permission_required_or_denied
 from horilla_core.models import ImportHistory
+from horilla_core.services.import_resolution import CandidateIndex
+from horilla_core.services.import_service import (
+    ImportService,
+    execute_import,
+    history_result,
+)
+from horilla_core.tasks import run_import
 from horilla_generics.views import HorillaListView, HorillaTabView
 
 logger = logging.getLogger(__name__)
@@ -485,13 +486,11 @@ class ImportStep1View(View):
 
             # Handle choice fields
             if field["is_choice_field"]:
-                choice_dict = {
-                    choice["value"]: choice["label"] for choice in field["choices"]
-                }
+                index = self.build_choice_index(field["choices"])
                 field_choice_mappings = {}
 
                 for file_value in file_values:
-                    best_match = self.find_best_choice_match(file_value, choice_dict)
+                    best_match = index.match(file_value)
                     if best_match:
                         slug_value = slugify(file_value)
                         field_choice_mappings[slug_value] = best_match
@@ -504,10 +503,11 @@ class ImportStep1View(View):
                 fk_objects = {
                     str(fk["display"]): fk["id"] for fk in field["foreign_key_choices"]
                 }
+                index = CandidateIndex(fk_objects.items())
                 field_fk_mappings = {}
 
                 for file_value in file_values:
-                    best_match_id = self.find_best_fk_match(file_value, fk_objects)
+                    best_match_id = index.match(file_value)
                     if best_match_id:
                         slug_value = slugify(file_value)
                         field_fk_mappings[slug_value] = best_match_id
@@ -517,70 +517,24 @@ class ImportStep1View(View):
 
         return choice_mappings, fk_mappings
 
+    def build_choice_index(self, choices):
+        """Build a candidate index matching both choice values and labels"""
+        candidates = []
+        for choice in choices:
+            candidates.append((choice["value"], choice["value"]))
+            candidates.append((choice["label"], choice["value"]))
+        return CandidateIndex(candidates)
+
     def find_best_choice_match(self, file_value, choice_dict):
         """Find the best matching choice using fuzzy string matching"""
-
-        def normalize_text(text):
-            return str(text).lower().strip().replace("_", " ").replace("-", " ")
-
-        norm_file_value = normalize_text(file_value)
-
-        # Try exact match first (normalized)
-        for choice_value, choice_label in choice_dict.items():
-            if norm_file_value == normalize_text(choice_value):
-                return choice_value
-            if norm_file_value == normalize_text(choice_label):
-                return choice_value
-
-        # Try fuzzy matching
-        best_match = None
-        best_ratio = 0.7  # Higher threshold for choices
-
-        for choice_value, choice_label in choice_dict.items():
-            # Check against choice value
-            ratio = difflib.SequenceMatcher(
-                None, norm_file_value, normalize_text(choice_value)
-            ).ratio()
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_match = choice_value
-
-            # Check against choice label
-            ratio = difflib.SequenceMatcher(
-                None, norm_file_value, normalize_text(choice_label)
-            ).ratio()
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_match = choice_value
-
-        return best_match
+        choices = [
+            {"value": value, "label": label} for value, label in choice_dict.items()
+        ]
+        return self.build_choice_index(choices).match(file_value)
 
     def find_best_fk_match(self, file_value, fk_objects):
         """Find the best matching foreign key object using fuzzy string matching"""
-
-        def normalize_text(text):
-            return str(text).lower().strip().replace("_", " ").replace("-", " ")
-
-        norm_file_value = normalize_text(file_value)
-
-        # Try exact match first (normalized)
-        for display_name, obj_id in fk_objects.items():
-            if norm_file_value == normalize_text(display_name):
-                return obj_id
-
-        # Try fuzzy matching
-        best_match_id = None
-        best_ratio = 0.7  # Higher threshold for FK matches
-
-        for display_name, obj_id in fk_objects.items():
-            ratio = difflib.SequenceMatcher(
-                None, norm_file_value, normalize_text(display_name)
-            ).ratio()
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_match_id = obj_id
-
-        return best_match_id
+        return CandidateIndex(fk_objects.items()).match(file_value)
 
     def get_app_label_for_model(self, model_name):
         """Find the app_label for a given model name"""
@@ -1542,8 +1496,6 @@ class ImportStep4View(View):
 
     def post(self, request, *args, **kwargs):
         """Handle the actual import when user clicks Import button"""
-        start_time = time.perf_counter()
-
         import_data = request.session.get("import_data", {})
         import_config = request.session.get("import_config", {})
         single_import = import_config.get("single_import", False)
@@ -1565,42 +1517,23 @@ class ImportStep4View(View):
             import_option=import_data.get("import_option", "1"),
             match_fields=import_data.get("match_fields", []),
             field_mappings=import_data.get("field_mappings", {}),
+            import_config=import_data,
             created_by=request.user if request.user.is_authenticated else None,
             company=getattr(request, "active_company", None),
-            status="processing",
+            status="queued",
         )
 
-        try:
-            # Process the import
-            process_start = time.perf_counter()
-            result = self.process_import(import_data)
-            duration = time.perf_counter() - process_start
-
-            # Update import history with results
-            import_history.total_rows = result["total_rows"]
-            import_history.created_count = result["created_count"]
-            import_history.updated_count = result["updated_count"]
-            import_history.error_count = result["error_count"]
-            import_history.success_rate = Decimal(str(result["success_rate"]))
-            import_history.error_file_path = result.get("error_file_path", "")
-            import_history.error_summary = result.get("errors", [])[
-                :5
-            ]  # Store first 5 errors
-            import_history.duration_seconds = Decimal(str(duration))
-
-            # Determine status
-            if result["error_count"] == 0:
-                import_history.status = "success"
-            elif result["successful_rows"] > 0:
-                import_history.status = "partial"
-            else:
-                import_history.status = "failed"
-
-            import_history.save()
+        if self.queue_import(import_history):
+            self.clear_session()
+            return render(
+                request,
+                "import/import_progress.html",
+                {"import_history": import_history, "single_import": single_import},
+            )
 
-            # Render success page with results
-            render_start = time.perf_counter()
-            response = render(
+        result = self.process_import(import_data, import_history)
+        if import_history.status in ("success", "partial"):
+            return render(
                 request,
                 "import/import_success.html",
                 {
@@ -1610,704 +1543,149 @@ class ImportStep4View(View):
                     "single_import": single_import,
                 },
             )
-            return response
-
-        except Exception as e:
-            # Update import history with error
-            import_history.status = "failed"
-            import_history.error_summary = [str(e)]
-            import_history.duration_seconds = Decimal(
-                str(time.perf_counter() - process_start)
-            )
-            import_history.save()
+        return HttpResponse(
+            f"""
+            <div class="text-red-500 text-sm">Error during import: {"; ".join(result["errors"][-1:])}</div>
+        """
+        )
 
-            return HttpResponse(
-                f"""
-                <div class="text-red-500 text-sm">Error during import: {str(e)}</div>
-            """
-            )
+    def queue_import(self, import_history):
+        """
+        Hand the import over to a Celery worker.
 
-    def generate_error_csv(self, detailed_errors, import_data):
-        """Generate a CSV file with original file structure plus error column"""
+        Returns False when background imports are disabled or the broker
+        cannot be reached, in which case the import runs in the request.
+        """
+        if not getattr(settings, "HORILLA_IMPORT_ASYNC", True):
+            return False
         try:
-            import_name = import_data.get("import_name", "import")
-            original_filename = import_data.get("original_filename", "file")
-
-            # Extract filename without extension for error file naming
-            if "." in original_filename:
-                base_filename = original_filename.rsplit(".", 1)[0]
-            else:
-                base_filename = original_filename
-
-            timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{base_filename}_errors_{timestamp}.csv"
-            file_path = f"import_errors/{filename}"
-
-            # Read original file to get structure
-            original_file_path = import_data.get("file_path")
-            original_headers = import_data.get("headers", [])
-
-            if not original_file_path or not original_headers:
-                raise ValueError("Original file path or headers not found")
-
-            # Read all original data
-            original_data = self.read_file_data(original_file_path)
-
-            # Create error lookup by row number
-            error_lookup = {
-                error["row_number"]: error["errors"] for error in detailed_errors
-            }
-
-            # Create CSV content with original structure + error column
-            csv_content = StringIO()
-            writer = csv.writer(csv_content)
-
-            # Write headers (original headers + Error column)
-            headers_with_error = original_headers + ["Import_Error"]
-            writer.writerow(headers_with_error)
-
-            # Write data rows
-            for row_index, row_data in enumerate(original_data, 1):
-                # Get original row values in correct order
-                row_values = []
-                for header in original_headers:
-                    row_values.append(row_data.get(header, ""))
-
-                # Add error information if this row had errors
-                error_info = error_lookup.get(row_index, "")
-                row_values.append(error_info)
-
-                # Only write rows that had errors
-                if error_info:
-                    writer.writerow(row_values)
-
-            # Save to storage
-            full_file_path = default_storage.save(
-                file_path, ContentFile(csv_content.getvalue().encode("utf-8"))
-            )
-
-            return full_file_path
-
+            task = run_import.delay(import_history.pk)
         except Exception as e:
-            logger.error("Error generating error CSV: %s", e)
-
-            return None
-
-    def process_import(self, import_data):
-        """Process the import based on the provided import_data"""
-        start_time = time.perf_counter()
-
-        # Database-specific batch size optimization
-        is_postgres = connection.vendor == "postgresql"
-        is_sqlite = connection.vendor == "sqlite"
-        create_batch_size = 1000 if is_postgres else (500 if is_sqlite else 999)
-        update_batch_size = 500 if is_postgres else (100 if is_sqlite else 200)
-
-        module_name = import_data["module"]
-        app_label = import_data["app_label"]
-        file_path = import_data["file_path"]
-        field_mappings = import_data.get("field_mappings", {})
-        replace_values = import_data.get("replace_values", {})
-        choice_mappings = import_data.get("choice_mappings", {})
-        fk_mappings = import_data.get("fk_mappings", {})
-        import_option = import_data["import_option"]
-        match_fields = import_data.get("match_fields", [])
-
-        model = apps.get_model(app_label, module_name)
-        field_metadata = {
-            f.name: {
-                "type": f.get_internal_type(),
-                "is_fk": isinstance(f, ForeignKey),
-                "is_choice": isinstance(f, CharField) and f.choices,
-                "related_model": f.related_model if isinstance(f, ForeignKey) else None,
-                "choices": (
-                    dict(f.choices) if isinstance(f, CharField) and f.choices else {}
-                ),
-                "null": f.null,
-                "blank": f.blank,
-                "verbose_name": f.verbose_name,
-            }
-            for f in model._meta.fields
-        }
-
-        # Precompute update fields for bulk operations
-        base_update_fields = set()
-        for field in model._meta.fields:
-            if field.primary_key:
-                continue
-            if field.name in field_mappings or field.name in [
-                "updated_at",
-                "updated_by",
-                "company",
-            ]:
-                base_update_fields.add(field.name)
-        update_fields_for_update = list(
-            base_update_fields - {"created_at", "created_by"}
-        )
-
-        data_rows = self.read_file_data(file_path)
-
-        created, errors = [], []
-        detailed_errors = []  # For CSV export
-        created_count = updated_count = error_count = 0
-        current_time = timezone.now()
-        user = self.request.user if self.request.user.is_authenticated else None
-        company = getattr(self.request, "active_company", None)
-
-        # Preload FK objects referenced in mappings
-        fk_cache = {}
-        fk_start = time.perf_counter()
-        for field, mapping in fk_mappings.items():
-            related_model = field_metadata[field]["related_model"]
-            fk_cache[field] = {
-                k: related_model.objects.filter(pk=v).first()
-                for k, v in mapping.items()
-            }
-
-        # Preload replace_values FKs
-        replace_start = time.perf_counter()
-        for field, value in replace_values.items():
-            if field_metadata[field]["is_fk"]:
-                related_model = field_metadata[field]["related_model"]
-                fk_cache.setdefault(field, {})
-                fk_cache[field]["__replace__"] = related_model.objects.filter(
-                    pk=value
-                ).first()
-
-        with transaction.atomic():
-            existing_objs = {}
-            if match_fields and import_option in ["1", "2", "3"]:
-                filter_start = time.perf_counter()
-                filters = {
-                    f"{f}__in": [
-                        str(row.get(field_mappings.get(f, ""), "")).strip()
-                        for row in data_rows
-                        if f in field_mappings
-                    ]
-                    for f in match_fields
-                }
-                qset = model.objects.filter(**{k: v for k, v in filters.items() if v})
-                existing_objs = {
-                    tuple(getattr(obj, f) for f in match_fields): obj for obj in qset
-                }
-
-            # Group objects by changed fields for efficient updates
-            updated_groups = defaultdict(list)
-            row_processing_start = time.perf_counter()
-
-            for row_index, row_data in enumerate(data_rows, 1):
-                row_errors = []
-                try:
-                    mapped = {}
-                    for model_field, file_header in field_mappings.items():
-                        value = str(row_data.get(file_header, "")).strip()
-                        meta = field_metadata[model_field]
-                        original_value = value  # Keep original for error reporting
-
-                        if not value and model_field in replace_values:
-                            value = replace_values[model_field]
-
-                        if meta["is_fk"]:
-                            slug_val = slugify(value) if value else None
-                            obj = fk_cache.get(model_field, {}).get(slug_val)
-                            if not obj and model_field in replace_values:
-                                obj = fk_cache.get(model_field, {}).get("__replace__")
-
-                            # Enhanced FK validation
-                            if not obj and value and not meta["null"]:
-                                row_errors.append(
-                                    f"Foreign key '{meta['verbose_name']}': No matching record found for '{original_value}'"
-                                )
-                            elif (
-                                not obj
-                                and not value
-                                and not meta["null"]
-                                and not meta["blank"]
-                            ):
-                                row_errors.append(
-                                    f"Foreign key '{meta['verbose_name']}': Required field cannot be empty"
-                                )
-
-                            mapped[model_field] = obj
-
-                        elif meta["is_choice"]:
-                            if value and model_field in choice_mappings:
-                                slug_val = slugify(value)
-                                if slug_val in choice_mappings[model_field]:
-                                    value = choice_mappings[model_field][slug_val]
-                                elif model_field in replace_values:
-                                    value = replace_values[model_field]
-                            elif not value and model_field in replace_values:
-                                value = replace_values[model_field]
-
-                            # Enhanced choice validation
-                            if value and value not in meta["choices"]:
-                                valid_choices = ", ".join(
-                                    [f"'{choice}'" for choice in meta["choices"].keys()]
-                                )
-                                row_errors.append(
-                                    f"Choice field '{meta['verbose_name']}': Invalid value '{original_value}'. Valid choices are: {valid_choices}"
-                                )
-                            elif not value and not meta["null"] and not meta["blank"]:
-                                row_errors.append(
-                                    f"Choice field '{meta['verbose_name']}': Required field cannot be empty"
-                                )
-
-                            mapped[model_field] = value
-
-                        else:
-                            if not value and model_field in replace_values:
-                                value = replace_values[model_field]
-
-                            # Enhanced type conversion with error reporting
-                            if meta["type"] in ["IntegerField", "BigIntegerField"]:
-                                if value:
-                                    try:
-                                        value = int(value)
-                                    except ValueError:
-                                        row_errors.append(
-                                            f"Integer field '{meta['verbose_name']}': Cannot convert '{original_value}' to integer"
-                                        )
-                                        value = None
-                                else:
-                                    value = None
-
-                            elif meta["type"] == "DecimalField":
-                                if value:
-                                    try:
-                                        value = float(value)
-                                    except ValueError:
-                                        row_errors.append(
-                                            f"Decimal field '{meta['verbose_name']}': Cannot convert '{original_value}' to decimal"
-                                        )
-                                        value = None
-                                else:
-                                    value = None
-
-                            elif meta["type"] == "BooleanField":
-                                if value:
-                                    str_value = str(value).lower().strip()
-                                    if str_value in (
-                                        "true",
-                                        "1",
-                                        "yes",
-                                        "on",
-                                        "false",
-                                        "0",
-                                        "no",
-                                        "off",
-                                    ):
-                                        value = str_value in ("true", "1", "yes", "on")
-                                    else:
-                                        row_errors.append(
-                                            f"Replace value for '{meta['verbose_name']}': Invalid boolean value '{replace_value}'. Valid values are: true, false, 1, 0, yes, no, on, off"
-                                        )
-                                        value = None
-                                else:
-                                    value = False
-
-                            elif meta["type"] in ["DateField", "DateTimeField"]:
-                                if value:
-                                    try:
-                                        if meta["type"] == "DateField":
-                                            try:
-                                                value = datetime.strptime(
-                                                    value, "%Y-%m-%d"
-                                                ).date()
-                                            except ValueError:
-                                                try:
-                                                    value = datetime.strptime(
-                                                        value, "%m/%d/%Y"
-                                                    ).date()
-                                                except ValueError:
-                                                    try:
-                                                        value = datetime.strptime(
-                                                            value, "%d/%m/%Y"
-                                                        ).date()
-                                                    except ValueError:
-                                                        raise ValueError(
-                                                            f"Invalid date format for '{original_value}'. Expected YYYY-MM-DD, MM/DD/YYYY, or DD/MM/YYYY"
-                                                        )
-                                        else:
-                                            try:
-                                                value = datetime.fromisoformat(value)
-                                            except ValueError:
-                                                # Try other common datetime formats
-                                                formats = [
-                                                    "%Y-%m-%d %H:%M:%S",
-                                                    "%m/%d/%Y %H:%M:%S",
-                                                    "%d/%m/%Y %H:%M:%S",
-                                                    "%Y-%m-%d %I:%M:%S %p",
-                                                    "%m/%d/%Y %I:%M:%S %p",
-                                                    "%d/%m/%Y %I:%M:%S %p",
-                                                ]
-                                                parsed = False
-                                                for fmt in formats:
-                                                    try:
-                                                        value = datetime.strptime(
-                                                            value, fmt
-                                                        )
-                                                        parsed = True
-                                                        break
-                                                    except ValueError:
-                                                        continue
-
-                                                if not parsed:
-                                                    raise ValueError(
-                                                        f"Invalid datetime format for '{original_value}'"
-                                                    )
-                                    except ValueError as e:
-                                        row_errors.append(
-                                            f"Date field '{meta['verbose_name']}': {str(e)}"
-                                        )
-                                        value = None
-                                else:
-                                    value = None
-
-                            # Check for required field violations
-                            if value is None and not meta["null"] and not meta["blank"]:
-                                row_errors.append(
-                                    f"Required field '{meta['verbose_name']}': Cannot be empty or invalid"
-                                )
-
-                            mapped[model_field] = value
-
-                    for field, replace_value in replace_values.items():
-                        if field not in field_mappings and field in field_metadata:
-                            meta = field_metadata[field]
-
-                            if meta["is_fk"]:
-                                obj = fk_cache.get(field, {}).get("__replace__")
-                                mapped[field] = obj
-                            elif meta["is_choice"]:
-                                if replace_value in meta["choices"]:
-                                    mapped[field] = replace_value
-                                else:
-                                    row_errors.append(
-                                        f"Replace value for '{meta['verbose_name']}': Invalid choice '{replace_value}'"
-                                    )
-                            else:
-                                value = replace_value
-                                if meta["type"] in ["IntegerField", "BigIntegerField"]:
-                                    try:
-                                        value = int(value)
-                                    except ValueError:
-                                        row_errors.append(
-                                            f"Replace value for '{meta['verbose_name']}': Cannot convert '{replace_value}' to integer"
-                                        )
-                                        value = None
-                                elif meta["type"] == "DecimalField":
-                                    try:
-                                        value = float(value)
-                                    except ValueError:
-                                        row_errors.append(
-                                            f"Replace value for '{meta['verbose_name']}': Cannot convert '{replace_value}' to decimal"
-                                        )
-                                        value = None
-                                elif meta["type"] == "BooleanField":
-                                    str_value = str(value).lower().strip()
-                                    if str_value in (
-                                        "true",
-                                        "1",
-                                        "yes",
-                                        "on",
-                                        "false",
-                                        "0",
-                                        "no",
-                                        "off",
-                                    ):
-                                        value = str_value in ("true", "1", "yes", "on")
-                                    else:
-                                        row_errors.append(
-                                            f"Replace value for '{meta['verbose_name']}': Invalid boolean value '{replace_value}'. Valid values are: true, false, 1, 0, yes, no, on, off"
-                                        )
-                                        value = None
-                                elif meta["type"] in ["DateField", "DateTimeField"]:
-                                    if value:
-                                        try:
-                                            if meta["type"] == "DateField":
-                                                try:
-                                                    value = datetime.strptime(
-                                                        value, "%Y-%m-%d"
-                                                    ).date()
-                                                except ValueError:
-                                                    try:
-                                                        value = datetime.strptime(
-                                                            value, "%m/%d/%Y"
-                                                        ).date()
-                                                    except ValueError:
-                                                        try:
-                                                            value = datetime.strptime(
-                                                                value, "%d/%m/%Y"
-                                                            ).date()
-                                                        except ValueError:
-                                                            raise ValueError(
-                                                                f"Invalid date format for '{original_value}'. Expected YYYY-MM-DD, MM/DD/YYYY, or DD/MM/YYYY"
-                                                            )
-                                            else:
-                                                try:
-                                                    value = datetime.fromisoformat(
-                                                        value
-                                                    )
-                                                except ValueError:
-                                                    formats = [
-                                                        "%Y-%m-%d %H:%M:%S",
-                                                        "%m/%d/%Y %H:%M:%S",
-                                                        "%d/%m/%Y %H:%M:%S",
-                                                        "%Y-%m-%d %I:%M:%S %p",
-                                                        "%m/%d/%Y %I:%M:%S %p",
-                                                        "%d/%m/%Y %I:%M:%S %p",
-                                                    ]
-                                                    parsed = False
-                                                    for fmt in formats:
-                                                        try:
-                                                            value = datetime.strptime(
-                                                                value, fmt
-                                                            )
-                                                            parsed = True
-                                                            break
-                                                        except ValueError:
-                                                            continue
-
-                                                    if not parsed:
-                                                        raise ValueError(
-                                                            f"Invalid datetime format for '{original_value}'"
-                                                        )
-                                        except ValueError as e:
-                                            row_errors.append(
-                                                f"Date field '{meta['verbose_name']}': {str(e)}"
-                                            )
-                                            value = None
-                                    else:
-                                        value = None
-                                mapped[field] = value
-
-                    if row_errors:
-                        error_count += 1
-                        row_error_summary = f"Row {row_index}: {'; '.join(row_errors)}"
-                        errors.append(row_error_summary)
-
-                        # Add detailed error for CSV export
-                        detailed_errors.append(
-                            {"row_number": row_index, "errors": "; ".join(row_errors)}
-                        )
-                        continue
-
-                    # Handle import_option
-                    if import_option == "1":  # create only
-                        if match_fields:
-                            key = tuple(mapped.get(f) for f in match_fields)
-                            if key in existing_objs:
-                                # Add error for existing record when in create-only mode
-                                error_count += 1
-                                match_field_values = []
-                                for field in match_fields:
-                                    field_value = mapped.get(field, "N/A")
-                                    if field_value is None:
-                                        field_value = "N/A"
-                                    match_field_values.append(
-                                        f"{field}='{field_value}'"
-                                    )
-                                match_criteria = ", ".join(match_field_values)
-
-                                error_msg = f"Row {row_index}: Record already exists with matching criteria: {match_criteria}. Skipped in create-only mode."
-                                errors.append(error_msg)
-
-                                # Add detailed error for CSV export
-                                detailed_errors.append(
-                                    {
-                                        "row_number": row_index,
-                                        "errors": f"Record already exists with matching criteria: {match_criteria}. Skipped in create-only mode.",
-                                    }
-                                )
-                                continue
-
-                        obj = model(**mapped)
-                        obj.created_at = mapped.get("created_at", current_time)
-                        obj.updated_at = current_time
-                        if user:
-                            obj.created_by = mapped.get("created_by", user)
-                            obj.updated_by = user
-                        obj.company = company
-                        created.append(obj)
-
-                    elif import_option == "2":  # update only
-                        key = tuple(mapped.get(f) for f in match_fields)
-                        instance = existing_objs.get(key)
-                        if instance:
-                            changed_fields = self._update_instance(
-                                instance,
-                                mapped,
-                                field_metadata,
-                                update_fields_for_update,
-                                current_time,
-                                user,
-                                company,
-                            )
-                            updated_groups[frozenset(changed_fields)].append(instance)
-                        else:
-                            error_count += 1
-                            match_field_values = []
-                            for field in match_fields:
-                                field_value = mapped.get(field, "N/A")
-                                if field_value is None:
-                                    field_value = "N/A"
-                                match_field_values.append(f"{field}='{field_value}'")
-                            match_criteria = ", ".join(match_field_values)
-
-                            error_msg = f"Row {row_index}: No existing record found to update with matching criteria: {match_criteria}"
-                            errors.append(error_msg)
-
-                            # Add detailed error for CSV export
-                            detailed_errors.append(
-                                {
-                                    "row_number": row_index,
-                                    "errors": f"No existing record found to update with matching criteria: {match_criteria}",
-                                }
-                            )
-
-                    elif import_option == "3":  # create + update
-                        key = tuple(mapped.get(f) for f in match_fields)
-                        instance = existing_objs.get(key)
-                        if instance:
-                            changed_fields = self._update_instance(
-                                instance,
-                                mapped,
-                                field_metadata,
-                                update_fields_for_update,
-                                current_time,
-                                user,
-                                company,
-                            )
-                            updated_groups[frozenset(changed_fields)].append(instance)
-                        else:
-                            obj = model(**mapped)
-                            obj.created_at = mapped.get("created_at", current_time)
-                            obj.updated_at = current_time
-                            if user:
-                                obj.created_by = mapped.get("created_by", user)
-                                obj.updated_by = user
-                            obj.company = company
-                            created.append(obj)
-                            if match_fields:
-                                existing_objs[key] = obj
-
-                except Exception as e:
-                    error_count += 1
-                    error_msg = f"Row {row_index}: Unexpected error - {str(e)}"
-                    errors.append(error_msg)
-                    detailed_errors.append(
-                        {
-                            "row_number": row_index,
-                            "errors": f"Unexpected error - {str(e)}",
-                        }
-                    )
-
-            if created:
-                bulk_create_start = time.perf_counter()
-                model.objects.bulk_create(created, batch_size=create_batch_size)
-                created_count = len(created)
-
-            bulk_update_start = time.perf_counter()
-            for fields, objs in updated_groups.items():
-                if fields:
-                    for i in range(0, len(objs), update_batch_size):
-                        batch = objs[i : i + update_batch_size]
-                        model.objects.bulk_update(
-                            batch, fields=list(fields), batch_size=len(batch)
-                        )
-                        updated_count += len(batch)
-
-        # Generate error CSV if there are errors
-        error_file_path = None
-        if detailed_errors:
-            error_file_path = self.generate_error_csv(detailed_errors, import_data)
+            logger.warning("Could not queue import %s: %s", import_history.pk, e)
+            return False
+        import_history.task_id = task.id
+        import_history.save(update_fields=["task_id"])
+        return True
 
-        session_cleanup_start = time.perf_counter()
+    def clear_session(self):
+        """Drop the wizard state once the import has been handed off."""
         if "import_data" in self.request.session:
             del self.request.session["import_data"]
             self.request.session.modified = True
 
-        successful_rows = created_count + updated_count
-        total_rows = len(data_rows)
-        success_rate = (successful_rows / total_rows * 100) if total_rows > 0 else 0
+    def process_import(self, import_data, import_history=None):
+        """
+        Process the import based on the provided import_data.
 
-        return {
-            "created_count": created_count,
-            "updated_count": updated_count,
-            "error_count": error_count,
-            "errors": errors[:5],
-            "total_rows": total_rows,
-            "successful_rows": successful_rows,
-            "success_rate": round(success_rate, 1),
-            "error_file_path": error_file_path,
-            "has_more_errors": len(errors) > 5,
-        }
+        Rows are streamed from the file and committed in chunks by
+        ImportService; progress is checkpointed on ``import_history``.
+        """
+        if import_history is not None:
+            result = execute_import(import_history)
+        else:
+            result = ImportService(
+                import_data,
+                user=self.request.user if self.request.user.is_authenticated else None,
+                company=getattr(self.request, "active_company", None),
+            ).run()
+        self.clear_session()
+        return result
 
-    def _update_instance(
-        self,
-        instance,
-        mapped,
-        field_metadata,
-        update_fields,
-        current_time,
-        user,
-        company,
-    ):
-        """Update instance with change detection and return changed fields"""
-        changed_fields = {"updated_at", "company"}  # System fields always change
-        if user:
-            changed_fields.add("updated_by")
-
-        # Update data fields with change detection
-        for field in update_fields:
-            if field in ["updated_at", "updated_by", "company"]:
-                continue
 
-            new_value = mapped.get(field)
-            old_value = getattr(instance, field)
+@method_decorator(htmx_required, name="dispatch")
+@method_decorator(
+    permission_required_or_denied("horilla_core.can_view_horilla_import"),
+    name="dispatch",
+)
+class ImportDryRunView(LoginRequiredMixin, View):
+    """
+    Validate the file against the wizard mappings without writing. Runs in
+    the request, so only the first ``HORILLA_IMPORT_DRY_RUN_ROWS`` rows
+    (5000) are previewed.
+    """
 
-            # Skip if values are the same
-            if old_value == new_value:
-                continue
+    def post(self, request, *args, **kwargs):
+        """Render the expected created/updated/error counts and sample errors"""
+        import_data = request.session.get("import_data", {})
+        if not import_data:
+            return HttpResponse(
+                """
+                <div class="text-red-500 text-sm">No import data found in session</div>
+            """
+            )
+        try:
+            result = ImportService(
+                import_data,
+                user=request.user,
+                company=getattr(request, "active_company", None),
+                dry_run=True,
+                max_rows=getattr(settings, "HORILLA_IMPORT_DRY_RUN_ROWS", 5000),
+            ).run()
+        except Exception as e:
+            logger.error("Error in ImportDryRunView.post: %s", e)
+            return HttpResponse(
+                f"""
+                <div class="text-red-500 text-sm">Error during dry run: {str(e)}</div>
+            """
+            )
+        return render(request, "import/import_dry_run.html", {"result": result})
 
-            # Handle special field types
-            meta = field_metadata.get(field, {})
-            if meta.get("is_fk"):
-                # Foreign keys are already resolved in mapped
-                pass
-            elif meta.get("is_choice"):
-                # Choices are already converted in mapped
-                pass
-            else:
-                # Type conversion already handled in mapped
-                pass
 
-            setattr(instance, field, new_value)
-            changed_fields.add(field)
+@method_decorator(htmx_required, name="dispatch")
+@method_decorator(
+    permission_required_or_denied("horilla_core.can_view_horilla_import"),
+    name="dispatch",
+)
+class ImportProgressView(LoginRequiredMixin, View):
+    """Polled by the progress panel while a background import runs"""
+
+    def get_history(self, request, pk):
+        """Return the user's import history or raise 404"""
+        history = ImportHistory.objects.filter(pk=pk, created_by=request.user).first()
+        if history is None:
+            raise HorillaHttp404(_("Import not found"))
+        return history
+
+    def get(self, request, pk, *args, **kwargs):
+        """Render the progress panel, or the result once the import is done"""
+        import_history = self.get_history(request, pk)
+        single_import = request.GET.get("single_import") == "true"
+        if import_history.status in ("success", "partial"):
+            return render(
+                request,
+                "import/import_success.html",
+                {
+                    "result": history_result(import_history),
+                    "import_history": import_history,
+                    "single_import": single_import,
+                },
+            )
+        return render(
+            request,
+            "import/import_progress.html",
+            {"import_history": import_history, "single_import": single_import},
+        )
 
-        # Update system fields
-        instance.updated_at = current_time
-        if user:
-            instance.updated_by = user
-        instance.company = company
 
-        return changed_fields
+class ImportCancelView(ImportProgressView):
+    """Request cancellation of a running background import"""
 
-    def read_file_data(self, file_path):
-        """Read data from the uploaded file"""
-        start_time = time.perf_counter()
-        full_path = default_storage.path(file_path)
-        data_rows = []
-        if file_path.endswith(".csv"):
-            with open(full_path, "r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    data_rows.append(dict(row))
-        else:
-            df = pd.read_excel(full_path)
-            data_rows = df.to_dict("records")
-        return data_rows
+    def post(self, request, pk, *args, **kwargs):
+        """Flag the import; the worker stops after the current chunk commits"""
+        import_history = self.get_history(request, pk)
+        if not import_history.is_complete:
+            ImportHistory.objects.filter(pk=import_history.pk).update(
+                cancel_requested=True
+            )
+            import_history.cancel_requested = True
+        return render(
+            request,
+            "import/import_progress.html",
+            {
+                "import_history": import_history,
+                "single_import": request.POST.get("single_import") == "true",
+            },
+        )
 
 
 @method_decorator(
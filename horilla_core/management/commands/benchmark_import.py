@@ -0,0 +1,65 @@
+# Standard library imports
+import time
+
+# Third-party imports (Django)
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+# First-party / Horilla imports
+from horilla_core.models import ImportHistory
+from horilla_core.services.import_service import ImportService
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays a stored import as create-only with the ORM path and the "
+        "bulk loader, rolling both back, and reports rows per second"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("import_id", type=int, help="ImportHistory id")
+        parser.add_argument(
+            "--chunk-size", type=int, default=None, help="Rows per transaction"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            history = ImportHistory.all_objects.get(pk=options["import_id"])
+        except ImportHistory.DoesNotExist:
+            raise CommandError(f"Import {options['import_id']} does not exist")
+        if not history.import_config:
+            raise CommandError(f"Import {history.pk} has no stored configuration")
+
+        import_data = dict(history.import_config, import_option="1")
+        service = ImportService(import_data, fast_load=True)
+        if not service.loader:
+            raise CommandError(
+                f"The bulk loader does not support {service.model._meta.label} "
+                "on this database"
+            )
+
+        for label, fast_load in (("ORM bulk_create", False), ("Bulk loader", True)):
+            service = ImportService(
+                import_data,
+                user=history.created_by,
+                company=history.company,
+                chunk_size=options["chunk_size"],
+                fast_load=fast_load,
+            )
+            with transaction.atomic():
+                start = time.perf_counter()
+                result = service.run()
+                elapsed = time.perf_counter() - start
+                transaction.set_rollback(True)
+
+            rate = result["total_rows"] / elapsed if elapsed else 0
+            self.stdout.write(
+                f"{label:<16} {result['total_rows']} rows, "
+                f"{result['created_count']} created, {result['error_count']} errors "
+                f"in {elapsed:.2f}s ({rate:,.0f} rows/s)"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Benchmark finished on {connection.vendor}; no rows were kept"
+            )
+        )
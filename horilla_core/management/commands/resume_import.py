@@ -0,0 +1,45 @@
+# Third-party imports (Django)
+from django.core.management.base import BaseCommand, CommandError
+
+# First-party / Horilla imports
+from horilla_core.models import ImportHistory
+from horilla_core.services.import_service import execute_import
+
+
+class Command(BaseCommand):
+    help = "Resumes a failed or cancelled import from its last committed chunk"
+
+    def add_arguments(self, parser):
+        parser.add_argument("import_id", type=int, help="ImportHistory id")
+        parser.add_argument(
+            "--chunk-size", type=int, default=None, help="Rows per transaction"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            history = ImportHistory.all_objects.get(pk=options["import_id"])
+        except ImportHistory.DoesNotExist:
+            raise CommandError(f"Import {options['import_id']} does not exist")
+
+        if history.status not in ("failed", "cancelled"):
+            raise CommandError(
+                f"Import {history.pk} is '{history.status}', not failed or cancelled"
+            )
+        if not history.import_config:
+            raise CommandError(f"Import {history.pk} has no stored configuration")
+
+        self.stdout.write(
+            f"Resuming '{history.import_name}' after row {history.last_committed_row}"
+        )
+        history.cancel_requested = False
+        history.save(update_fields=["cancel_requested"])
+        result = execute_import(history, chunk_size=options["chunk_size"])
+
+        style = self.style.ERROR if history.status == "failed" else self.style.SUCCESS
+        self.stdout.write(
+            style(
+                f"Import {history.pk} {history.status}: "
+                f"{result['created_count']} created, {result['updated_count']} updated, "
+                f"{result['error_count']} errors"
+            )
+        )
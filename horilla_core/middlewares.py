@@ -20,7 +20,7 @@ from django.utils.deprecation import MiddlewareMixin
 from horilla.exceptions import HorillaHttp404
 from horilla.menu.sub_section_menu import sub_section_menu as menu_registry
 
-from .models import Company
+from .services.company_registry import allowed_company_ids, get_company
 
 logger = logging.getLogger(__name__)
 
@@ -33,17 +33,25 @@ class ActiveCompanyMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        """Set the active company for the authenticated user."""
+        """
+        Set the active company for the authenticated user.
+
+        Companies come from the company registry, so the steady state needs
+        no query. A company kept in the session is only used while the user
+        is still allowed to switch to it.
+        """
         request.active_company = None
         if request.user.is_authenticated:
+            own_company_id = getattr(request.user, "company_id", None)
             company_id = request.session.get("active_company_id")
-            if company_id:
-                try:
-                    request.active_company = Company.objects.get(id=company_id)
-                except Company.DoesNotExist:  # Fixed pylint complaint
-                    request.active_company = getattr(request.user, "company", None)
-            else:
-                request.active_company = getattr(request.user, "company", None)
+            if (
+                company_id
+                and company_id != own_company_id
+                and company_id in allowed_company_ids(request.user)
+            ):
+                request.active_company = get_company(company_id)
+            if request.active_company is None:
+                request.active_company = get_company(own_company_id)
         return self.get_response(request)
 
 
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("horilla_core", "0006_alter_kanbangroupby_model_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importhistory",
+            name="import_config",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Wizard mappings used to run (or resume) the import",
+            ),
+        ),
+        migrations.AddField(
+            model_name="importhistory",
+            name="last_committed_row",
+            field=models.IntegerField(default=0, verbose_name="Last Committed Row"),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("horilla_core", "0007_importhistory_checkpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importhistory",
+            name="cancel_requested",
+            field=models.BooleanField(default=False, verbose_name="Cancel Requested"),
+        ),
+        migrations.AddField(
+            model_name="importhistory",
+            name="estimated_rows",
+            field=models.IntegerField(
+                default=0,
+                help_text="Row count estimated from the file, used for progress",
+                verbose_name="Estimated Rows",
+            ),
+        ),
+        migrations.AddField(
+            model_name="importhistory",
+            name="finished_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Finished At"
+            ),
+        ),
+        migrations.AddField(
+            model_name="importhistory",
+            name="rows_per_second",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                max_digits=12,
+                null=True,
+                verbose_name="Rows per Second",
+            ),
+        ),
+        migrations.AddField(
+            model_name="importhistory",
+            name="started_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Started At"
+            ),
+        ),
+        migrations.AddField(
+            model_name="importhistory",
+            name="task_id",
+            field=models.CharField(
+                blank=True, max_length=255, null=True, verbose_name="Task ID"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="importhistory",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("queued", "Queued"),
+                    ("processing", "Processing"),
+                    ("success", "Success"),
+                    ("partial", "Partial Success"),
+                    ("failed", "Failed"),
+                    ("cancelled", "Cancelled"),
+                ],
+                default="processing",
+                max_length=20,
+                verbose_name="Status",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:03
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def compute_next_run_at(apps, schema_editor):
+    from horilla_core.services.export_schedule_service import next_run_at
+
+    ExportSchedule = apps.get_model("horilla_core", "ExportSchedule")
+    today = timezone.now().date()
+    for schedule in ExportSchedule.objects.all():
+        schedule.next_run_at = next_run_at(schedule, today)
+        schedule.save(update_fields=["next_run_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("horilla_core", "0008_importhistory_background_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportschedule",
+            name="next_run_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Computed from the frequency fields whenever the schedule is saved",
+                null=True,
+                verbose_name="Next Run At",
+            ),
+        ),
+        migrations.RunPython(compute_next_run_at, migrations.RunPython.noop),
+    ]
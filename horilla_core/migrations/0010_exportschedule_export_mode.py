@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("horilla_core", "0009_exportschedule_next_run_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportschedule",
+            name="export_mode",
+            field=models.CharField(
+                choices=[("full", "Full"), ("delta", "Changes since last run")],
+                default="full",
+                max_length=10,
+                verbose_name="Export Mode",
+            ),
+        ),
+        migrations.AddField(
+            model_name="exportschedule",
+            name="high_water_marks",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Start time of the last successful run per module",
+                verbose_name="High Water Marks",
+            ),
+        ),
+    ]
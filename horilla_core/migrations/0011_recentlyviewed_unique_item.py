@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:21
+
+from django.db import migrations, models
+
+
+def remove_duplicate_views(apps, schema_editor):
+    """Keep only the newest row per (user, content_type, object_id)."""
+    RecentlyViewed = apps.get_model("horilla_core", "RecentlyViewed")
+    newest = models.Subquery(
+        RecentlyViewed._default_manager.filter(
+            user=models.OuterRef("user"),
+            content_type=models.OuterRef("content_type"),
+            object_id=models.OuterRef("object_id"),
+        )
+        .order_by("-viewed_at", "-pk")
+        .values("pk")[:1]
+    )
+    RecentlyViewed._default_manager.annotate(newest=newest).exclude(
+        pk=models.F("newest")
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("horilla_core", "0010_exportschedule_export_mode"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_views, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="recentlyviewed",
+            name="horilla_cor_user_id_ffb4fb_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="recentlyviewed",
+            constraint=models.UniqueConstraint(
+                fields=("user", "content_type", "object_id"),
+                name="unique_recently_viewed_item",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("horilla_core", "0011_recentlyviewed_unique_item"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importhistory",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text="Times a worker started or resumed the import",
+                verbose_name="Attempts",
+            ),
+        ),
+    ]
@@ -27,8 +27,11 @@ from django.contrib.auth.models import (
 )
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Cast, Concat
 from django.urls import reverse_lazy
 from django.utils import timezone
 from django.utils.formats import time_format
@@ -44,6 +47,7 @@ from pytz import common_timezones
 # First-party / Horilla imports
 from horilla.menu.sub_section_menu import sub_section_menu
 from horilla.registry.permission_registry import permission_exempt_model
+from horilla.registry.relation_registry import fk_relations_to, generic_relations
 from horilla.utils.choices import (
     CURRENCY_FORMAT_CHOICES,
     DATE_FORMAT_CHOICES,
@@ -53,6 +57,7 @@ from horilla.utils.choices import (
     NUMBER_GROUPING_CHOICES,
     TIME_FORMAT_CHOICES,
 )
+from horilla.utils.process_cache import shared_timeout
 from horilla_utils.methods import render_template
 from horilla_utils.middlewares import _thread_local
 
@@ -472,85 +477,88 @@ class HorillaCoreModel(models.Model):
         """
         return self.history.all().order_by("-timestamp")
 
-    @property
-    def full_histories(self):
-        """
-        Returns auditlog history for this object + any related models (FK or GFK) with
-        optimized status field retrieval.
+    def full_history_queryset(self):
         """
-        own_history = list(self.history.all())
+        Returns one LogEntry queryset, newest first, covering this object and
+        every object pointing at it through a ForeignKey or GenericForeignKey.
 
-        current_model = self.__class__
-        content_type = ContentType.objects.get_for_model(current_model)
-        related_history = []
-
-        model_ct_map = {
-            model: ContentType.objects.get_for_model(model)
-            for model in apps.get_models()
-        }
+        Related objects are matched with subqueries built from the relation
+        registry, so ordering and pagination can happen in the database.
+        """
+        content_type = ContentType.objects.get_for_model(self.__class__)
+        condition = models.Q(content_type=content_type, object_pk=str(self.pk))
 
-        for model, model_ct in model_ct_map.items():
-            opts = model._meta
-            related_pks = set()
+        related = [
+            (model, [models.Q(**{name: self}) for name in field_names])
+            for model, field_names in fk_relations_to(self.__class__).items()
+        ]
+        related += [
+            (
+                model,
+                [
+                    models.Q(**{ct_field: content_type, fk_field: self.pk})
+                    for ct_field, fk_field in gfks
+                ],
+            )
+            for model, gfks in generic_relations()
+        ]
 
-            fk_fields = [
-                f
-                for f in opts.get_fields()
-                if isinstance(f, models.ForeignKey) and f.related_model == current_model
-            ]
+        content_types = ContentType.objects.get_for_models(
+            *{model for model, _conditions in related}
+        )
+        for model, conditions in related:
+            model_condition = models.Q()
+            for related_condition in conditions:
+                model_condition |= related_condition
+            related_pks = (
+                model.objects.filter(model_condition)
+                .annotate(_history_pk=Cast("pk", models.CharField()))
+                .values("_history_pk")
+            )
+            condition |= models.Q(
+                content_type=content_types[model], object_pk__in=related_pks
+            )
 
-            if fk_fields:
-                or_conditions = models.Q()
-                for field in fk_fields:
-                    or_conditions |= models.Q(**{field.name: self})
+        return LogEntry.objects.filter(condition).order_by("-timestamp")
 
-                related_pks.update(
-                    model.objects.filter(or_conditions).values_list("pk", flat=True)
+    def annotate_history_status(self, entries):
+        """
+        Sets ``status`` on the entries of related models that have one, with
+        one query per content type present in ``entries``.
+        """
+        content_type = ContentType.objects.get_for_model(self.__class__)
+        related_pks = {}
+        for entry in entries:
+            if (entry.content_type_id, entry.object_pk) != (
+                content_type.pk,
+                str(self.pk),
+            ):
+                related_pks.setdefault(entry.content_type_id, set()).add(
+                    entry.object_pk
                 )
 
-            gfk_fields = [
-                f
-                for f in model._meta.private_fields
-                if isinstance(f, GenericForeignKey)
-            ]
-
-            for gfk in gfk_fields:
-                ct_field = gfk.ct_field
-                id_field = gfk.fk_field
-
-                gfk_pks = model.objects.filter(
-                    **{ct_field: content_type, id_field: self.pk}
-                ).values_list("pk", flat=True)
-
-                related_pks.update(gfk_pks)
-
-            if related_pks:
-                if hasattr(model, "status"):
-                    status_map = {
-                        str(obj.pk): obj.status
-                        for obj in model.objects.filter(pk__in=related_pks).only(
-                            "pk", "status"
-                        )
-                    }
-
-                    entries = LogEntry.objects.filter(
-                        content_type=model_ct,
-                        object_pk__in=[str(pk) for pk in related_pks],
-                    )
+        for content_type_id, pks in related_pks.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model is None or not hasattr(model, "status"):
+                continue
+            status_map = {
+                str(pk): status
+                for pk, status in model.objects.filter(pk__in=pks).values_list(
+                    "pk", "status"
+                )
+            }
+            for entry in entries:
+                if entry.content_type_id == content_type_id:
+                    entry.status = status_map.get(entry.object_pk)
+        return entries
 
-                    for entry in entries:
-                        entry.status = status_map.get(entry.object_pk)
-                    related_history.extend(entries)
-                else:
-                    related_history.extend(
-                        LogEntry.objects.filter(
-                            content_type=model_ct,
-                            object_pk__in=[str(pk) for pk in related_pks],
-                        )
-                    )
-        return sorted(
-            own_history + related_history, key=lambda x: x.timestamp, reverse=True
-        )
+    @property
+    def full_histories(self):
+        """
+        Returns auditlog history for this object + any related models (FK or GFK)
+        newest first, with the status of related records set on their entries.
+        """
+        return self.annotate_history_status(list(self.full_history_queryset()))
 
 
 class Department(HorillaCoreModel):
@@ -973,6 +981,9 @@ class HorillaUser(AbstractUser):
         "department": "readonly",
     }
 
+    TYPEAHEAD_FIELDS = ["first_name", "last_name", "username", "email"]
+    TYPEAHEAD_LABEL = Concat("first_name", Value(" "), "last_name")
+
     class Meta:
         """
         Meta options for the HorillaUser model.
@@ -1329,23 +1340,74 @@ class ListColumnVisibility(models.Model):
         return f"{self.user.username} - {self.app_label}.{self.model_name}"
 
 
+def recently_viewed_cache_key(user_id):
+    """Cache key of a user's resolved recently viewed items."""
+    return f"recently_viewed_items:{user_id}"
+
+
 class RecentlyViewedManager(models.Manager):
     """
     Manager for RecentlyViewed model to handle recently viewed items.
     """
 
+    keep = 25
+    cache_timeout = 300
+
     def add_viewed_item(self, user, obj):
-        """Add or update a recently viewed item for a user."""
+        """
+        Record a view with one upsert on (user, content_type, object_id) and
+        trim the user's list to the newest ``keep`` rows in one bounded query.
+        """
         content_type = ContentType.objects.get_for_model(obj)
-        self.filter(user=user, content_type=content_type, object_id=obj.pk).delete()
-        self.create(user=user, content_type=content_type, object_id=obj.pk)
-        if self.filter(user=user).count() > 25:
-            recent_ids = (
-                self.filter(user=user)
-                .order_by("-viewed_at")
-                .values_list("id", flat=True)[:20]
-            )
-            self.filter(user=user).exclude(id__in=recent_ids).delete()
+        self.bulk_create(
+            [
+                self.model(
+                    user=user,
+                    content_type=content_type,
+                    object_id=obj.pk,
+                    viewed_at=timezone.now(),
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "content_type", "object_id"],
+            update_fields=["viewed_at"],
+        )
+        cutoff = (
+            self.filter(user=user)
+            .order_by("-viewed_at")
+            .values("viewed_at")[self.keep - 1 : self.keep]
+        )
+        self.filter(user=user, viewed_at__lt=models.Subquery(cutoff)).delete()
+        cache.delete(recently_viewed_cache_key(user.pk))
+
+    def resolve_items(self, items):
+        """
+        Attach ``content_object`` to ``items`` with one ``in_bulk`` per content
+        type. Returns the items whose object still exists, in order, and
+        deletes the rows pointing at removed objects.
+        """
+        items = list(items)
+        object_ids = {}
+        for item in items:
+            object_ids.setdefault(item.content_type_id, set()).add(item.object_id)
+
+        objects = {}
+        for content_type_id, ids in object_ids.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model is not None:
+                objects[content_type_id] = model._base_manager.in_bulk(ids)
+
+        resolved, missing = [], []
+        for item in items:
+            obj = objects.get(item.content_type_id, {}).get(item.object_id)
+            if obj is None:
+                missing.append(item.pk)
+            else:
+                item.content_object = obj
+                resolved.append(item)
+        if missing:
+            self.filter(pk__in=missing).delete()
+        return resolved
 
     def get_recently_viewed(self, user, model_class=None, limit=20):
         """Get recently viewed items for a user, optionally filtered by model class."""
@@ -1353,7 +1415,45 @@ class RecentlyViewedManager(models.Manager):
         if model_class:
             content_type = ContentType.objects.get_for_model(model_class)
             queryset = queryset.filter(content_type=content_type)
-        return [item.content_object for item in queryset if item.content_object][:limit]
+        return [item.content_object for item in self.resolve_items(queryset)][:limit]
+
+    def get_recent_items(self, user, limit=6):
+        """
+        Return the user's newest resolved RecentlyViewed rows with their
+        detail URLs computed. Only the row keys are cached, until the user
+        views another record, so renamed or deleted records are resolved
+        afresh on every call.
+        """
+        key = recently_viewed_cache_key(user.pk)
+        rows = cache.get(key)
+        if rows is None:
+            rows = list(
+                self.filter(user=user)
+                .order_by("-viewed_at")
+                .values_list("pk", "content_type_id", "object_id", "viewed_at")
+            )
+            cache.set(key, rows, shared_timeout(self.cache_timeout))
+
+        items, start = [], 0
+        while len(items) < limit and start < len(rows):
+            window = rows[start : start + limit - len(items)]
+            start += len(window)
+            resolved = self.resolve_items(
+                self.model(
+                    pk=pk,
+                    user=user,
+                    content_type_id=content_type_id,
+                    object_id=object_id,
+                    viewed_at=viewed_at,
+                )
+                for pk, content_type_id, object_id, viewed_at in window
+            )
+            if len(resolved) < len(window):
+                cache.delete(key)
+            items.extend(resolved)
+        for item in items:
+            item.get_detail_url()
+        return items
 
 
 @permission_exempt_model
@@ -1379,8 +1479,13 @@ class RecentlyViewed(models.Model):
         Meta options for the RecentlyViewed model.
         """
 
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "content_type", "object_id"],
+                name="unique_recently_viewed_item",
+            ),
+        ]
         indexes = [
-            models.Index(fields=["user", "content_type", "object_id"]),
             models.Index(fields=["user", "viewed_at"]),
         ]
         ordering = ["-viewed_at"]
@@ -1406,8 +1511,14 @@ class RecentlyViewed(models.Model):
         """
         Tries to call any method on the related object that starts with 'get_detail_'.
         Appends section query parameter based on the app_label.
-        Falls back to '#' if not found.
+        Falls back to '#' if not found. The result is kept on the instance, so
+        templates reading it more than once do not rebuild it.
         """
+        if "_detail_url" not in self.__dict__:
+            self._detail_url = self._build_detail_url()
+        return self._detail_url
+
+    def _build_detail_url(self):
         if not self.content_object:
             return "#"
 
@@ -3068,10 +3179,12 @@ class ImportHistory(HorillaCoreModel):
     """
 
     STATUS_CHOICES = [
+        ("queued", _("Queued")),
         ("processing", _("Processing")),
         ("success", _("Success")),
         ("partial", _("Partial Success")),
         ("failed", _("Failed")),
+        ("cancelled", _("Cancelled")),
     ]
 
     import_name = models.CharField(max_length=255, verbose_name=_("Import Name"))
@@ -3110,6 +3223,43 @@ class ImportHistory(HorillaCoreModel):
         blank=True,
         verbose_name=_("Duration (seconds)"),
     )
+    import_config = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text=_("Wizard mappings used to run (or resume) the import"),
+    )
+    last_committed_row = models.IntegerField(
+        default=0, verbose_name=_("Last Committed Row")
+    )
+    estimated_rows = models.IntegerField(
+        default=0,
+        verbose_name=_("Estimated Rows"),
+        help_text=_("Row count estimated from the file, used for progress"),
+    )
+    task_id = models.CharField(
+        max_length=255, blank=True, null=True, verbose_name=_("Task ID")
+    )
+    cancel_requested = models.BooleanField(
+        default=False, verbose_name=_("Cancel Requested")
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_("Attempts"),
+        help_text=_("Times a worker started or resumed the import"),
+    )
+    started_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("Started At")
+    )
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("Finished At")
+    )
+    rows_per_second = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name=_("Rows per Second"),
+    )
 
     class Meta:
         """
@@ -3152,16 +3302,27 @@ class ImportHistory(HorillaCoreModel):
     @property
     def is_complete(self):
         """Returns True if the import process is complete."""
-        return self.status in ["success", "partial", "failed"]
+        return self.status in ["success", "partial", "failed", "cancelled"]
+
+    @property
+    def progress_percent(self):
+        """Returns the share of the estimated rows processed so far."""
+        if self.is_complete:
+            return 100
+        if not self.estimated_rows:
+            return 0
+        return min(int(self.total_rows * 100 / self.estimated_rows), 99)
 
     @property
     def status_color_class(self):
         """Returns the CSS class for the status badge."""
         colors = {
+            "queued": "bg-gray-100 text-gray-800",
             "processing": "bg-blue-100 text-blue-800",
             "success": "bg-green-100 text-green-800",
             "partial": "bg-yellow-100 text-yellow-800",
             "failed": "bg-red-100 text-red-800",
+            "cancelled": "bg-gray-100 text-gray-800",
         }
         return colors.get(self.status, "bg-gray-100 text-gray-800")
 
@@ -3277,6 +3438,10 @@ class ExportSchedule(HorillaCoreModel):
         ("weekly", _("Weekly")),
         ("monthly", _("Monthly")),
     )
+    EXPORT_MODE_CHOICES = (
+        ("full", _("Full")),
+        ("delta", _("Changes since last run")),
+    )
 
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -3316,9 +3481,33 @@ class ExportSchedule(HorillaCoreModel):
         null=True, blank=True, choices=[(i, i) for i in range(1, 13)]
     )
 
+    export_mode = models.CharField(
+        max_length=10,
+        choices=EXPORT_MODE_CHOICES,
+        default="full",
+        verbose_name=_("Export Mode"),
+    )
+    high_water_marks = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name=_("High Water Marks"),
+        help_text=_("Start time of the last successful run per module"),
+    )
+
     last_run = models.DateField(
         null=True, blank=True, verbose_name=_("Last Executed On")
     )
+    next_run_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name=_("Next Run At"),
+        help_text=_(
+            "Computed from the frequency fields whenever the schedule is saved"
+        ),
+    )
 
     class Meta:
         """
@@ -3331,6 +3520,18 @@ class ExportSchedule(HorillaCoreModel):
     def __str__(self):
         return f"{self.user} – {self.frequency} – {self.export_format}"
 
+    def save(self, *args, **kwargs):
+        """
+        Recompute next_run_at so the dispatcher only has to probe its index.
+        """
+        from horilla_core.services.export_schedule_service import next_run_at
+
+        self.next_run_at = next_run_at(self, timezone.now().date())
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "next_run_at" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "next_run_at"]
+        super().save(*args, **kwargs)
+
     def module_names_display(self):
         """Return the module names as a comma-separated string."""
         return ", ".join(self.modules)
@@ -1,3 +1,4 @@
 from .fiscal_year_service import FiscalYearService
+from .import_service import ImportService
 
-__all__ = ['FiscalYearService']
+__all__ = ['FiscalYearService', 'ImportService']
@@ -0,0 +1,114 @@
+"""
+Process-local and shared-cache registry of companies.
+
+Companies change rarely but are resolved on every request. The registry
+keeps every company keyed by ID in the shared cache under a version token,
+and each process keeps its own copy until the token changes. ``Company``
+saves and deletes bump the token (see ``horilla_core.signals``), so the
+steady state resolves companies without database queries. Process-local
+copies are reloaded after ``HORILLA_PROCESS_CACHE_TIMEOUT`` seconds (see
+``horilla.utils.process_cache``) for processes that miss the bump.
+
+Callers get copies of the registered instances, so changing a returned
+company never leaks into other requests.
+"""
+
+# Standard library imports
+import copy
+import time
+import uuid
+
+# Third-party imports (Django)
+from django.conf import settings
+from django.core.cache import cache
+
+# First-party / Horilla imports
+from horilla.utils.process_cache import local_timeout, shared_timeout
+from horilla_core.models import Company
+
+COMPANY_VERSION_KEY = "company_registry:version"
+COMPANIES_KEY = "company_registry:companies:{}"
+ALLOWED_COMPANIES_KEY = "company_registry:allowed:{}:{}:{}:{}"
+
+_registry = {"version": None, "loaded_at": 0.0, "companies": {}}
+
+
+def company_cache_timeout():
+    """Seconds the shared company map is kept."""
+    return getattr(settings, "HORILLA_COMPANY_CACHE_TIMEOUT", 3600)
+
+
+def company_version():
+    """Return the current registry version token."""
+    version = cache.get(COMPANY_VERSION_KEY)
+    if version is None:
+        cache.add(COMPANY_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(COMPANY_VERSION_KEY)
+    return version
+
+
+def bump_company_version():
+    """Retire the shared and process-local company maps."""
+    cache.set(COMPANY_VERSION_KEY, uuid.uuid4().hex, None)
+    _registry.update(version=None, companies={})
+
+
+def _companies():
+    version = company_version()
+    now = time.monotonic()
+    if (
+        _registry["version"] == version
+        and now - _registry["loaded_at"] <= local_timeout()
+    ):
+        return _registry["companies"]
+
+    key = COMPANIES_KEY.format(version)
+    companies = cache.get(key)
+    if companies is None:
+        companies = {company.pk: company for company in Company.objects.all()}
+        cache.set(key, companies, shared_timeout(company_cache_timeout()))
+    _registry.update(version=version, loaded_at=now, companies=companies)
+    return companies
+
+
+def get_company(company_id):
+    """Return a copy of the company with ``company_id``, or None."""
+    if not company_id:
+        return None
+    company = _companies().get(company_id)
+    if company is None:
+        # Created in another process since the map was built.
+        return Company.objects.filter(pk=company_id).first()
+    return copy.copy(company)
+
+
+def company_list():
+    """Return copies of all companies in their default ordering."""
+    return [copy.copy(company) for company in _companies().values()]
+
+
+def allowed_company_ids(user):
+    """
+    Return the IDs of the companies ``user`` may make active.
+
+    Users with ``horilla_core.can_switch_company`` may use every company,
+    everyone else only their own. The set is cached per user until the
+    companies or the user's permissions change.
+    """
+    # Imported here: the layout context builds on this registry.
+    from horilla.utils.layout_context import layout_version
+
+    if not user.is_authenticated:
+        return frozenset()
+
+    key = ALLOWED_COMPANIES_KEY.format(
+        user.pk, company_version(), *layout_version(user.pk)
+    )
+    allowed = cache.get(key)
+    if allowed is None:
+        if user.has_perm("horilla_core.can_switch_company"):
+            allowed = frozenset(_companies())
+        else:
+            allowed = frozenset({user.company_id} if user.company_id else ())
+        cache.set(key, allowed, shared_timeout(company_cache_timeout()))
+    return allowed
@@ -0,0 +1,126 @@
+"""
+Set-based re-conversion of stored amounts.
+
+When a company changes its base currency, every registered money field
+(see ``horilla.registry.money_registry``) of the company's records is
+multiplied by the conversion rate. Each model/field pair is one
+``UPDATE ... SET field = field * rate`` inside a single transaction, so
+the cost no longer grows with rows loaded into Python.
+
+``HORILLA_CURRENCY_RECONVERSION_ASYNC`` hands the work to the
+``reconvert_company_currency`` Celery task after the currency change
+commits, which reports progress and returns the same summary.
+"""
+
+# Standard library imports
+import logging
+import time
+from decimal import Decimal
+
+# Third-party imports (Django)
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+# First-party / Horilla imports
+from horilla.registry.money_registry import get_money_fields
+
+logger = logging.getLogger(__name__)
+
+
+def reconvert_company_amounts(company_id, conversion_rate, progress=None):
+    """
+    Multiply every registered money field of the company by ``conversion_rate``.
+
+    Args:
+        company_id: Primary key of the company whose records are converted
+        conversion_rate: Rate from the old to the new base currency
+        progress: Optional callable ``progress(done, total, label)`` called
+            after each model/field statement
+
+    Returns:
+        dict: ``{"rate", "rows", "seconds", "fields": {"app.Model.field": rows}}``
+    """
+    rate = Decimal(str(conversion_rate))
+    entries = get_money_fields()
+    total = sum(len(entry.fields) for entry in entries)
+    summary = {"rate": str(rate), "rows": 0, "fields": {}}
+    started = time.monotonic()
+    done = 0
+
+    with transaction.atomic():
+        for entry in entries:
+            queryset = entry.model._base_manager.filter(
+                **{entry.company_lookup: company_id}
+            )
+            for field in entry.fields:
+                rows = queryset.filter(**{f"{field}__isnull": False}).update(
+                    **{field: F(field) * rate}
+                )
+                label = f"{entry.model._meta.label}.{field}"
+                summary["fields"][label] = rows
+                summary["rows"] += rows
+                done += 1
+                if progress:
+                    progress(done, total, label)
+
+    summary["seconds"] = round(time.monotonic() - started, 3)
+    send_amounts_reconverted(company_id, summary)
+    logger.info(
+        "Re-converted %s amounts of company %s at rate %s in %ss: %s",
+        summary["rows"],
+        company_id,
+        rate,
+        summary["seconds"],
+        summary["fields"],
+    )
+    return summary
+
+
+def send_amounts_reconverted(company_id, summary):
+    """
+    Send ``amounts_reconverted`` so apps can refresh data derived from the
+    converted amounts (the updates bypassed model signals).
+    """
+    # Imported here: the signal module imports this service.
+    from horilla_core.signals import amounts_reconverted
+
+    responses = amounts_reconverted.send_robust(
+        sender=None, company_id=company_id, summary=summary
+    )
+    for receiver, response in responses:
+        if isinstance(response, Exception):
+            logger.error(
+                "Currency re-conversion of company %s: %s failed: %s",
+                company_id,
+                getattr(receiver, "__name__", receiver),
+                response,
+            )
+
+
+def schedule_reconversion(company_id, conversion_rate):
+    """
+    Re-convert the company's amounts for a base currency change.
+
+    Runs in the current transaction unless background re-conversion is
+    enabled and the task can be queued once the change commits.
+    """
+    if not getattr(settings, "HORILLA_CURRENCY_RECONVERSION_ASYNC", False):
+        return reconvert_company_amounts(company_id, conversion_rate)
+
+    # Imported here: the task module imports this service.
+    from horilla_core.tasks import reconvert_company_currency
+
+    def queue():
+        try:
+            reconvert_company_currency.delay(company_id, str(conversion_rate))
+        except Exception as e:
+            logger.warning(
+                "Could not queue currency re-conversion for company %s: %s",
+                company_id,
+                e,
+            )
+            reconvert_company_amounts(company_id, conversion_rate)
+
+    transaction.on_commit(queue)
+    return None
@@ -0,0 +1,251 @@
+"""
+Cached currency tables and a per-request money formatter.
+
+Lists, reports and dashboards format every currency cell with the company
+default currency, the user's preferred currency and the conversion rate of
+the day. The service loads each company's currencies and dated conversion
+rates once into a :class:`CurrencyTable`, in which the rate on a date is a
+bisect over the sorted start dates. Tables are kept per process and in the
+shared cache under a version token, which currency and dated rate changes
+bump (see ``horilla_core.signals``). Process-local tables are reloaded
+after ``HORILLA_PROCESS_CACHE_TIMEOUT`` seconds (see
+``horilla.utils.process_cache``) for processes that miss the bump.
+
+:func:`get_currency_formatter` returns one :class:`CurrencyFormatter` per
+request, so the user's currency is resolved once for all cells.
+"""
+
+# Standard library imports
+import bisect
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+
+# Third-party imports (Django)
+from django.conf import settings
+from django.core.cache import cache
+
+# First-party / Horilla imports
+from horilla.utils.process_cache import local_timeout, shared_timeout
+from horilla_core.models import DatedConversionRate, MultipleCurrency
+from horilla_utils.middlewares import _thread_local
+
+CURRENCY_VERSION_KEY = "currency_service:version"
+CURRENCY_TABLE_KEY = "currency_service:table:{}:{}"
+
+_tables = {"version": None, "loaded_at": 0.0, "entries": {}}
+
+_UNSET = object()
+
+
+def currency_cache_timeout():
+    """Seconds a company's currency table is kept in the shared cache."""
+    return getattr(settings, "HORILLA_CURRENCY_CACHE_TIMEOUT", 3600)
+
+
+def currency_version():
+    """Return the current currency table version token."""
+    version = cache.get(CURRENCY_VERSION_KEY)
+    if version is None:
+        cache.add(CURRENCY_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(CURRENCY_VERSION_KEY)
+    return version
+
+
+def bump_currency_version():
+    """Retire every shared and process-local currency table."""
+    cache.set(CURRENCY_VERSION_KEY, uuid.uuid4().hex, None)
+    _tables.update(version=None, entries={})
+
+
+class RateIndex:
+    """Dated conversion rates of one currency, sorted by start date."""
+
+    __slots__ = ("start_dates", "rates", "fallback")
+
+    def __init__(self, start_dates, rates, fallback):
+        self.start_dates = start_dates
+        self.rates = rates
+        self.fallback = fallback
+
+    def rate_on(self, day):
+        """Return the rate in effect on ``day``, or the static rate before any."""
+        index = bisect.bisect_right(self.start_dates, day) - 1
+        return self.rates[index] if index >= 0 else self.fallback
+
+
+class CurrencyTable:
+    """The currencies of one company with their rate indexes."""
+
+    __slots__ = ("currencies", "default_id", "indexes")
+
+    def __init__(self, currencies, default_id, indexes):
+        self.currencies = currencies
+        self.default_id = default_id
+        self.indexes = indexes
+
+    @property
+    def default(self):
+        """The company's default currency, or None."""
+        return self.currencies.get(self.default_id)
+
+    def rate_on(self, currency, day=None):
+        """Return ``currency``'s conversion rate on ``day`` (today by default)."""
+        if day is None:
+            day = date.today()
+        index = self.indexes.get(currency.pk)
+        if index is None:
+            return currency.conversion_rate
+        return index.rate_on(day)
+
+
+def _load_table(company_id):
+    currencies = {
+        currency.pk: currency
+        for currency in MultipleCurrency.all_objects.filter(
+            company_id=company_id
+        ).order_by("pk")
+    }
+    default_id = next(
+        (pk for pk, currency in currencies.items() if currency.is_default), None
+    )
+
+    dated = {}
+    rows = (
+        DatedConversionRate.all_objects.filter(
+            company_id=company_id, currency_id__in=currencies
+        )
+        .order_by("currency_id", "start_date")
+        .values_list("currency_id", "start_date", "conversion_rate")
+    )
+    for currency_id, start_date, rate in rows:
+        start_dates, rates = dated.setdefault(currency_id, ([], []))
+        start_dates.append(start_date)
+        rates.append(rate)
+
+    indexes = {
+        currency_id: RateIndex(
+            start_dates, rates, currencies[currency_id].conversion_rate
+        )
+        for currency_id, (start_dates, rates) in dated.items()
+    }
+    return CurrencyTable(currencies, default_id, indexes)
+
+
+def get_currency_table(company_id):
+    """Return the :class:`CurrencyTable` of the company with ``company_id``."""
+    version = currency_version()
+    now = time.monotonic()
+    if _tables["version"] != version or now - _tables["loaded_at"] > local_timeout():
+        _tables.update(version=version, loaded_at=now, entries={})
+    entries = _tables["entries"]
+
+    table = entries.get(company_id)
+    if table is None:
+        key = CURRENCY_TABLE_KEY.format(version, company_id)
+        table = cache.get(key)
+        if table is None:
+            table = _load_table(company_id)
+            cache.set(key, table, shared_timeout(currency_cache_timeout()))
+        entries[company_id] = table
+    return table
+
+
+def _company_id(obj):
+    if hasattr(obj, "company_id"):
+        return obj.company_id
+    company = getattr(obj, "company", None)
+    return company.pk if company else None
+
+
+class CurrencyFormatter:
+    """
+    Formats money for one user. Build it once per request (see
+    :func:`get_currency_formatter`) and reuse it for every cell.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._user_currency = _UNSET
+
+    def default_currency(self, company_id):
+        """Return the default currency of the company with ``company_id``."""
+        if not company_id:
+            return None
+        return get_currency_table(company_id).default
+
+    @property
+    def user_currency(self):
+        """The user's preferred currency, falling back to the company default."""
+        if self._user_currency is _UNSET:
+            user = self.user
+            currency = None
+            if user and user.is_authenticated:
+                if getattr(user, "currency_id", None):
+                    currency = user.currency
+                elif getattr(user, "company_id", None):
+                    currency = self.default_currency(user.company_id)
+            self._user_currency = currency
+        return self._user_currency
+
+    def convert_from_default(self, currency, amount, conversion_date=None):
+        """Convert ``amount`` from the default currency to ``currency``."""
+        if amount is None:
+            return Decimal("0")
+        rate = get_currency_table(currency.company_id).rate_on(
+            currency, conversion_date
+        )
+        return Decimal(str(amount)) * rate
+
+    def display(self, obj, field_name):
+        """
+        Format ``obj.field_name`` like ``USD 100.00``, adding the user's
+        currency when it differs: ``USD 100.00 (EUR 85.00)``.
+        """
+        value = getattr(obj, field_name, None)
+        if value is None or value == "":
+            return ""
+
+        company_id = _company_id(obj)
+        if not company_id and self.user is not None:
+            company_id = getattr(self.user, "company_id", None)
+        if not company_id:
+            return str(value)
+
+        default_currency = self.default_currency(company_id)
+        if not default_currency:
+            return str(value)
+
+        user_currency = self.user_currency
+        if not user_currency or user_currency.pk == default_currency.pk:
+            return default_currency.display_with_symbol(value)
+
+        converted_amount = self.convert_from_default(user_currency, value)
+        user_display = user_currency.display_with_symbol(converted_amount)
+        default_display = default_currency.display_with_symbol(value)
+        return f"{default_display} ({user_display})"
+
+    def format(self, value):
+        """Format ``value`` in the user's currency without conversion."""
+        if not value:
+            return ""
+        if self.user_currency:
+            return self.user_currency.display_with_symbol(value)
+        return str(value)
+
+
+def get_currency_formatter(user):
+    """
+    Return the formatter of ``user``, shared by the current request when
+    it belongs to the request's user.
+    """
+    request = getattr(_thread_local, "request", None)
+    if request is None or getattr(request, "user", None) != user:
+        return CurrencyFormatter(user)
+
+    formatter = getattr(request, "_currency_formatter", None)
+    if formatter is None or formatter.user != user:
+        formatter = CurrencyFormatter(user)
+        request._currency_formatter = formatter
+    return formatter
@@ -0,0 +1,122 @@
+# Standard library imports
+from datetime import date, datetime, time
+from datetime import timezone as dt_timezone
+
+# Third-party imports (Others)
+from dateutil.relativedelta import relativedelta
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+
+def _as_date(value):
+    """Return ``value`` as a date; the schedule views assign ISO strings."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _weekday_index(value):
+    """Map ``"monday"`` or ``"mon"`` to ``date.weekday()`` numbering."""
+    value = (value or "").lower()[:3]
+    for index, name in enumerate(WEEKDAYS):
+        if name.startswith(value) and value:
+            return index
+    return None
+
+
+def _earliest_date(schedule, last_run, today):
+    """First date a schedule may run again, before applying its day rules."""
+    candidates = [today]
+    start_date = _as_date(schedule.start_date)
+    if start_date:
+        candidates.append(start_date)
+    if last_run:
+        if schedule.frequency == "daily":
+            candidates.append(last_run + relativedelta(days=1))
+        elif schedule.frequency == "weekly":
+            candidates.append(last_run + relativedelta(days=7))
+        elif schedule.frequency == "monthly":
+            candidates.append(last_run + relativedelta(day=1, months=1))
+        elif schedule.frequency == "yearly":
+            candidates.append(date(last_run.year + 1, 1, 1))
+    return max(candidates)
+
+
+def next_run_date(schedule, today):
+    """
+    Return the next date ``schedule`` is due on or after ``today``.
+
+    Follows the rules the dispatcher used to evaluate on every tick: daily
+    schedules run once per day, weekly ones on their weekday at least seven
+    days apart, monthly and yearly ones on their day once per month or year.
+    Months without the configured day are skipped. Returns None when the
+    schedule cannot run again before its end date.
+    """
+    earliest = _earliest_date(schedule, _as_date(schedule.last_run), today)
+    frequency = schedule.frequency
+    due = None
+
+    if frequency == "daily":
+        due = earliest
+    elif frequency == "weekly":
+        weekday = _weekday_index(schedule.weekday)
+        if weekday is not None:
+            due = earliest + relativedelta(days=(weekday - earliest.weekday()) % 7)
+    elif frequency == "monthly":
+        day = _as_int(schedule.day_of_month)
+        month = earliest.replace(day=1)
+        while day and 1 <= day <= 31 and due is None:
+            if day <= (month + relativedelta(day=31)).day:
+                candidate = month.replace(day=day)
+                if candidate >= earliest:
+                    due = candidate
+            month += relativedelta(months=1)
+    elif frequency == "yearly":
+        day = _as_int(schedule.yearly_day_of_month)
+        month = _as_int(schedule.yearly_month)
+        # Eight years always include a leap year for 29 February.
+        for year in range(earliest.year, earliest.year + 8):
+            try:
+                candidate = date(year, month, day)
+            except (TypeError, ValueError):
+                continue
+            if candidate >= earliest:
+                due = candidate
+                break
+
+    end_date = _as_date(schedule.end_date)
+    if due and end_date and due > end_date:
+        return None
+    return due
+
+
+def next_run_at(schedule, today):
+    """
+    Return the moment ``schedule`` becomes due, or None.
+
+    Schedules are date based and ``last_run`` stores the UTC date of
+    ``timezone.now()``, so the due moment is midnight UTC of the next run date.
+    """
+    due = next_run_date(schedule, today)
+    if due is None:
+        return None
+    return datetime.combine(due, time.min, tzinfo=dt_timezone.utc)
@@ -0,0 +1,503 @@
+"""
+Streaming writers for scheduled exports.
+
+Rows are read with ``values_list`` and ``iterator(chunk_size=...)`` and
+written straight to a file under ``HORILLA_EXPORT_ROOT``, so the worker
+never holds a whole module in memory. That directory must be outside
+``MEDIA_ROOT``: export files are only served through signed, per-recipient
+download links. Foreign keys are rendered with
+the related object's ``__str__`` like the old in-memory export, resolved
+with one ``in_bulk`` query per relation and chunk.
+"""
+
+# Standard library imports
+import csv
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import timedelta
+from itertools import islice
+
+# Third-party imports (Django)
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.urls import reverse
+from django.utils.translation import gettext as _
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+EXPORT_DIRECTORY = "scheduled_exports"
+SIGNING_SALT = "horilla_core.scheduled_export"
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+    "gz": "application/gzip",
+    "zip": "application/zip",
+}
+
+
+def _inside(path, directory):
+    return path == directory or path.startswith(directory + os.sep)
+
+
+def export_root():
+    """
+    Return the private directory scheduled export files are written to.
+
+    Raises ImproperlyConfigured when it lies inside ``MEDIA_ROOT``, which is
+    served without authentication.
+    """
+    root = getattr(settings, "HORILLA_EXPORT_ROOT", None) or os.path.join(
+        settings.BASE_DIR, "private_media", EXPORT_DIRECTORY
+    )
+    root = os.path.realpath(root)
+    if _inside(root, os.path.realpath(settings.MEDIA_ROOT)):
+        raise ImproperlyConfigured(
+            "HORILLA_EXPORT_ROOT must be outside MEDIA_ROOT, which is served "
+            "without authentication."
+        )
+    return root
+
+
+def make_export_directory(prefix):
+    """Create and return a fresh working directory for one export run."""
+    root = export_root()
+    os.makedirs(root, exist_ok=True)
+    return tempfile.mkdtemp(prefix=prefix, dir=root)
+
+
+class ExportRowSource:
+    """
+    Re-iterable stream of a model's rows as lists of strings.
+
+    Each iteration runs one chunked query, so multi-pass writers (the PDF
+    column pages) re-read the table instead of keeping it in memory.
+    """
+
+    def __init__(self, model, queryset=None, chunk_size=None):
+        self.model = model
+        self.queryset = model.objects.all() if queryset is None else queryset
+        self.fields = list(model._meta.fields)
+        self.headers = [str(field.verbose_name) for field in self.fields]
+        self.chunk_size = chunk_size or getattr(
+            settings, "HORILLA_EXPORT_CHUNK_SIZE", 2000
+        )
+
+    @property
+    def file_stem(self):
+        return f"{self.model.__name__}_export"
+
+    def __iter__(self):
+        columns = [field.attname for field in self.fields]
+        rows = self.queryset.values_list(*columns).iterator(chunk_size=self.chunk_size)
+        yield from self.format_chunks(rows)
+
+    def format_chunks(self, rows, change=None):
+        """Format raw ``values_list`` rows chunk by chunk."""
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            labels = self.relation_labels(chunk)
+            for row in chunk:
+                yield self.format_row(row, labels, change)
+
+    def format_row(self, row, labels, change=None):
+        return [
+            self.display(labels[position].get(value) if position in labels else value)
+            for position, value in enumerate(row)
+        ]
+
+    def relation_labels(self, chunk):
+        """Map ``{column position: {pk: str(related object)}}`` for a chunk."""
+        labels = {}
+        for position, field in enumerate(self.fields):
+            if not field.many_to_one and not field.one_to_one:
+                continue
+            pks = {row[position] for row in chunk if row[position] is not None}
+            related = field.related_model._base_manager.in_bulk(
+                pks, field_name=field.target_field.name
+            )
+            labels[position] = {pk: str(obj) for pk, obj in related.items()}
+        return labels
+
+    @staticmethod
+    def display(value):
+        return str(value) if value is not None else ""
+
+
+class DeltaRowSource(ExportRowSource):
+    """
+    Rows of a model created, updated or deleted in ``(since, until]``.
+
+    Changed rows are selected by ``created_at``/``updated_at``; deleted
+    rows come from their RecycleBin snapshot. A leading column tells
+    created, updated and deleted rows apart. Records removed without going
+    through the recycle bin are not reported.
+    """
+
+    def __init__(self, model, since, until, chunk_size=None):
+        changed = models.Q(updated_at__gt=since, updated_at__lte=until) | models.Q(
+            created_at__gt=since, created_at__lte=until
+        )
+        super().__init__(model, model.objects.filter(changed), chunk_size=chunk_size)
+        self.since = since
+        self.until = until
+        self.headers = [str(_("Change"))] + self.headers
+        self.created_position = [field.name for field in self.fields].index(
+            "created_at"
+        )
+
+    @classmethod
+    def supports(cls, model):
+        """Return True when ``model`` carries HorillaCoreModel timestamps."""
+        names = {field.name for field in model._meta.fields}
+        return {"created_at", "updated_at"} <= names
+
+    @property
+    def file_stem(self):
+        return f"{self.model.__name__}_changes"
+
+    def __iter__(self):
+        yield from super().__iter__()
+        yield from self.format_chunks(self.deleted_rows(), change=_("deleted"))
+
+    def format_row(self, row, labels, change=None):
+        if change is None:
+            created_at = row[self.created_position]
+            change = (
+                _("created") if created_at and created_at > self.since else _("updated")
+            )
+        return [str(change)] + super().format_row(row, labels)
+
+    def deleted_rows(self):
+        """Yield RecycleBin snapshots as rows in ``values_list`` column order."""
+        from horilla_core.models import RecycleBin
+
+        label = f"{self.model._meta.app_label}.{self.model._meta.model_name}"
+        snapshots = (
+            RecycleBin.objects.filter(
+                model_name=label, deleted_at__gt=self.since, deleted_at__lte=self.until
+            )
+            .order_by("deleted_at")
+            .values_list("record_id", "data")
+            .iterator(chunk_size=self.chunk_size)
+        )
+        for record_id, data in snapshots:
+            try:
+                data = json.loads(data)
+            except (TypeError, ValueError):
+                data = {}
+            yield tuple(
+                record_id if field.primary_key else data.get(field.name)
+                for field in self.fields
+            )
+
+
+def _open(path, compression, text=True):
+    if compression == "gzip":
+        return gzip.open(
+            path,
+            "wt" if text else "wb",
+            encoding="utf-8" if text else None,
+            newline="" if text else None,
+        )
+    if text:
+        return open(path, "w", encoding="utf-8", newline="")
+    return open(path, "wb")
+
+
+def write_csv(source, stream):
+    """Write ``source`` as CSV to a text stream."""
+    writer = csv.writer(stream)
+    writer.writerow(source.headers)
+    writer.writerows(source)
+
+
+def write_xlsx(source, path):
+    """Write ``source`` with openpyxl's write-only workbook."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+
+    for index in range(1, len(source.headers) + 1):
+        ws.column_dimensions[get_column_letter(index)].width = 25
+
+    header_font = Font(bold=True)
+    header_alignment = Alignment(horizontal="center")
+    header_fill = PatternFill(
+        start_color="eafb5b", end_color="eafb5b", fill_type="solid"
+    )
+    header_cells = []
+    for header in source.headers:
+        cell = WriteOnlyCell(ws, value=str(header))
+        cell.font = header_font
+        cell.alignment = header_alignment
+        cell.fill = header_fill
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for row in source:
+        ws.append(row)
+    wb.save(path)
+
+
+def write_pdf(source, stream):
+    """
+    Write ``source`` as a landscape PDF table.
+
+    Columns are split into pages of six; every column page re-reads the
+    rows page by page instead of indexing a materialized list.
+    """
+    headers = source.headers
+    page_size = (letter[1], letter[0])
+    width, height = page_size
+
+    c = canvas.Canvas(stream, pagesize=page_size)
+    document_title = f"Exported {source.model._meta.verbose_name_plural}"
+    c.setTitle(document_title)
+
+    # PDF generation parameters
+    title_font_size = 18
+    header_font_size = 12
+    data_font_size = 10
+    start_x = 50
+    start_y = height - 100
+    min_col_width = 120
+    padding = 8
+    max_rows_per_page = 7
+    max_cols_per_page = 6
+    extra_row_spacing = 10
+
+    def wrap_text(text, max_chars):
+        text = str(text) if text is not None else ""
+        if len(text) <= max_chars:
+            return [text] if text else [""]
+        words = text.split()
+        lines = []
+        current_line = ""
+        for word in words:
+            if len(current_line) + len(word) + 1 <= max_chars:
+                current_line += word + " "
+            else:
+                lines.append(current_line.strip())
+                current_line = word + " "
+        if current_line:
+            lines.append(current_line.strip())
+        return lines if lines else [""]
+
+    column_chunks = [
+        headers[i : i + max_cols_per_page]
+        for i in range(0, len(headers), max_cols_per_page)
+    ]
+
+    for chunk_idx, chunk_headers in enumerate(column_chunks):
+        total_table_width = min(len(chunk_headers) * min_col_width, width - 100)
+        col_width = total_table_width / len(chunk_headers) if chunk_headers else 100
+        max_chars_per_line = int(col_width // (header_font_size * 0.5))
+        start_col = chunk_idx * max_cols_per_page
+        column_range = f"Columns {start_col + 1} to {min(start_col + max_cols_per_page, len(headers))}"
+
+        rows = iter(source)
+        while True:
+            page_rows = list(islice(rows, max_rows_per_page))
+            if not page_rows:
+                break
+
+            # Draw title
+            c.setFont("Helvetica-Bold", title_font_size)
+            c.drawCentredString(
+                width / 2, height - 50, f"{document_title} ({column_range})"
+            )
+
+            # Draw headers
+            c.setFont("Helvetica-Bold", header_font_size)
+            header_y = start_y
+            max_header_lines = max(
+                [len(wrap_text(h, max_chars_per_line)) for h in chunk_headers]
+            )
+            header_height = max_header_lines * (header_font_size + 2) + 15
+
+            c.setFillColor(colors.lightgrey)
+            c.rect(
+                start_x,
+                header_y - header_height + 5,
+                total_table_width,
+                header_height,
+                fill=1,
+                stroke=0,
+            )
+
+            c.setFillColor(colors.black)
+            for i, header in enumerate(chunk_headers):
+                x = start_x + i * col_width + padding
+                wrapped_header = wrap_text(header, max_chars_per_line)
+                y_offset = (
+                    header_height - len(wrapped_header) * (header_font_size + 2)
+                ) / 2 + 3
+                for line in wrapped_header:
+                    c.drawString(x, header_y - y_offset, line)
+                    y_offset += header_font_size + 2
+
+            # Draw data rows
+            c.setFont("Helvetica", data_font_size)
+            y = header_y - header_height - 10
+
+            for rows_drawn, full_row in enumerate(page_rows):
+                row = full_row[start_col : start_col + max_cols_per_page]
+
+                max_lines_in_row = max(
+                    [len(wrap_text(v, max_chars_per_line)) for v in row]
+                )
+                row_height = max_lines_in_row * (data_font_size + 2) + extra_row_spacing
+
+                if rows_drawn % 2 == 0:
+                    c.setFillColor(colors.whitesmoke)
+                    c.rect(
+                        start_x,
+                        y - row_height,
+                        total_table_width,
+                        row_height,
+                        fill=1,
+                        stroke=0,
+                    )
+
+                for i, value in enumerate(row):
+                    wrapped_value = wrap_text(value, max_chars_per_line)
+                    x = start_x + i * col_width + padding
+                    text_y_offset = (
+                        row_height - len(wrapped_value) * (data_font_size + 2)
+                    ) / 2 + 9
+                    for line in wrapped_value:
+                        c.setFillColor(colors.black)
+                        c.drawString(x, y - text_y_offset, line)
+                        text_y_offset += data_font_size + 2
+
+                y -= row_height
+
+            c.showPage()
+
+    c.save()
+
+
+def write_export(source, export_format, directory, compression=None):
+    """
+    Write ``source`` in ``export_format`` into ``directory``.
+
+    ``compression="gzip"`` gzips CSV and PDF files while they are written;
+    XLSX files are zip containers already and are left as they are.
+    Returns the ``(filename, path)`` of the written file.
+    """
+    filename = f"{source.file_stem}.{export_format}"
+    if export_format == "xlsx":
+        path = os.path.join(directory, filename)
+        write_xlsx(source, path)
+        return filename, path
+
+    if compression == "gzip":
+        filename += ".gz"
+    path = os.path.join(directory, filename)
+    if export_format == "csv":
+        with _open(path, compression) as stream:
+            write_csv(source, stream)
+    elif export_format == "pdf":
+        with _open(path, compression, text=False) as stream:
+            write_pdf(source, stream)
+    else:
+        return None, None
+    return filename, path
+
+
+def bundle_export_files(export_files, directory, archive_name, compression=None):
+    """
+    Return the single ``(filename, path)`` to deliver for a run.
+
+    Several files, or ``compression="zip"``, are packed into one deflated
+    archive read from disk; the packed files are removed afterwards.
+    """
+    if len(export_files) == 1 and compression != "zip":
+        return export_files[0]
+
+    path = os.path.join(directory, archive_name)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for filename, file_path in export_files:
+            zip_file.write(file_path, arcname=filename)
+    for _filename, file_path in export_files:
+        os.remove(file_path)
+    return archive_name, path
+
+
+def content_type_for(filename):
+    """Return the attachment content type of an export file name."""
+    return CONTENT_TYPES.get(filename.rsplit(".", 1)[-1], "application/octet-stream")
+
+
+def link_max_age():
+    """How long download links and the files behind them stay valid."""
+    return getattr(settings, "HORILLA_EXPORT_LINK_MAX_AGE", timedelta(days=7))
+
+
+def signed_download_url(path, user):
+    """
+    Return an absolute, signed download URL for an export file.
+
+    The host comes from ``HORILLA_EXPORT_BASE_URL`` or, failing that, the
+    first ``CSRF_TRUSTED_ORIGINS`` entry, since workers have no request.
+    """
+    token = signing.dumps(
+        {"path": os.path.relpath(path, export_root()), "user": user.pk},
+        salt=SIGNING_SALT,
+    )
+    base_url = getattr(settings, "HORILLA_EXPORT_BASE_URL", None) or next(
+        iter(getattr(settings, "CSRF_TRUSTED_ORIGINS", [])), ""
+    )
+    location = reverse(
+        "horilla_core:scheduled_export_download", kwargs={"token": token}
+    )
+    return f"{base_url.rstrip('/')}{location}"
+
+
+def resolve_download_token(token, user):
+    """
+    Return the local path of a signed export link, or None.
+
+    The token must be unexpired, issued to ``user`` and point inside the
+    scheduled export directory.
+    """
+    try:
+        payload = signing.loads(token, salt=SIGNING_SALT, max_age=link_max_age())
+    except signing.BadSignature:
+        return None
+    if payload.get("user") != user.pk:
+        return None
+    root = export_root()
+    path = os.path.realpath(os.path.join(root, payload.get("path", "")))
+    if not path.startswith(root + os.sep) or not os.path.isfile(path):
+        return None
+    return path
+
+
+def remove_expired_exports():
+    """Delete export run directories older than the link lifetime."""
+    root = export_root()
+    if not os.path.isdir(root):
+        return 0
+    cutoff = time.time() - link_max_age().total_seconds()
+    removed = 0
+    for entry in os.scandir(root):
+        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
@@ -0,0 +1,144 @@
+"""
+Compiled field-permission matrices.
+
+A matrix maps ``field_name -> permission_type`` for one owner (a user or a
+role) on one model. Matrices are kept per process and in the shared cache
+under a version counter. The counter is bumped once field permission, role
+or user changes commit (see ``horilla_core.signals``), so the
+field-permission helpers in ``horilla_core.utils`` can be called freely per
+column, form field or detail section without issuing the same queries again.
+Process-local matrices are reloaded after ``HORILLA_PROCESS_CACHE_TIMEOUT``
+seconds (see ``horilla.utils.process_cache``), which bounds how long a
+revoked permission can survive in a worker that missed the bump.
+"""
+
+# Standard library imports
+import time
+
+# Third-party imports (Django)
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+# First-party / Horilla imports
+from horilla.utils.process_cache import local_timeout, shared_timeout
+from horilla_core.models import FieldPermission
+
+FIELD_PERMISSION_VERSION_KEY = "field_permissions:version"
+MATRIX_KEY = "field_permissions:{}:{}:{}:{}"
+
+_matrices = {"version": None, "loaded_at": 0.0, "entries": {}}
+
+
+def matrix_cache_timeout():
+    """Seconds a compiled matrix is kept in the shared cache."""
+    return getattr(settings, "HORILLA_FIELD_PERMISSION_CACHE_TIMEOUT", 3600)
+
+
+def field_permission_version():
+    """Return the current matrix version counter."""
+    version = cache.get(FIELD_PERMISSION_VERSION_KEY)
+    if version is None:
+        # Seeded from the clock so a lost counter never reuses old versions.
+        cache.add(FIELD_PERMISSION_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(FIELD_PERMISSION_VERSION_KEY)
+    return version
+
+
+def _bump():
+    try:
+        cache.incr(FIELD_PERMISSION_VERSION_KEY)
+    except ValueError:
+        cache.set(FIELD_PERMISSION_VERSION_KEY, time.time_ns(), None)
+    _matrices.update(version=None, entries={})
+
+
+def bump_field_permission_version():
+    """
+    Retire every compiled matrix once the current transaction commits, so
+    no matrix compiled from the pre-commit rows is cached under the new
+    version.
+    """
+    transaction.on_commit(_bump, robust=True)
+
+
+def _local_entries(version):
+    now = time.monotonic()
+    if (
+        _matrices["version"] != version
+        or now - _matrices["loaded_at"] > local_timeout()
+    ):
+        _matrices.update(version=version, loaded_at=now, entries={})
+    return _matrices["entries"]
+
+
+def _load_matrices(content_type_id, owners):
+    """Compile the matrices of ``owners`` (``(kind, id)`` pairs) in one query."""
+    condition = Q()
+    for kind, owner_id in owners:
+        condition |= Q(**{f"{kind}_id": owner_id})
+
+    matrices = {owner: {} for owner in owners}
+    rows = FieldPermission.objects.filter(condition, content_type_id=content_type_id)
+    for user_id, role_id, field_name, permission_type in rows.values_list(
+        "user_id", "role_id", "field_name", "permission_type"
+    ):
+        for owner in (("user", user_id), ("role", role_id)):
+            if owner in matrices:
+                matrices[owner][field_name] = permission_type
+    return matrices
+
+
+def get_matrices(content_type_id, owners):
+    """
+    Return ``{(kind, id): {field_name: permission_type}}`` for ``owners``.
+
+    Matrices come from the process, then the shared cache, and only the
+    missing ones are compiled from the database.
+    """
+    version = field_permission_version()
+    entries = _local_entries(version)
+    keys = {
+        owner: MATRIX_KEY.format(version, owner[0], owner[1], content_type_id)
+        for owner in owners
+    }
+
+    missing = [owner for owner in owners if keys[owner] not in entries]
+    if missing:
+        shared = cache.get_many([keys[owner] for owner in missing])
+        for owner in missing:
+            if keys[owner] in shared:
+                entries[keys[owner]] = shared[keys[owner]]
+        missing = [owner for owner in missing if keys[owner] not in entries]
+    if missing:
+        compiled = _load_matrices(content_type_id, missing)
+        cache.set_many(
+            {keys[owner]: matrix for owner, matrix in compiled.items()},
+            shared_timeout(matrix_cache_timeout()),
+        )
+        for owner, matrix in compiled.items():
+            entries[keys[owner]] = matrix
+
+    return {owner: entries[keys[owner]] for owner in owners}
+
+
+def get_user_matrix(user, model):
+    """
+    Return the effective ``{field_name: permission_type}`` of ``user`` on
+    ``model``: user permissions first, then the user's role, then the
+    model's ``default_field_permissions``.
+    """
+    content_type_id = ContentType.objects.get_for_model(model).pk
+    owners = [("user", user.pk)]
+    role_id = getattr(user, "role_id", None)
+    if role_id:
+        owners.append(("role", role_id))
+    matrices = get_matrices(content_type_id, owners)
+
+    permissions = dict(getattr(model, "default_field_permissions", {}))
+    if role_id:
+        permissions.update(matrices[("role", role_id)])
+    permissions.update(matrices[("user", user.pk)])
+    return permissions
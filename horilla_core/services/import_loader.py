@@ -0,0 +1,220 @@
+"""
+Database-native insert path for create-only imports.
+
+``bulk_create`` renders every batch as one parameterised statement through
+the ORM compiler. For large create-only imports :class:`BulkLoader` writes
+the same prepared column values more directly:
+
+The rows are staged in a temporary table (PostgreSQL: ``COPY FROM STDIN``,
+SQLite: one ``executemany``). Staged rows that reference deleted records,
+conflict with an existing record on a unique field set or repeat an earlier
+row of the batch are removed with ``DELETE ... RETURNING`` and reported
+with a reason; the rest is written with one set-based ``INSERT ... SELECT``
+that still skips rows conflicting with concurrent inserts
+(``ON CONFLICT DO NOTHING`` / ``INSERT OR IGNORE``).
+
+Values are prepared exactly like ``bulk_create`` does (``pre_save`` and
+``get_db_prep_save`` per field), so defaults, company and ``created_*``
+stamping set on the instances are kept. Like ``bulk_create`` no model
+signals are sent; callers log one summarized audit entry instead.
+"""
+
+# Standard library imports
+import io
+import json
+import logging
+import uuid
+
+# Third-party imports (Django)
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import ForeignKey, JSONField
+
+logger = logging.getLogger(__name__)
+
+POSITION_COLUMN = "import_position"
+
+
+class BulkLoader:
+    """Inserts unsaved instances of one model with a native bulk path."""
+
+    vendors = ("postgresql", "sqlite")
+
+    def __init__(self, model, using=DEFAULT_DB_ALIAS):
+        self.model = model._meta.concrete_model
+        self.connection = connections[using]
+        meta = self.model._meta
+        self.fields = [f for f in meta.concrete_fields if f is not meta.auto_field]
+        quote = self.connection.ops.quote_name
+        self.table = quote(meta.db_table)
+        self.columns = ", ".join(quote(f.column) for f in self.fields)
+
+    @classmethod
+    def supports(cls, model, using=DEFAULT_DB_ALIAS):
+        """Return True when ``model`` can be loaded on the ``using`` database."""
+        meta = model._meta.concrete_model._meta
+        return connections[using].vendor in cls.vendors and not meta.parents
+
+    def prepare_row(self, obj):
+        """Return the database values of ``obj`` in column order."""
+        row = []
+        for field in self.fields:
+            value = field.pre_save(obj, add=True)
+            if isinstance(field, JSONField):
+                row.append(
+                    None if value is None else json.dumps(value, cls=field.encoder)
+                )
+            else:
+                row.append(field.get_db_prep_save(value, connection=self.connection))
+        return row
+
+    def unique_sets(self):
+        """Field sets that must be unique, as lists of loaded fields."""
+        meta = self.model._meta
+        by_name = {f.name: f for f in self.fields}
+        sets = [[f] for f in self.fields if f.unique]
+        names = [list(together) for together in meta.unique_together]
+        names += [list(c.fields) for c in meta.total_unique_constraints if c.fields]
+        for group in names:
+            if all(name in by_name for name in group):
+                sets.append([by_name[name] for name in group])
+        return sets
+
+    def load(self, instances):
+        """
+        Insert ``instances``.
+
+        Returns:
+            tuple: ``(inserted, skipped)`` where ``skipped`` maps the
+            position of each instance that was not written to the reason
+        """
+        if not instances:
+            return 0, {}
+        rows = [
+            self.prepare_row(obj) + [position] for position, obj in enumerate(instances)
+        ]
+        quote = self.connection.ops.quote_name
+        staging = quote(f"import_staging_{uuid.uuid4().hex[:12]}")
+
+        # The staging table lives until the end of the surrounding transaction.
+        with transaction.atomic(using=self.connection.alias):
+            with self.connection.cursor() as cursor:
+                try:
+                    self._stage(cursor, staging, rows)
+                    skipped = self._reject(cursor, staging)
+                    cursor.execute(self._insert_sql(staging))
+                    inserted = cursor.rowcount
+                    if self.connection.vendor == "postgresql":
+                        cursor.execute(f"DROP TABLE {staging}")
+                finally:
+                    # SQLite keeps temporary tables until the connection closes.
+                    if self.connection.vendor != "postgresql":
+                        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        return inserted, skipped
+
+    def _stage(self, cursor, staging, rows):
+        position = self.connection.ops.quote_name(POSITION_COLUMN)
+        if self.connection.vendor == "postgresql":
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT {self.columns} FROM {self.table} WITH NO DATA"
+            )
+        else:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {staging} AS "
+                f"SELECT {self.columns} FROM {self.table} WHERE 0"
+            )
+        cursor.execute(f"ALTER TABLE {staging} ADD COLUMN {position} integer")
+        columns = f"{self.columns}, {position}"
+
+        if self.connection.vendor != "postgresql":
+            placeholders = ", ".join(["%s"] * (len(self.fields) + 1))
+            cursor.executemany(
+                f"INSERT INTO {staging} ({columns}) VALUES ({placeholders})", rows
+            )
+            return
+
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(",".join(self._csv_value(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+        copy_sql = f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)"
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):
+            raw.copy_expert(copy_sql, buffer)
+        else:
+            with raw.copy(copy_sql) as copy:
+                copy.write(buffer.getvalue())
+
+    def _delete_staged(self, cursor, staging, where, reason, skipped):
+        position = self.connection.ops.quote_name(POSITION_COLUMN)
+        cursor.execute(f"DELETE FROM {staging} WHERE {where} RETURNING {position}")
+        for (row_position,) in cursor.fetchall():
+            skipped[row_position] = reason
+
+    def _reject(self, cursor, staging):
+        """Remove the staged rows that cannot be inserted; return their reasons."""
+        quote = self.connection.ops.quote_name
+        position = quote(POSITION_COLUMN)
+        skipped = {}
+
+        for field in self.fields:
+            if isinstance(field, ForeignKey):
+                target = field.target_field
+                column = f"{staging}.{quote(field.column)}"
+                self._delete_staged(
+                    cursor,
+                    staging,
+                    f"{column} IS NOT NULL AND NOT EXISTS ("
+                    f"SELECT 1 FROM {quote(target.model._meta.db_table)} r "
+                    f"WHERE r.{quote(target.column)} = {column})",
+                    f"{field.verbose_name} refers to a record that no longer exists",
+                    skipped,
+                )
+
+        for fields in self.unique_sets():
+            labels = ", ".join(str(f.verbose_name) for f in fields)
+            matches = " AND ".join(
+                f"t.{quote(f.column)} = {staging}.{quote(f.column)}" for f in fields
+            )
+            self._delete_staged(
+                cursor,
+                staging,
+                f"EXISTS (SELECT 1 FROM {self.table} t WHERE {matches})",
+                f"A record with the same {labels} already exists",
+                skipped,
+            )
+            columns = ", ".join(quote(f.column) for f in fields)
+            not_null = " AND ".join(f"{quote(f.column)} IS NOT NULL" for f in fields)
+            self._delete_staged(
+                cursor,
+                staging,
+                f"{position} IN (SELECT {position} FROM ("
+                f"SELECT {position}, ROW_NUMBER() OVER "
+                f"(PARTITION BY {columns} ORDER BY {position}) AS row_number "
+                f"FROM {staging} WHERE {not_null}) d WHERE d.row_number > 1)",
+                f"Repeats the {labels} of an earlier row in the file",
+                skipped,
+            )
+        return skipped
+
+    def _insert_sql(self, staging):
+        selected = ", ".join(
+            f"{staging}.{self.connection.ops.quote_name(f.column)}" for f in self.fields
+        )
+        if self.connection.vendor == "postgresql":
+            return (
+                f"INSERT INTO {self.table} ({self.columns}) "
+                f"SELECT {selected} FROM {staging} ON CONFLICT DO NOTHING"
+            )
+        return (
+            f"INSERT OR IGNORE INTO {self.table} ({self.columns}) "
+            f"SELECT {selected} FROM {staging}"
+        )
+
+    @staticmethod
+    def _csv_value(value):
+        # Unquoted empty is NULL in COPY's CSV format, quoted empty is ''.
+        if value is None:
+            return ""
+        return '"' + str(value).replace('"', '""') + '"'
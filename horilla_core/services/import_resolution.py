@@ -0,0 +1,194 @@
+# Standard library imports
+import difflib
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+# Third-party imports (Django)
+from django.db import models
+
+TEXT_FIELD_TYPES = ("CharField", "TextField", "EmailField", "URLField", "SlugField")
+
+
+def normalize_label(text):
+    """Fold case, separators and whitespace of a label for fuzzy matching."""
+    text = str(text).lower().replace("_", " ").replace("-", " ")
+    return " ".join(text.split())
+
+
+def normalize_key(value):
+    """
+    Fold a match-field value into its index form.
+
+    Strings are upper-cased with surrounding and repeated whitespace
+    collapsed, model instances are reduced to their primary key and other
+    values are used as they are.
+    """
+    if isinstance(value, str):
+        return " ".join(value.split()).upper()
+    if isinstance(value, models.Model):
+        return value.pk
+    return value
+
+
+def resolve_in_bulk(related_model, mapping):
+    """
+    Resolve ``{file_key: pk}`` to ``{file_key: instance}`` with one query.
+
+    Keys whose primary key no longer exists (or is outside the active
+    company) are left out, like ``filter(pk=...).first()`` returning None.
+    """
+    pks = {str(pk) for pk in mapping.values() if pk not in (None, "")}
+    if not pks:
+        return {}
+    objects = {str(pk): obj for pk, obj in related_model.objects.in_bulk(pks).items()}
+    return {key: objects[str(pk)] for key, pk in mapping.items() if str(pk) in objects}
+
+
+class MatchKeyMap:
+    """
+    Primary keys of the existing records of one import by match key.
+
+    Folding text columns in SQL cannot use an index, so matching each chunk
+    that way scanned the table once per chunk. The map reads the match
+    columns of ``queryset`` once, folds them with :func:`normalize_key`, and
+    before each chunk picks up the records created since with a keyset scan
+    on the primary key. Chunks then load their candidates by primary key.
+    """
+
+    def __init__(self, model, match_fields, queryset):
+        self.queryset = queryset
+        self.attnames = [model._meta.get_field(name).attname for name in match_fields]
+        self.pks = {}
+        self.last_pk = None
+
+    def refresh(self):
+        """Add the records created since the last refresh."""
+        rows = self.queryset.order_by("pk")
+        if self.last_pk is not None:
+            rows = rows.filter(pk__gt=self.last_pk)
+        for pk, *values in rows.values_list("pk", *self.attnames).iterator(
+            chunk_size=2000
+        ):
+            self.pks.setdefault(tuple(map(normalize_key, values)), pk)
+            self.last_pk = pk
+
+    def move(self, key, pk):
+        """Register ``pk`` under ``key`` after its match fields were updated."""
+        self.pks.setdefault(key, pk)
+
+    def pks_for(self, keys):
+        """Return the primary keys stored under ``keys``."""
+        return {self.pks[key] for key in keys if key in self.pks}
+
+
+class MatchKeyIndex:
+    """
+    Hash index of model instances by their normalized match-field values.
+
+    Used by the importer to decide between create and update: file values
+    and database values are folded with :func:`normalize_key`, so
+    ``"ACME  Corp "`` matches an existing ``"Acme Corp"``.
+    """
+
+    def __init__(self, model, match_fields):
+        self.model = model
+        self.fields = [model._meta.get_field(name) for name in match_fields]
+        self.index = {}
+
+    def key_for_row(self, mapped):
+        """Return the index key of a mapped file row."""
+        return tuple(normalize_key(mapped.get(field.name)) for field in self.fields)
+
+    def key_for_instance(self, obj):
+        """Return the index key of a model instance without touching relations."""
+        return tuple(
+            normalize_key(getattr(obj, field.attname)) for field in self.fields
+        )
+
+    def get(self, key):
+        """Return the instance stored under ``key`` or None."""
+        return self.index.get(key)
+
+    def add(self, key, obj):
+        """Register ``obj`` (saved or about to be created) under ``key``."""
+        self.index.setdefault(key, obj)
+
+    def load(self, key_map, mapped_rows):
+        """
+        Fetch and index the existing records that can match ``mapped_rows``,
+        looked up in the :class:`MatchKeyMap` of the import.
+        """
+        key_map.refresh()
+        pks = key_map.pks_for(map(self.key_for_row, mapped_rows))
+        if not pks:
+            return
+        for obj in key_map.queryset.filter(pk__in=pks).order_by("pk"):
+            self.add(self.key_for_instance(obj), obj)
+
+
+class CandidateIndex:
+    """
+    Precomputed candidates for mapping file values onto choices or records.
+
+    Exact matches (after :func:`normalize_label`) are served from a dict.
+    Fuzzy matches keep the ``difflib`` ratio and threshold of the original
+    wizard, but each candidate's matcher is built once, candidates whose
+    length cannot reach the threshold are never visited, and the cheap
+    ``difflib`` upper bounds skip candidates that cannot beat the best ratio
+    found so far.
+    """
+
+    def __init__(self, candidates, threshold=0.7):
+        self.threshold = threshold
+        self.exact = {}
+        self.buckets = defaultdict(list)
+        for position, (text, value) in enumerate(candidates):
+            norm = normalize_label(text)
+            self.exact.setdefault(norm, value)
+            self.buckets[len(norm)].append(
+                (position, value, difflib.SequenceMatcher(None, "", norm))
+            )
+        self.lengths = sorted(self.buckets)
+        self.cache = {}
+
+    def match(self, file_value):
+        """Return the value of the best candidate for ``file_value`` or None."""
+        norm = normalize_label(file_value)
+        if norm in self.exact:
+            return self.exact[norm]
+        if norm not in self.cache:
+            self.cache[norm] = self._fuzzy_match(norm)
+        return self.cache[norm]
+
+    def _length_range(self, size, ratio):
+        """Candidate lengths that can score above ``ratio`` against ``size``."""
+        if ratio <= 0:
+            return 0, len(self.lengths)
+        low = size * ratio / (2 - ratio)
+        high = size * (2 - ratio) / ratio
+        return bisect_right(self.lengths, low), bisect_left(self.lengths, high)
+
+    def _fuzzy_match(self, norm):
+        best_ratio, best_position, best_value = self.threshold, None, None
+
+        def beats(ratio, position):
+            if ratio > best_ratio:
+                return True
+            return (
+                ratio == best_ratio
+                and best_position is not None
+                and position < best_position
+            )
+
+        start, stop = self._length_range(len(norm), self.threshold)
+        for length in self.lengths[start:stop]:
+            for position, value, matcher in self.buckets[length]:
+                matcher.set_seq1(norm)
+                if not beats(matcher.real_quick_ratio(), position):
+                    continue
+                if not beats(matcher.quick_ratio(), position):
+                    continue
+                ratio = matcher.ratio()
+                if beats(ratio, position):
+                    best_ratio, best_position, best_value = ratio, position, value
+        return best_value
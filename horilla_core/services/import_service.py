@@ -0,0 +1,823 @@
+# Standard library imports
+import csv
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+
+# Third-party imports (Django)
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.urls import reverse_lazy
+from django.utils import timezone
+from django.utils.text import slugify
+from django.utils.translation import gettext as _
+
+# Third-party imports (Others)
+from openpyxl import load_workbook
+
+# First-party / Horilla imports
+from horilla_core.services.import_loader import BulkLoader
+from horilla_core.services.import_resolution import (
+    MatchKeyIndex,
+    MatchKeyMap,
+    resolve_in_bulk,
+)
+from horilla_core.services.import_validation import (
+    CompiledMapping,
+    RowValidator,
+    get_field_metadata,
+)
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_UPDATE_FIELDS = ("updated_at", "updated_by", "company")
+
+
+def _cell_to_str(value):
+    """Normalize a spreadsheet cell into the string form CSV rows have."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        if value.time() == datetime.min.time():
+            return value.date().isoformat()
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_file_rows(file_path):
+    """
+    Yield the rows of an uploaded import file as ``{header: value}`` dicts.
+
+    CSV files are read with a streaming reader and XLSX files with openpyxl in
+    read-only mode, so memory use does not grow with the file size.
+    """
+    full_path = default_storage.path(file_path)
+    if file_path.endswith(".csv"):
+        with open(full_path, "r", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                yield dict(row)
+        return
+
+    if file_path.endswith(".xls"):
+        # openpyxl cannot read the legacy binary format
+        import pandas as pd
+
+        for row in pd.read_excel(full_path).to_dict("records"):
+            yield {k: "" if pd.isna(v) else _cell_to_str(v) for k, v in row.items()}
+        return
+
+    workbook = load_workbook(full_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = [_cell_to_str(h) for h in next(rows, ())]
+        for values in rows:
+            if not any(v is not None for v in values):
+                continue
+            yield {h: _cell_to_str(v) for h, v in zip(headers, values) if h}
+    finally:
+        workbook.close()
+
+
+def count_file_rows(file_path):
+    """
+    Estimate the number of data rows in an import file.
+
+    Only used to draw the progress bar, so it favours speed over precision:
+    CSV files are counted by newlines and XLSX files by their declared
+    dimension. Returns 0 when the count cannot be estimated cheaply.
+    """
+    try:
+        full_path = default_storage.path(file_path)
+        if file_path.endswith(".csv"):
+            lines = 0
+            with open(full_path, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    lines += block.count(b"\n")
+            return max(lines - 1, 0)
+        if file_path.endswith(".xlsx"):
+            workbook = load_workbook(full_path, read_only=True)
+            try:
+                return max((workbook.active.max_row or 1) - 1, 0)
+            finally:
+                workbook.close()
+    except (OSError, ValueError) as e:
+        logger.warning("Could not estimate rows of %s: %s", file_path, e)
+    return 0
+
+
+def chunked(iterable, size):
+    """Yield lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_result(
+    created_count,
+    updated_count,
+    error_count,
+    total_rows,
+    errors,
+    error_file_path,
+    sample_size=5,
+):
+    """Return the summary dict rendered by the import success page."""
+    successful_rows = created_count + updated_count
+    success_rate = (successful_rows / total_rows * 100) if total_rows > 0 else 0
+    return {
+        "created_count": created_count,
+        "updated_count": updated_count,
+        "error_count": error_count,
+        "errors": errors[:sample_size],
+        "total_rows": total_rows,
+        "successful_rows": successful_rows,
+        "success_rate": round(success_rate, 1),
+        "error_file_path": error_file_path,
+        "has_more_errors": error_count > sample_size,
+    }
+
+
+class ImportCancelled(Exception):
+    """Raised between chunks when the user cancelled a running import."""
+
+
+class ImportRowMapper:
+    """
+    Converts raw file rows into model field values using the wizard mappings.
+
+    The mappings are compiled once into a :class:`CompiledMapping`; FK
+    references are resolved to primary keys for validation and swapped for
+    the preloaded instances by :meth:`attach_relations`.
+    """
+
+    def __init__(self, model, import_data):
+        self.model = model
+        self.replace_values = import_data.get("replace_values", {})
+        self.fk_mappings = import_data.get("fk_mappings", {})
+        self.field_metadata = get_field_metadata(model)
+        self.fk_cache = self._load_fk_cache()
+        self.fk_instances = {
+            field: {obj.pk: obj for obj in objs.values()}
+            for field, objs in self.fk_cache.items()
+        }
+        self.compiled = CompiledMapping.compile(
+            model,
+            import_data,
+            {
+                field: {key: obj.pk for key, obj in objs.items()}
+                for field, objs in self.fk_cache.items()
+            },
+        )
+
+    def _load_fk_cache(self):
+        """
+        Preload FK objects referenced by value mappings and replace values.
+
+        Each FK field is resolved with a single ``in_bulk`` query covering both
+        its value mappings and its replace value.
+        """
+        fk_cache = {}
+        fk_fields = set(self.fk_mappings) | {
+            field
+            for field in self.replace_values
+            if field in self.field_metadata and self.field_metadata[field]["is_fk"]
+        }
+        for field in fk_fields:
+            mapping = dict(self.fk_mappings.get(field, {}))
+            if field in self.replace_values:
+                mapping["__replace__"] = self.replace_values[field]
+            related_model = self.field_metadata[field]["related_model"]
+            fk_cache[field] = resolve_in_bulk(related_model, mapping)
+        return fk_cache
+
+    def attach_relations(self, mapped):
+        """Replace the FK primary keys of a validated row with instances."""
+        for field, instances in self.fk_instances.items():
+            if field in mapped:
+                mapped[field] = instances.get(mapped[field])
+        return mapped
+
+    def map_row(self, row_data):
+        """
+        Map one file row to model field values.
+
+        Returns ``(mapped, errors)``; ``errors`` is a list of messages.
+        """
+        mapped, errors = self.compiled.validate(row_data)
+        return self.attach_relations(mapped), errors
+
+
+class ImportErrorWriter:
+    """
+    Appends failed rows (original columns plus ``Import_Error``) to a CSV file.
+
+    The file is created on the first error and appended to on resume, so a
+    resumed import keeps the errors of the chunks committed before it failed.
+    """
+
+    def __init__(self, headers, file_path):
+        self.headers = list(headers)
+        self.file_path = file_path
+
+    @staticmethod
+    def build_path(import_data, import_history=None, dry_run=False):
+        """Return the storage path of the error file for an import."""
+        original_filename = import_data.get("original_filename", "file")
+        base_filename = slugify(original_filename.rsplit(".", 1)[0]) or "file"
+        suffix = (
+            import_history.pk
+            if import_history
+            else timezone.now().strftime("%Y%m%d_%H%M%S_%f")
+        )
+        kind = "preview" if dry_run else "errors"
+        return f"import_errors/{base_filename}_{kind}_{suffix}.csv"
+
+    def write(self, failed_rows):
+        """Append ``(row_data, message)`` pairs to the error file."""
+        if not failed_rows:
+            return
+        full_path = default_storage.path(self.file_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        new_file = not os.path.exists(full_path)
+        with open(full_path, "a", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            if new_file:
+                writer.writerow(self.headers + ["Import_Error"])
+            for row_data, message in failed_rows:
+                writer.writerow(
+                    [row_data.get(header, "") for header in self.headers] + [message]
+                )
+
+
+class ImportService:
+    """
+    Streaming, chunked import of a file mapped through the import wizard.
+
+    Rows are read lazily, mapped and validated, then written with
+    ``bulk_create``/``bulk_update`` in fixed-size chunks, each inside its own
+    transaction. When an ``ImportHistory`` record is given, its counters and
+    ``last_committed_row`` checkpoint are saved in the same transaction as the
+    chunk, so a failed import can be resumed from the last committed chunk.
+
+    With ``dry_run=True`` every row is validated and matched the same way but
+    nothing is written, so the result previews the created/updated/error
+    counts with a larger sample of errors. ``max_rows`` stops after that many
+    rows and flags the result as ``truncated`` when the file has more.
+
+    Create-only imports can use :class:`BulkLoader` instead of
+    ``bulk_create`` (``fast_load=True`` or ``HORILLA_IMPORT_FAST_LOAD``);
+    rows it skips are written to the error file with the reason and one
+    summarized audit entry is logged on the import history.
+    """
+
+    def __init__(
+        self,
+        import_data,
+        user=None,
+        company=None,
+        import_history=None,
+        chunk_size=None,
+        dry_run=False,
+        fast_load=None,
+        max_rows=None,
+    ):
+        self.import_data = import_data
+        self.dry_run = dry_run
+        self.max_rows = max_rows
+        self.truncated = False
+        self.user = user
+        self.company = company
+        self.import_history = import_history
+        self.chunk_size = chunk_size or getattr(
+            settings, "HORILLA_IMPORT_CHUNK_SIZE", 2000
+        )
+        self.model = apps.get_model(import_data["app_label"], import_data["module"])
+        self.import_option = import_data["import_option"]
+        self.match_fields = import_data.get("match_fields", [])
+        self.field_mappings = import_data.get("field_mappings", {})
+
+        is_postgres = connection.vendor == "postgresql"
+        is_sqlite = connection.vendor == "sqlite"
+        self.create_batch_size = 1000 if is_postgres else (500 if is_sqlite else 999)
+        self.update_batch_size = 500 if is_postgres else (100 if is_sqlite else 200)
+
+        base_update_fields = {
+            field.name
+            for field in self.model._meta.fields
+            if not field.primary_key
+            and (
+                field.name in self.field_mappings or field.name in SYSTEM_UPDATE_FIELDS
+            )
+        }
+        self.update_fields = list(base_update_fields - {"created_at", "created_by"})
+        self.has_company = any(f.name == "company" for f in self.model._meta.fields)
+
+        self.error_writer = ImportErrorWriter(
+            import_data.get("headers", []),
+            ImportErrorWriter.build_path(import_data, import_history, dry_run),
+        )
+        self.stats = {
+            "total_rows": 0,
+            "created_count": 0,
+            "updated_count": 0,
+            "error_count": 0,
+        }
+        self.errors = []
+        self.sample_size = 20 if dry_run else 5
+        self.start_row = 0
+        self.started = None
+        # Dry runs never write, so rows "created" by an earlier chunk are kept
+        # here to be matched as updates by later chunks, like a real import.
+        self.planned = {}
+        # Match keys of the existing records, read once per import.
+        self.match_keys = None
+
+        if fast_load is None:
+            fast_load = getattr(settings, "HORILLA_IMPORT_FAST_LOAD", False)
+        self.loader = (
+            BulkLoader(self.model)
+            if fast_load
+            and not dry_run
+            and self.import_option == "1"
+            and BulkLoader.supports(self.model)
+            else None
+        )
+        self.bulk_loaded = 0
+
+    @classmethod
+    def resume(cls, import_history, chunk_size=None):
+        """Build a service that continues ``import_history`` after its checkpoint."""
+        service = cls(
+            import_history.import_config,
+            user=import_history.created_by,
+            company=import_history.company,
+            import_history=import_history,
+            chunk_size=chunk_size,
+        )
+        service.start_row = import_history.last_committed_row
+        service.stats.update(
+            total_rows=import_history.last_committed_row,
+            created_count=import_history.created_count,
+            updated_count=import_history.updated_count,
+            error_count=import_history.error_count,
+        )
+        service.errors = list(import_history.error_summary or [])
+        return service
+
+    def run(self):
+        """
+        Run the import and return the result summary.
+
+        Raises :class:`ImportCancelled` after the first chunk committed once
+        cancellation was requested on the import history.
+        """
+        self.started = time.perf_counter()
+        mapper = ImportRowMapper(self.model, self.import_data)
+        rows = enumerate(iter_file_rows(self.import_data["file_path"]), 1)
+        if self.start_row:
+            rows = islice(rows, self.start_row, None)
+        if self.max_rows:
+            rows = self.limit_rows(rows)
+
+        with RowValidator(mapper.compiled) as validator:
+            for chunk in chunked(rows, self.chunk_size):
+                validated = validator.validate(chunk)
+                failed_rows = []
+                if self.dry_run:
+                    self.process_chunk(validated, mapper, failed_rows)
+                    self.stats["total_rows"] = chunk[-1][0]
+                else:
+                    with transaction.atomic():
+                        self.process_chunk(validated, mapper, failed_rows)
+                        self.stats["total_rows"] = chunk[-1][0]
+                        self.save_checkpoint()
+                self.error_writer.write(failed_rows)
+                if self.cancel_requested():
+                    raise ImportCancelled()
+
+        self.log_bulk_load()
+        return self.get_result()
+
+    def limit_rows(self, rows):
+        """Yield the first ``max_rows`` rows and flag whether more were left."""
+        for count, row in enumerate(rows, 1):
+            if count > self.max_rows:
+                self.truncated = True
+                return
+            yield row
+
+    def cancel_requested(self):
+        """Return True when the user asked to stop this import."""
+        history = self.import_history
+        if not history:
+            return False
+        return bool(
+            type(history)
+            ._base_manager.filter(pk=history.pk)
+            .values_list("cancel_requested", flat=True)
+            .first()
+        )
+
+    @property
+    def rows_per_second(self):
+        """Throughput of the current run, excluding rows skipped on resume."""
+        if self.started is None:
+            return None
+        elapsed = time.perf_counter() - self.started
+        rows = self.stats["total_rows"] - self.start_row
+        return Decimal(str(round(rows / elapsed, 2))) if elapsed > 0 else None
+
+    def record_error(self, row_index, row_data, message, failed_rows):
+        """Count a failed row and queue it for the error file."""
+        self.stats["error_count"] += 1
+        if len(self.errors) < self.sample_size:
+            self.errors.append(f"Row {row_index}: {message}")
+        failed_rows.append((row_data, message))
+
+    def match_criteria(self, mapped):
+        """Human readable description of the match key of ``mapped``."""
+        values = []
+        for field in self.match_fields:
+            value = mapped.get(field, "N/A")
+            values.append(f"{field}='{'N/A' if value is None else value}'")
+        return ", ".join(values)
+
+    def find_existing(self, mapped_rows):
+        """Return a :class:`MatchKeyIndex` of the records matching one chunk."""
+        index = MatchKeyIndex(self.model, self.match_fields)
+        if not self.match_fields or self.import_option not in ("1", "2", "3"):
+            return index
+        if self.match_keys is None:
+            queryset = self.model.objects.all()
+            if self.company and self.has_company:
+                queryset = queryset.filter(company=self.company)
+            self.match_keys = MatchKeyMap(self.model, self.match_fields, queryset)
+        index.load(self.match_keys, [mapped for _, _, mapped in mapped_rows])
+        for key, obj in self.planned.items():
+            index.add(key, obj)
+        return index
+
+    def new_instance(self, mapped, current_time):
+        """Build an unsaved instance stamped like ``HorillaCoreModel.save``."""
+        obj = self.model(**mapped)
+        obj.created_at = mapped.get("created_at", current_time)
+        obj.updated_at = current_time
+        if self.user:
+            obj.created_by = mapped.get("created_by", self.user)
+            obj.updated_by = self.user
+        obj.company = self.company
+        return obj
+
+    def update_instance(self, instance, mapped, current_time):
+        """Apply ``mapped`` to ``instance`` and return the changed field names."""
+        changed_fields = {"updated_at", "company"}
+        if self.user:
+            changed_fields.add("updated_by")
+        for field in self.update_fields:
+            if field in SYSTEM_UPDATE_FIELDS:
+                continue
+            new_value = mapped.get(field)
+            if getattr(instance, field) == new_value:
+                continue
+            setattr(instance, field, new_value)
+            changed_fields.add(field)
+        instance.updated_at = current_time
+        if self.user:
+            instance.updated_by = self.user
+        instance.company = self.company
+        return changed_fields
+
+    def process_chunk(self, validated, mapper, failed_rows):
+        """
+        Match and write one validated chunk.
+
+        ``validated`` holds ``(row_index, row_data, mapped, errors)`` tuples
+        as returned by :class:`RowValidator`.
+        """
+        current_time = timezone.now()
+        chunk_start, chunk_end = validated[0][0], validated[-1][0]
+        mapped_rows = []
+        for row_index, row_data, mapped, row_errors in validated:
+            if row_errors:
+                self.record_error(
+                    row_index, row_data, "; ".join(row_errors), failed_rows
+                )
+                continue
+            mapped_rows.append((row_index, row_data, mapper.attach_relations(mapped)))
+
+        existing_objs = self.find_existing(mapped_rows)
+        created = []
+        created_rows = []
+        updated_groups = defaultdict(list)
+        for row_index, row_data, mapped in mapped_rows:
+            key = existing_objs.key_for_row(mapped)
+            instance = existing_objs.get(key)
+            if self.import_option == "1":
+                if self.match_fields and instance:
+                    self.record_error(
+                        row_index,
+                        row_data,
+                        f"Record already exists with matching criteria: {self.match_criteria(mapped)}. Skipped in create-only mode.",
+                        failed_rows,
+                    )
+                    continue
+                created.append(self.new_instance(mapped, current_time))
+                created_rows.append((row_index, row_data))
+            elif instance:
+                changed = self.update_instance(instance, mapped, current_time)
+                updated_groups[frozenset(changed)].append(instance)
+            elif self.import_option == "2":
+                self.record_error(
+                    row_index,
+                    row_data,
+                    f"No existing record found to update with matching criteria: {self.match_criteria(mapped)}",
+                    failed_rows,
+                )
+            elif self.import_option == "3":
+                obj = self.new_instance(mapped, current_time)
+                created.append(obj)
+                created_rows.append((row_index, row_data))
+                if self.match_fields:
+                    existing_objs.add(key, obj)
+                    if self.dry_run:
+                        self.planned.setdefault(key, obj)
+
+        if self.dry_run:
+            self.stats["created_count"] += len(created)
+            self.stats["updated_count"] += sum(map(len, updated_groups.values()))
+            return
+
+        if created and self.loader:
+            inserted, skipped = self.loader.load(created)
+            self.stats["created_count"] += inserted
+            self.bulk_loaded += inserted
+            for position, reason in sorted(skipped.items()):
+                row_index, row_data = created_rows[position]
+                self.record_error(row_index, row_data, reason, failed_rows)
+            # Rows lost to concurrent inserts cannot be told apart.
+            lost = len(created) - inserted - len(skipped)
+            if lost > 0:
+                self.stats["error_count"] += lost
+                if len(self.errors) < self.sample_size:
+                    self.errors.append(
+                        f"Rows {chunk_start}-{chunk_end}: {lost} rows skipped, "
+                        "they conflict with records created meanwhile"
+                    )
+        elif created:
+            self.model.objects.bulk_create(created, batch_size=self.create_batch_size)
+            self.stats["created_count"] += len(created)
+
+        # Rows matching a record created earlier in the same chunk were applied
+        # to the unsaved instance, which bulk_create has already written.
+        created_ids = {id(obj) for obj in created}
+        for fields, objs in updated_groups.items():
+            if not fields:
+                continue
+            saved = [obj for obj in objs if id(obj) not in created_ids]
+            if saved:
+                self.model.objects.bulk_update(
+                    saved, fields=list(fields), batch_size=self.update_batch_size
+                )
+                if fields.intersection(self.match_fields):
+                    for obj in saved:
+                        self.match_keys.move(
+                            existing_objs.key_for_instance(obj), obj.pk
+                        )
+            self.stats["updated_count"] += len(objs)
+
+    def log_bulk_load(self):
+        """
+        Log one audit entry summarizing the rows written by the bulk loader.
+
+        The loader bypasses model signals, so the per-record entries auditlog
+        would otherwise write are replaced by this entry on the history.
+        """
+        if not self.bulk_loaded or not self.import_history:
+            return
+        from auditlog.models import LogEntry
+
+        LogEntry.objects.log_create(
+            self.import_history,
+            action=LogEntry.Action.CREATE,
+            actor=self.user,
+            changes={
+                "bulk_loaded_rows": [None, str(self.bulk_loaded)],
+                "model": [None, self.model._meta.label],
+            },
+        )
+
+    def save_checkpoint(self):
+        """Persist counters and the committed row inside the chunk transaction."""
+        history = self.import_history
+        if not history:
+            return
+        history.last_committed_row = self.stats["total_rows"]
+        history.total_rows = self.stats["total_rows"]
+        history.created_count = self.stats["created_count"]
+        history.updated_count = self.stats["updated_count"]
+        history.error_count = self.stats["error_count"]
+        history.error_summary = self.errors
+        history.rows_per_second = self.rows_per_second
+        # ``updated_at`` doubles as the heartbeat read by recover_stale_imports.
+        history.save(
+            update_fields=[
+                "last_committed_row",
+                "total_rows",
+                "created_count",
+                "updated_count",
+                "error_count",
+                "error_summary",
+                "rows_per_second",
+                "updated_at",
+            ]
+        )
+
+    def get_result(self):
+        """Return the summary dict rendered by the import success page."""
+        error_file_path = None
+        if self.stats["error_count"] and default_storage.exists(
+            self.error_writer.file_path
+        ):
+            error_file_path = self.error_writer.file_path
+        result = build_result(
+            self.stats["created_count"],
+            self.stats["updated_count"],
+            self.stats["error_count"],
+            self.stats["total_rows"],
+            self.errors,
+            error_file_path,
+            sample_size=self.sample_size,
+        )
+        result["truncated"] = self.truncated
+        return result
+
+
+def history_result(import_history):
+    """Build the success page summary from a finished ``ImportHistory``."""
+    return build_result(
+        import_history.created_count,
+        import_history.updated_count,
+        import_history.error_count,
+        import_history.total_rows,
+        list(import_history.error_summary or []),
+        import_history.error_file_path or None,
+    )
+
+
+def notify_import_finished(import_history):
+    """Notify the user who started the import that it has finished."""
+    from horilla_notifications.models import Notification
+
+    if not import_history.created_by_id:
+        return
+    messages = {
+        "success": _(
+            "Import '%(name)s' completed: %(created)s created, %(updated)s updated."
+        ),
+        "partial": _(
+            "Import '%(name)s' completed with %(errors)s errors: %(created)s created, %(updated)s updated."
+        ),
+        "failed": _("Import '%(name)s' failed."),
+        "cancelled": _("Import '%(name)s' was cancelled after %(rows)s rows."),
+    }
+    message = messages.get(import_history.status, messages["failed"]) % {
+        "name": import_history.import_name,
+        "created": import_history.created_count,
+        "updated": import_history.updated_count,
+        "errors": import_history.error_count,
+        "rows": import_history.total_rows,
+    }
+    try:
+        Notification.objects.create(
+            user_id=import_history.created_by_id,
+            message=message,
+            url=reverse_lazy("horilla_core:import_view"),
+        )
+    except Exception as e:
+        logger.warning("Could not notify about import %s: %s", import_history.pk, e)
+
+
+def imported_records(model, company=None, since=None):
+    """
+    Return the ``model`` records an import may have written: those of
+    ``company`` updated at or after ``since`` (fields the model lacks are
+    not filtered on).
+    """
+    field_names = {f.name for f in model._meta.concrete_fields}
+    queryset = model._base_manager.all()
+    if company and "company" in field_names:
+        queryset = queryset.filter(company=company)
+    if since and "updated_at" in field_names:
+        queryset = queryset.filter(updated_at__gte=since)
+    return queryset
+
+
+def send_import_finished(service, import_history, since):
+    """
+    Send ``import_finished`` so apps can refresh data derived from the
+    imported records (their model signals were bypassed).
+    """
+    from horilla_core.signals import import_finished
+
+    responses = import_finished.send_robust(
+        sender=service.model,
+        import_history=import_history,
+        company=service.company,
+        since=since,
+    )
+    for receiver, response in responses:
+        if isinstance(response, Exception):
+            logger.error(
+                "Import %s: %s failed after import: %s",
+                import_history.pk,
+                getattr(receiver, "__name__", receiver),
+                response,
+            )
+
+
+def execute_import(import_history, chunk_size=None):
+    """
+    Run (or continue) the import recorded on ``import_history`` and finalize it.
+
+    The history moves from ``queued`` to ``processing`` and ends as
+    ``success``, ``partial``, ``failed`` or ``cancelled`` with its duration,
+    throughput and error file filled in. A run whose worker dies is
+    requeued from its checkpoint by ``recover_stale_imports``. Used both by the Celery task and by
+    the synchronous fallback of the import wizard. Returns the result summary.
+    """
+    history = import_history
+    since = history.started_at or timezone.now()
+    if not history.estimated_rows:
+        history.estimated_rows = count_file_rows(history.imported_file_path or "")
+    history.status = "processing"
+    history.started_at = history.started_at or timezone.now()
+    history.finished_at = None
+    history.attempts += 1
+    history.save(
+        update_fields=[
+            "status",
+            "started_at",
+            "finished_at",
+            "estimated_rows",
+            "attempts",
+            "updated_at",
+        ]
+    )
+
+    service = ImportService.resume(history, chunk_size=chunk_size)
+    start = time.perf_counter()
+    try:
+        if history.cancel_requested:
+            raise ImportCancelled()
+        result = service.run()
+        if result["error_count"] == 0:
+            history.status = "success"
+        elif result["successful_rows"] > 0:
+            history.status = "partial"
+        else:
+            history.status = "failed"
+    except ImportCancelled:
+        result = service.get_result()
+        history.status = "cancelled"
+    except Exception as e:
+        logger.exception("Import %s failed", history.pk)
+        result = service.get_result()
+        result["errors"] = (result["errors"] + [str(e)])[-5:]
+        history.status = "failed"
+
+    history.success_rate = Decimal(str(result["success_rate"]))
+    history.error_file_path = result["error_file_path"] or ""
+    history.error_summary = result["errors"]
+    history.duration_seconds = (history.duration_seconds or Decimal(0)) + Decimal(
+        str(round(time.perf_counter() - start, 3))
+    )
+    history.rows_per_second = service.rows_per_second
+    history.finished_at = timezone.now()
+    history.save(
+        update_fields=[
+            "status",
+            "success_rate",
+            "error_file_path",
+            "error_summary",
+            "duration_seconds",
+            "rows_per_second",
+            "finished_at",
+        ]
+    )
+    notify_import_finished(history)
+    if result["created_count"] or result["updated_count"]:
+        send_import_finished(service, history, since)
+    return result
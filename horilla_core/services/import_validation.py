@@ -0,0 +1,421 @@
+"""
+Row validation engine for the import wizard.
+
+The wizard mappings are compiled once into a pipeline of per-column
+converters holding only plain data (foreign keys are resolved to primary
+keys up front), so chunks of rows can be validated in worker processes
+without touching the database. :class:`RowValidator` fans chunks out to a
+``ProcessPoolExecutor`` and falls back to validating in-process whenever a
+pool cannot be used, e.g. inside a daemonic Celery worker.
+"""
+
+# Standard library imports
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+# Third-party imports (Django)
+from django.conf import settings
+from django.db.models import CharField, ForeignKey
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+BOOLEAN_VALUES = ("true", "1", "yes", "on", "false", "0", "no", "off")
+TRUE_VALUES = ("true", "1", "yes", "on")
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y")
+DATETIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%Y-%m-%d %I:%M:%S %p",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%d/%m/%Y %I:%M:%S %p",
+)
+TYPE_LABELS = {
+    "IntegerField": "Integer field",
+    "BigIntegerField": "Integer field",
+    "DecimalField": "Decimal field",
+    "BooleanField": "Boolean field",
+    "DateField": "Date field",
+    "DateTimeField": "Date field",
+}
+
+
+def parse_date(value):
+    """Parse an import date value, raising ``ValueError`` when invalid."""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        raise ValueError(
+            f"Invalid date format for '{value}'. Expected YYYY-MM-DD, MM/DD/YYYY, or DD/MM/YYYY"
+        )
+
+
+def parse_datetime(value):
+    """Parse an import datetime value, raising ``ValueError`` when invalid."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for fmt in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid datetime format for '{value}'")
+
+
+def get_field_metadata(model):
+    """Return the per-field metadata the import mapping relies on."""
+    return {
+        f.name: {
+            "type": f.get_internal_type(),
+            "is_fk": isinstance(f, ForeignKey),
+            "is_choice": isinstance(f, CharField) and f.choices,
+            "related_model": f.related_model if isinstance(f, ForeignKey) else None,
+            "choices": (
+                dict(f.choices) if isinstance(f, CharField) and f.choices else {}
+            ),
+            "null": f.null,
+            "blank": f.blank,
+            "verbose_name": f.verbose_name,
+        }
+        for f in model._meta.fields
+    }
+
+
+class ScalarConverter:
+    """Converts a non-relational, non-choice value of one field type."""
+
+    def __init__(self, field_type, name):
+        self.field_type = field_type
+        self.name = name
+        self.parse = {
+            "IntegerField": self.to_integer,
+            "BigIntegerField": self.to_integer,
+            "DecimalField": self.to_decimal,
+            "BooleanField": self.to_boolean,
+            "DateField": self.to_date,
+            "DateTimeField": self.to_date,
+        }.get(field_type)
+
+    def __call__(self, value, label):
+        """Return ``(value, error)`` where ``error`` is None on success."""
+        if self.parse is None:
+            return value, None
+        return self.parse(value, label)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["parse"]
+        return state
+
+    def __setstate__(self, state):
+        self.__init__(state["field_type"], state["name"])
+
+    def to_integer(self, value, label):
+        if not value:
+            return None, None
+        try:
+            return int(value), None
+        except ValueError:
+            return None, f"{label} '{self.name}': Cannot convert '{value}' to integer"
+
+    def to_decimal(self, value, label):
+        if not value:
+            return None, None
+        try:
+            return float(value), None
+        except ValueError:
+            return None, f"{label} '{self.name}': Cannot convert '{value}' to decimal"
+
+    def to_boolean(self, value, label):
+        if not value:
+            return False, None
+        str_value = str(value).lower().strip()
+        if str_value in BOOLEAN_VALUES:
+            return str_value in TRUE_VALUES, None
+        return None, (
+            f"{label} '{self.name}': Invalid boolean value '{value}'. "
+            "Valid values are: true, false, 1, 0, yes, no, on, off"
+        )
+
+    def to_date(self, value, label):
+        if not value:
+            return None, None
+        try:
+            if self.field_type == "DateField":
+                return parse_date(value), None
+            return parse_datetime(value), None
+        except ValueError as e:
+            return None, f"{label} '{self.name}': {str(e)}"
+
+
+class ColumnConverter:
+    """
+    Compiled conversion of one mapped file column into one model field.
+
+    Foreign keys produce primary keys; the caller swaps them for instances.
+    """
+
+    def __init__(self, field, header, meta, replace_value, choice_map, fk_map):
+        self.field = field
+        self.header = header
+        self.name = str(meta["verbose_name"])
+        self.null = meta["null"]
+        self.required = not meta["null"] and not meta["blank"]
+        self.replace_value = replace_value
+        self.kind = "fk" if meta["is_fk"] else "choice" if meta["is_choice"] else None
+        self.choices = list(meta["choices"])
+        self.choice_map = choice_map
+        self.fk_map = fk_map
+        self.valid_choices = ", ".join([f"'{choice}'" for choice in self.choices])
+        self.scalar = ScalarConverter(meta["type"], self.name)
+        self.label = TYPE_LABELS.get(meta["type"], "Field")
+
+    def __call__(self, row_data, errors):
+        """Return the converted value, appending messages to ``errors``."""
+        value = str(row_data.get(self.header, "")).strip()
+        original_value = value
+        if not value and self.replace_value is not None:
+            value = self.replace_value
+
+        if self.kind == "fk":
+            pk = self.fk_map.get(slugify(value) if value else None)
+            if pk is None and self.replace_value is not None:
+                pk = self.fk_map.get("__replace__")
+            if pk is None and value and not self.null:
+                errors.append(
+                    f"Foreign key '{self.name}': No matching record found for '{original_value}'"
+                )
+            elif pk is None and not value and self.required:
+                errors.append(
+                    f"Foreign key '{self.name}': Required field cannot be empty"
+                )
+            return pk
+
+        if self.kind == "choice":
+            if value and self.choice_map is not None:
+                slug_val = slugify(value)
+                if slug_val in self.choice_map:
+                    value = self.choice_map[slug_val]
+                elif self.replace_value is not None:
+                    value = self.replace_value
+            if value and value not in self.choices:
+                errors.append(
+                    f"Choice field '{self.name}': Invalid value '{original_value}'. Valid choices are: {self.valid_choices}"
+                )
+            elif not value and self.required:
+                errors.append(
+                    f"Choice field '{self.name}': Required field cannot be empty"
+                )
+            return value
+
+        value, error = self.scalar(value, self.label)
+        if error:
+            errors.append(error)
+        if value is None and self.required:
+            errors.append(f"Required field '{self.name}': Cannot be empty or invalid")
+        return value
+
+
+class CompiledMapping:
+    """
+    The full wizard mapping compiled into converters and constant values.
+
+    Only holds plain data so it can be shipped to worker processes once.
+    ``fk_fields`` lists the fields whose values are primary keys.
+    """
+
+    def __init__(self, columns, constants, fk_fields):
+        self.columns = columns
+        self.constants = constants
+        self.fk_fields = fk_fields
+
+    @classmethod
+    def compile(cls, model, import_data, fk_pks):
+        """
+        Build the pipeline for ``model`` from the wizard ``import_data``.
+
+        ``fk_pks`` maps each FK field to ``{file_key: pk}`` for the records
+        that exist, with the replace value under ``"__replace__"``.
+        """
+        field_metadata = get_field_metadata(model)
+        replace_values = import_data.get("replace_values", {})
+        choice_mappings = import_data.get("choice_mappings", {})
+        field_mappings = import_data.get("field_mappings", {})
+
+        columns = [
+            ColumnConverter(
+                field,
+                header,
+                field_metadata[field],
+                replace_values.get(field),
+                choice_mappings.get(field),
+                fk_pks.get(field, {}),
+            )
+            for field, header in field_mappings.items()
+        ]
+
+        # Replace values of unmapped fields are the same for every row, so
+        # they are converted (and validated) once here.
+        constants = []
+        for field, replace_value in replace_values.items():
+            if field in field_mappings or field not in field_metadata:
+                continue
+            meta = field_metadata[field]
+            if meta["is_fk"]:
+                constants.append((field, fk_pks.get(field, {}).get("__replace__"), []))
+            elif meta["is_choice"]:
+                if replace_value in meta["choices"]:
+                    constants.append((field, replace_value, []))
+                else:
+                    constants.append(
+                        (
+                            field,
+                            None,
+                            [
+                                f"Replace value for '{meta['verbose_name']}': Invalid choice '{replace_value}'"
+                            ],
+                        )
+                    )
+            else:
+                value, error = ScalarConverter(meta["type"], str(meta["verbose_name"]))(
+                    replace_value, "Replace value for"
+                )
+                constants.append((field, value, [error] if error else []))
+
+        fk_fields = [f for f, meta in field_metadata.items() if meta["is_fk"]]
+        return cls(columns, constants, fk_fields)
+
+    def validate(self, row_data):
+        """Return ``(mapped, errors)`` for one file row."""
+        mapped, errors = {}, []
+        for column in self.columns:
+            mapped[column.field] = column(row_data, errors)
+        for field, value, field_errors in self.constants:
+            errors.extend(field_errors)
+            if not field_errors:
+                mapped[field] = value
+        return mapped, errors
+
+    def validate_rows(self, rows):
+        """Validate ``rows``; an unexpected failure only fails its own row."""
+        results = []
+        for row_data in rows:
+            try:
+                results.append(self.validate(row_data))
+            except Exception as e:
+                results.append((None, [f"Unexpected error - {str(e)}"]))
+        return results
+
+
+_worker_mapping = None
+
+
+def _init_worker(mapping):
+    global _worker_mapping
+    _worker_mapping = mapping
+
+
+def _validate_in_worker(rows):
+    return _worker_mapping.validate_rows(rows)
+
+
+class RowValidator:
+    """
+    Validates chunks of ``(row_index, row_data)`` against a compiled mapping.
+
+    Chunks with at least ``HORILLA_IMPORT_PARALLEL_MIN_CELLS`` values (rows
+    times mapped columns) are split across
+    ``HORILLA_IMPORT_VALIDATION_WORKERS`` processes; below that, shipping
+    the rows to workers costs more than validating them. Small chunks,
+    platforms without ``fork`` and any pool failure use the serial path, so
+    the results are the same either way. Use as a context manager.
+    """
+
+    def __init__(self, mapping, workers=None, min_cells=None):
+        self.mapping = mapping
+        self.workers = (
+            workers
+            if workers is not None
+            else getattr(
+                settings,
+                "HORILLA_IMPORT_VALIDATION_WORKERS",
+                min(4, os.cpu_count() or 1),
+            )
+        )
+        self.min_cells = (
+            min_cells
+            if min_cells is not None
+            else getattr(settings, "HORILLA_IMPORT_PARALLEL_MIN_CELLS", 50000)
+        )
+        self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut the worker pool down, if one was started."""
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def get_pool(self):
+        """Start the pool lazily; return None when it cannot be used."""
+        if self.workers < 2:
+            return None
+        if self.pool is None:
+            if "fork" not in multiprocessing.get_all_start_methods():
+                self.workers = 1
+                return None
+            try:
+                self.pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("fork"),
+                    initializer=_init_worker,
+                    initargs=(self.mapping,),
+                )
+            except (OSError, ValueError, AssertionError) as e:
+                logger.warning("Import validation pool unavailable: %s", e)
+                self.workers = 1
+                return None
+        return self.pool
+
+    def validate(self, chunk):
+        """Return ``[(row_index, row_data, mapped, errors)]`` for ``chunk``."""
+        rows = [row_data for _, row_data in chunk]
+        results = None
+        cells = len(rows) * max(len(self.mapping.columns), 1)
+        pool = self.get_pool() if cells >= self.min_cells else None
+        if pool is not None:
+            size = -(-len(rows) // self.workers)
+            slices = [rows[i : i + size] for i in range(0, len(rows), size)]
+            try:
+                results = [
+                    result
+                    for part in pool.map(_validate_in_worker, slices)
+                    for result in part
+                ]
+            except (BrokenProcessPool, OSError, AssertionError) as e:
+                logger.warning("Import validation pool failed, running serially: %s", e)
+                self.close()
+                self.workers = 1
+        if results is None:
+            results = self.mapping.validate_rows(rows)
+        return [
+            (row_index, row_data, mapped, errors)
+            for (row_index, row_data), (mapped, errors) in zip(chunk, results)
+        ]
@@ -8,6 +8,9 @@ Features implemented in this module include:
 - Default currency initialization and handling of multi-currency configurations.
 - Custom permission creation during migrations.
 - Helper utilities to dynamically discover models and build filter queries.
+- Retiring cached layout context when permissions, roles or companies change.
+- Retiring cached currency tables when currencies or dated rates change.
+- Re-converting registered money fields when a company's currency changes.
 
 """
 
@@ -15,23 +18,31 @@ import logging
 from decimal import Decimal
 
 from django.apps import apps
-from django.contrib.auth.models import Permission
+from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Q
-from django.db.models.signals import post_delete, post_migrate, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 from django.dispatch import Signal, receiver
 
 from horilla.auth.models import User
+from horilla.utils.layout_context import bump_layout_version, bump_user_layout_version
 from horilla_core.models import (
     Company,
+    DatedConversionRate,
     FieldPermission,
     FiscalYear,
     ListColumnVisibility,
     MultipleCurrency,
     Role,
 )
+from horilla_core.services.company_registry import bump_company_version
+from horilla_core.services.currency_conversion import schedule_reconversion
+from horilla_core.services.currency_service import bump_currency_version
+from horilla_core.services.field_permission_matrix import (
+    bump_field_permission_version,
+)
 from horilla_core.services.fiscal_year_service import FiscalYearService
 from horilla_core.utils import get_user_field_permission
 from horilla_utils.middlewares import _thread_local
@@ -43,6 +54,14 @@ company_currency_changed = Signal()
 company_created = Signal()
 pre_logout_signal = Signal()
 pre_login_render_signal = Signal()
+# Sent by ``execute_import`` once an import wrote records. The records are
+# written with bulk operations that bypass model signals; receivers refresh
+# whatever they derive from ``sender`` records in ``company`` updated since
+# ``since``.
+import_finished = Signal()
+# Sent by ``reconvert_company_amounts`` after the registered money fields of
+# ``company_id`` were multiplied in place with ``UPDATE`` statements.
+amounts_reconverted = Signal()
 
 
 @receiver(post_save, sender="horilla_core.Company")
@@ -658,3 +677,83 @@ def assign_first_company_to_all_users(sender, instance, created, **kwargs):
     if created:
         if Company.objects.count() == 1:
             User.objects.filter(company__isnull=True).update(company=instance)
+
+
+@receiver(post_save, sender=FieldPermission)
+@receiver(post_delete, sender=FieldPermission)
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_delete, sender=User)
+def retire_field_permission_matrices(sender, **kwargs):
+    """
+    Retire the compiled field-permission matrices. User saves need no bump:
+    the user's role is read from the instance when the matrix is looked up.
+    """
+    bump_field_permission_version()
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def retire_company_registry(sender, **kwargs):
+    """Reload the company registry once the company change is committed."""
+    transaction.on_commit(bump_company_version)
+
+
+@receiver(company_currency_changed)
+def reconvert_amounts_on_currency_change(sender, company, conversion_rate, **kwargs):
+    """Re-convert the registered money fields to the new base currency."""
+    if company and conversion_rate:
+        schedule_reconversion(company.pk, conversion_rate)
+
+
+@receiver(post_save, sender=MultipleCurrency)
+@receiver(post_delete, sender=MultipleCurrency)
+@receiver(post_save, sender=DatedConversionRate)
+@receiver(post_delete, sender=DatedConversionRate)
+def retire_currency_tables(sender, **kwargs):
+    """Reload the currency tables once the currency change is committed."""
+    transaction.on_commit(bump_currency_version)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=MultipleCurrency)
+@receiver(post_delete, sender=MultipleCurrency)
+def retire_layout_context(sender, **kwargs):
+    """Companies, roles, groups and currencies appear in every user's layout."""
+    bump_layout_version()
+
+
+@receiver(m2m_changed, sender=Role.permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def retire_layout_context_on_permission_change(sender, action, **kwargs):
+    """Role and group permission changes can alter any member's menus."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_layout_version()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def retire_user_layout_context(sender, instance, **kwargs):
+    """A user's role, company and currency feed their own layout."""
+    bump_user_layout_version(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def retire_user_layout_context_on_permission_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Direct permission and group changes only affect the users involved."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        bump_user_layout_version(instance.pk)
+    elif pk_set:
+        bump_user_layout_version(*pk_set)
+    else:
+        bump_layout_version()
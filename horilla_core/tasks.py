@@ -1,27 +1,32 @@
 # Standard library imports
-import csv
-import io
 import logging
-import zipfile
-from datetime import timedelta
-from io import BytesIO
+import os
+import shutil
+from datetime import datetime, timedelta
 
 # Third-party imports
 from celery import shared_task
 
 # Third-party imports (Django)
 from django.apps import apps
+from django.conf import settings
 from django.core.mail import get_connection
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext as _
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 
 # First-party / Horilla imports
+from horilla_core.services.export_writer import (
+    DeltaRowSource,
+    ExportRowSource,
+    bundle_export_files,
+    content_type_for,
+    link_max_age,
+    make_export_directory,
+    remove_expired_exports,
+    signed_download_url,
+    write_export,
+)
 from horilla_utils.middlewares import _thread_local
 
 logger = logging.getLogger(__name__)
@@ -30,161 +35,42 @@ logger = logging.getLogger(__name__)
 @shared_task
 def process_scheduled_exports():
     """
-    Main task to process all due scheduled exports.
-    This should be run periodically (e.g., every hour or every 15 minutes).
+    Dispatch the scheduled exports that are due.
+
+    Due rows are claimed through the ``next_run_at`` index under
+    ``SELECT ... FOR UPDATE SKIP LOCKED`` and pushed forward by a lease
+    before their export task is queued, so concurrent beat or worker
+    instances never fire the same schedule twice. A successful export
+    recomputes ``next_run_at``; a failed one is retried when the lease ends.
     """
     from .models import ExportSchedule
 
     now = timezone.now()
-    current_date = now.date()
-    current_weekday = now.strftime("%A").lower()
-
-    logger.info("=== process_scheduled_exports running at %s ===", now)
-    logger.info("Current: date=%s, weekday=%s", current_date, current_weekday)
-
-    # Get all active schedules
-    schedules = ExportSchedule.objects.filter(start_date__lte=current_date).filter(
-        models.Q(end_date__isnull=True) | models.Q(end_date__gte=current_date)
-    )
-
-    logger.info("Found %s active schedules", schedules.count())
-
-    for schedule in schedules:
-        try:
-            logger.info(
-                "Checking schedule %s: frequency=%s, last_run=%s",
-                schedule.id,
-                schedule.frequency,
-                schedule.last_run,
+    batch_size = getattr(settings, "HORILLA_EXPORT_DISPATCH_BATCH", 100)
+    lease = getattr(settings, "HORILLA_EXPORT_RETRY_DELAY", timedelta(hours=1))
+
+    with transaction.atomic():
+        due_ids = list(
+            ExportSchedule.all_objects.select_for_update(skip_locked=True)
+            .filter(next_run_at__lte=now)
+            .filter(
+                models.Q(end_date__isnull=True) | models.Q(end_date__gte=now.date())
             )
-            if should_run_schedule(schedule, current_date, current_weekday):
-                logger.info(
-                    "✓ Schedule %s should run - triggering execute_scheduled_export",
-                    schedule.id,
-                )
-                execute_scheduled_export.delay(schedule.id)
-            else:
-                logger.info("✗ Schedule %s should NOT run yet", schedule.id)
-        except Exception as e:
-            logger.error("Error checking schedule %s: %s", schedule.id, e)
-            logger.exception(e)
-
-    return f"Processed {schedules.count()} schedules"
-
-
-def should_run_schedule(schedule, current_date, current_weekday):
-    """
-    Determine if a schedule should run based on frequency and last_run date.
-    Ensures the schedule only runs once per frequency period.
-    """
-    last_run = schedule.last_run
-
-    if last_run is None:
-        logger.info("Schedule has never run before")
-        return check_frequency_match(schedule, current_date, current_weekday)
-
-    days_since_last_run = (current_date - last_run).days
-    logger.info("Days since last run: %s", days_since_last_run)
-
-    if schedule.frequency == "daily":
-        should_run = days_since_last_run >= 1
-        logger.info(
-            "  Daily schedule: days_since_last_run=%s, should_run=%s",
-            days_since_last_run,
-            should_run,
-        )
-        return should_run and check_frequency_match(
-            schedule, current_date, current_weekday
-        )
-
-    if schedule.frequency == "weekly":
-        should_run = days_since_last_run >= 7 and current_weekday == schedule.weekday
-        logger.info(
-            "  Weekly schedule: days_since_last_run=%s, weekday_match=%s, should_run=%s",
-            days_since_last_run,
-            current_weekday == schedule.weekday,
-            should_run,
-        )
-        return should_run
-
-    if schedule.frequency == "monthly":
-        month_changed = current_date.year > last_run.year or (
-            current_date.year == last_run.year and current_date.month > last_run.month
-        )
-        day_matches = current_date.day == schedule.day_of_month
-        should_run = month_changed and day_matches
-        logger.info(
-            "  Monthly schedule: month_changed=%s, day_matches=%s, should_run=%s",
-            month_changed,
-            day_matches,
-            should_run,
-        )
-        return should_run
-
-    if schedule.frequency == "yearly":
-        year_changed = current_date.year > last_run.year
-        date_matches = (
-            current_date.day == schedule.yearly_day_of_month
-            and current_date.month == schedule.yearly_month
-        )
-        should_run = year_changed and date_matches
-        logger.info(
-            "  Yearly schedule: year_changed=%s, date_matches=%s, should_run=%s",
-            year_changed,
-            date_matches,
-            should_run,
-        )
-        return should_run
-
-    logger.info("  ✗ Unknown frequency: %s", schedule.frequency)
-    return False
-
-
-def check_frequency_match(schedule, current_date, current_weekday):
-    """
-    Check if the current date matches the schedule's frequency requirements.
-    Used for first-time runs.
-    """
-    if schedule.frequency == "daily":
-        logger.info("  ✓ Daily schedule - will run")
-        return True
-
-    if schedule.frequency == "weekly":
-        match = current_weekday == schedule.weekday
-        logger.info(
-            "  Weekly: current=%s, required=%s, match=%s",
-            current_weekday,
-            schedule.weekday,
-            match,
-        )
-        return match
-
-    if schedule.frequency == "monthly":
-        match = current_date.day == schedule.day_of_month
-        logger.info(
-            "  Monthly: current_day=%s, required=%s, match=%s",
-            current_date.day,
-            schedule.day_of_month,
-            match,
+            .order_by("next_run_at")
+            .values_list("pk", flat=True)[:batch_size]
         )
-        return match
+        if due_ids:
+            ExportSchedule.all_objects.filter(pk__in=due_ids).update(
+                next_run_at=now + lease
+            )
 
-    if schedule.frequency == "yearly":
-        match = (
-            current_date.day == schedule.yearly_day_of_month
-            and current_date.month == schedule.yearly_month
-        )
+    for schedule_id in due_ids:
         logger.info(
-            "  Yearly: current=%s/%s, required=%s/%s, match=%s",
-            current_date.month,
-            current_date.day,
-            schedule.yearly_month,
-            schedule.yearly_day_of_month,
-            match,
+            "Schedule %s is due - queueing execute_scheduled_export", schedule_id
         )
-        return match
+        execute_scheduled_export.delay(schedule_id)
 
-    return False
+    return f"Dispatched {len(due_ids)} schedules"
 
 
 @shared_task
@@ -212,42 +98,96 @@ def execute_scheduled_export(schedule_id):
         logger.error("ExportSchedule %s not found", schedule_id)
         return
 
+    compression = getattr(settings, "HORILLA_EXPORT_COMPRESSION", None)
+    directory = make_export_directory(f"schedule_{schedule.pk}_")
+    download_url = None
+    run_started = timezone.now()
     try:
-        logger.info("Generating export files for %s modules", len(schedule.modules))
-        export_files = generate_export_files(schedule.modules, schedule.export_format)
+        logger.info(
+            "Generating %s export files for %s modules",
+            schedule.export_mode,
+            len(schedule.modules),
+        )
+        export_files = generate_export_files(
+            schedule.modules,
+            schedule.export_format,
+            directory,
+            compression,
+            marks=(
+                schedule.high_water_marks if schedule.export_mode == "delta" else None
+            ),
+            until=run_started,
+        )
 
         if not export_files:
             logger.error("No files generated for schedule %s", schedule_id)
             return
 
         logger.info("Generated %s export files", len(export_files))
+        export_file = bundle_export_files(
+            list(export_files.values()),
+            directory,
+            f"export_{schedule.export_format}_"
+            f"{timezone.now().strftime('%Y%m%d_%H%M%S')}.zip",
+            compression,
+        )
+
+        size = os.path.getsize(export_file[1])
+        max_attachment = getattr(
+            settings, "HORILLA_EXPORT_ATTACHMENT_MAX_BYTES", 10 * 1024 * 1024
+        )
+        if size > max_attachment:
+            download_url = signed_download_url(export_file[1], schedule.user)
+            logger.info("Export is %s bytes, sending a download link", size)
 
         logger.info("Sending email to %s", schedule.user.email)
         send_export_email(
             user=schedule.user,
             export_format=schedule.export_format,
-            export_files=export_files,
+            export_file=export_file,
             modules=schedule.modules,
             company=schedule.company,
+            download_url=download_url,
         )
 
+        # Every successful run moves the marks, so switching a schedule to
+        # delta mode exports the changes since its last full export.
+        schedule.high_water_marks = {
+            **(schedule.high_water_marks or {}),
+            **{name: run_started.isoformat() for name in export_files},
+        }
         schedule.last_run = timezone.now().date()
-        schedule.save(update_fields=["last_run"])
-        logger.info("Updated last_run to %s", schedule.last_run)
+        schedule.save(update_fields=["last_run", "high_water_marks"])
+        logger.info(
+            "Updated last_run to %s, next run at %s",
+            schedule.last_run,
+            schedule.next_run_at,
+        )
 
         logger.info("=== Successfully executed schedule %s ===", schedule_id)
 
     except Exception as e:
+        download_url = None
         logger.error("=== Error executing schedule %s: %s ===", schedule_id, e)
         logger.exception(e)
+    finally:
+        # Linked files are kept until cleanup_scheduled_export_files expires them.
+        if not download_url:
+            shutil.rmtree(directory, ignore_errors=True)
 
 
-def generate_export_files(module_names, export_format):
+def generate_export_files(
+    module_names, export_format, directory, compression=None, marks=None, until=None
+):
     """
-    Generate export files for the specified modules.
-    Returns a list of tuples: (filename, file_data)
+    Stream an export file per module into ``directory``.
+
+    With ``marks`` (a schedule's ``{module: ISO timestamp}`` high-water
+    marks), modules that have a mark only export what changed after it and
+    up to ``until``; modules without one are exported in full.
+    Returns a dict: {module name: (filename, path)}
     """
-    export_files = []
+    export_files = {}
 
     for model_name in module_names:
         try:
@@ -256,9 +196,15 @@ def generate_export_files(module_names, export_format):
                 logger.warning("Model %s not found", model_name)
                 continue
 
-            filename, data = export_model_data(model, export_format)
-            if filename and data:
-                export_files.append((filename, data))
+            since = (marks or {}).get(model_name)
+            if since and until and DeltaRowSource.supports(model):
+                source = DeltaRowSource(model, datetime.fromisoformat(since), until)
+            else:
+                source = ExportRowSource(model)
+
+            filename, path = write_export(source, export_format, directory, compression)
+            if filename and path:
+                export_files[model_name] = (filename, path)
         except Exception as e:
             logger.error("Error exporting model %s: %s", model_name, e)
             continue
@@ -274,227 +220,12 @@ def get_model_by_name(model_name):
     return None
 
 
-def export_model_data(model, export_format):
-    """
-    Export all data of a given model in the selected format.
-    Returns tuple of (filename, BytesIO buffer)
-    """
-    queryset = model.objects.all()
-    fields = model._meta.fields
-
-    field_data = [(str(field.verbose_name), field.name, field) for field in fields]
-    column_headers = [fd[0] for fd in field_data]
-    field_names = [fd[1] for fd in field_data]
-
-    data = []
-    for obj in queryset:
-        row = []
-        for field_name in field_names:
-            value = getattr(obj, field_name, "")
-            row.append(str(value) if value is not None else "")
-        data.append(row)
-
-    if export_format == "csv":
-        return export_to_csv(model, column_headers, data)
-    if export_format == "xlsx":
-        return export_to_xlsx(model, column_headers, data)
-    if export_format == "pdf":
-        return export_to_pdf(model, column_headers, data)
-
-    return None, None
-
-
-def export_to_csv(model, headers, data):
-    """Export data to CSV format."""
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(headers)
-    for row in data:
-        writer.writerow(row)
-    buffer.seek(0)
-    return f"{model.__name__}_export.csv", io.BytesIO(buffer.getvalue().encode("utf-8"))
-
-
-def export_to_xlsx(model, headers, data):
-    """Export data to Excel format."""
-    wb = Workbook()
-    ws = wb.active
-
-    ws.append([str(header) for header in headers])
-
-    # Style headers
-    header_font = Font(bold=True)
-    header_alignment = Alignment(horizontal="center")
-    header_fill = PatternFill(
-        start_color="eafb5b", end_color="eafb5b", fill_type="solid"
-    )
-
-    for cell in ws[1]:
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.fill = header_fill
-
-    # Set column widths
-    for col in ws.columns:
-        column_letter = col[0].column_letter
-        ws.column_dimensions[column_letter].width = 25
-
-    # Add data
-    for row in data:
-        ws.append([str(cell) if cell is not None else "" for cell in row])
-
-    # Set row heights
-    for idx, row in enumerate(ws.rows, 1):
-        ws.row_dimensions[idx].height = 15
-
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    return f"{model.__name__}_export.xlsx", buffer
-
-
-def export_to_pdf(model, headers, data):
-    """Export data to PDF format."""
-    buffer = BytesIO()
-    page_size = (letter[1], letter[0])
-    width, height = page_size
-
-    c = canvas.Canvas(buffer, pagesize=page_size)
-    document_title = f"Exported {model._meta.verbose_name_plural}"
-    c.setTitle(document_title)
-
-    # PDF generation parameters
-    title_font_size = 18
-    header_font_size = 12
-    data_font_size = 10
-    start_x = 50
-    start_y = height - 100
-    min_col_width = 120
-    padding = 8
-    max_rows_per_page = 7
-    max_cols_per_page = 6
-    extra_row_spacing = 10
-
-    def wrap_text(text, max_chars):
-        text = str(text) if text is not None else ""
-        if len(text) <= max_chars:
-            return [text] if text else [""]
-        words = text.split()
-        lines = []
-        current_line = ""
-        for word in words:
-            if len(current_line) + len(word) + 1 <= max_chars:
-                current_line += word + " "
-            else:
-                lines.append(current_line.strip())
-                current_line = word + " "
-        if current_line:
-            lines.append(current_line.strip())
-        return lines if lines else [""]
-
-    column_chunks = [
-        headers[i : i + max_cols_per_page]
-        for i in range(0, len(headers), max_cols_per_page)
-    ]
-
-    for chunk_idx, chunk_headers in enumerate(column_chunks):
-        total_table_width = min(len(chunk_headers) * min_col_width, width - 100)
-        col_width = total_table_width / len(chunk_headers) if chunk_headers else 100
-        max_chars_per_line = int(col_width // (header_font_size * 0.5))
-
-        row_start = 0
-
-        while row_start < len(data):
-            # Draw title
-            c.setFont("Helvetica-Bold", title_font_size)
-            column_range = f"Columns {(chunk_idx * max_cols_per_page) + 1} to {min((chunk_idx + 1) * max_cols_per_page, len(headers))}"
-            c.drawCentredString(
-                width / 2, height - 50, f"{document_title} ({column_range})"
-            )
-
-            # Draw headers
-            c.setFont("Helvetica-Bold", header_font_size)
-            header_y = start_y
-            max_header_lines = max(
-                [len(wrap_text(h, max_chars_per_line)) for h in chunk_headers]
-            )
-            header_height = max_header_lines * (header_font_size + 2) + 15
-
-            c.setFillColor(colors.lightgrey)
-            c.rect(
-                start_x,
-                header_y - header_height + 5,
-                total_table_width,
-                header_height,
-                fill=1,
-                stroke=0,
-            )
-
-            c.setFillColor(colors.black)
-            for i, header in enumerate(chunk_headers):
-                x = start_x + i * col_width + padding
-                wrapped_header = wrap_text(header, max_chars_per_line)
-                y_offset = (
-                    header_height - len(wrapped_header) * (header_font_size + 2)
-                ) / 2 + 3
-                for line in wrapped_header:
-                    c.drawString(x, header_y - y_offset, line)
-                    y_offset += header_font_size + 2
-
-            # Draw data rows
-            c.setFont("Helvetica", data_font_size)
-            y = header_y - header_height - 10
-            rows_drawn = 0
-
-            for row_idx in range(row_start, len(data)):
-                if rows_drawn >= max_rows_per_page:
-                    break
-
-                start_col = chunk_idx * max_cols_per_page
-                end_col = min((chunk_idx + 1) * max_cols_per_page, len(data[row_idx]))
-                row = data[row_idx][start_col:end_col]
-
-                max_lines_in_row = max(
-                    [len(wrap_text(v, max_chars_per_line)) for v in row]
-                )
-                row_height = max_lines_in_row * (data_font_size + 2) + extra_row_spacing
-
-                if rows_drawn % 2 == 0:
-                    c.setFillColor(colors.whitesmoke)
-                    c.rect(
-                        start_x,
-                        y - row_height,
-                        total_table_width,
-                        row_height,
-                        fill=1,
-                        stroke=0,
-                    )
-
-                for i, value in enumerate(row):
-                    wrapped_value = wrap_text(value, max_chars_per_line)
-                    x = start_x + i * col_width + padding
-                    text_y_offset = (
-                        row_height - len(wrapped_value) * (data_font_size + 2)
-                    ) / 2 + 9
-                    for line in wrapped_value:
-                        c.setFillColor(colors.black)
-                        c.drawString(x, y - text_y_offset, line)
-                        text_y_offset += data_font_size + 2
-
-                y -= row_height
-                rows_drawn += 1
-
-            row_start += max_rows_per_page
-            c.showPage()
-
-    c.save()
-    buffer.seek(0)
-    return f"{model.__name__}_export.pdf", buffer
-
-
-def send_export_email(user, export_format, export_files, modules, company=None):
+def send_export_email(
+    user, export_format, export_file, modules, company=None, download_url=None
+):
     """
-    Send email with export files attached using HorillaDefaultMailBackend.
+    Send the export using HorillaDefaultMailBackend, attached or, when
+    ``download_url`` is given, as a signed download link.
     """
     logger.info("Starting email send for user: %s, company: %s", user.email, company)
 
@@ -504,6 +235,22 @@ def send_export_email(user, export_format, export_files, modules, company=None):
 
     module_names = ", ".join(modules)
 
+    if download_url:
+        delivery = f"""
+            <p style="font-size: 14px; color: #333; line-height: 1.6;">
+                The export is too large to attach. You can download it from the link below until {(timezone.now() + link_max_age()).strftime("%B %d, %Y")}.
+            </p>
+            <p style="text-align: center; margin: 25px 0;">
+                <a href="{download_url}" style="background: #e54f38; color: white; padding: 10px 20px; border-radius: 6px; text-decoration: none; font-size: 14px;">Download Export</a>
+            </p>
+        """
+    else:
+        delivery = """
+            <p style="font-size: 14px; color: #333; line-height: 1.6;">
+                Please find the exported file(s) attached to this email. You can download and use them as needed.
+            </p>
+        """
+
     body = f"""
     <!DOCTYPE html>
     <html>
@@ -525,7 +272,7 @@ def send_export_email(user, export_format, export_files, modules, company=None):
             </p>
 
             <p style="font-size: 14px; color: #333; line-height: 1.6;">
-                Your scheduled export has been completed successfully. The exported data is now ready and attached to this email.
+                Your scheduled export has been completed successfully. The exported data is now ready.
             </p>
 
             <!-- Info Box -->
@@ -543,10 +290,7 @@ def send_export_email(user, export_format, export_files, modules, company=None):
                     • <strong>Generated:</strong> {timezone.now().strftime("%B %d, %Y at %I:%M %p")}
                 </p>
             </div>
-
-            <p style="font-size: 14px; color: #333; line-height: 1.6;">
-                Please find the exported file(s) attached to this email. You can download and use them as needed.
-            </p>
+            {delivery}
 
             <!-- Footer -->
             <hr style="margin: 30px 0; border: none; border-top: 1px solid #eee;">
@@ -573,23 +317,10 @@ def send_export_email(user, export_format, export_files, modules, company=None):
         )
         email.attach_alternative(body, "text/html")
 
-        # Attach files
-        if len(export_files) == 1:
-            filename, file_data = export_files[0]
-            email.attach(
-                filename, file_data.getvalue(), get_content_type(export_format)
-            )
-        else:
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                for filename, file_data in export_files:
-                    zip_file.writestr(filename, file_data.getvalue())
-
-            zip_buffer.seek(0)
-            zip_filename = (
-                f"export_{export_format}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.zip"
-            )
-            email.attach(zip_filename, zip_buffer.getvalue(), "application/zip")
+        if not download_url:
+            filename, path = export_file
+            with open(path, "rb") as attachment:
+                email.attach(filename, attachment.read(), content_type_for(filename))
 
         email.send(fail_silently=False)
         logger.info("Export email sent successfully to %s", user.email)
@@ -604,16 +335,6 @@ def send_export_email(user, export_format, export_files, modules, company=None):
             delattr(_thread_local, "request")
 
 
-def get_content_type(export_format):
-    """Get content type based on export format."""
-    content_types = {
-        "csv": "text/csv",
-        "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        "pdf": "application/pdf",
-    }
-    return content_types.get(export_format, "application/octet-stream")
-
-
 @shared_task
 def cleanup_old_schedules():
     """
@@ -628,3 +349,129 @@ def cleanup_old_schedules():
 
     logger.info("Cleaned up %s expired schedules", deleted_count)
     return f"Deleted {deleted_count} expired schedules"
+
+
+@shared_task
+def cleanup_scheduled_export_files():
+    """
+    Remove scheduled export files whose download links have expired.
+    """
+    removed = remove_expired_exports()
+    logger.info("Removed %s expired scheduled export directories", removed)
+    return f"Removed {removed} expired export directories"
+
+
+@shared_task
+def run_import(import_history_id):
+    """
+    Run a queued import in the background.
+
+    Counters, throughput and the checkpoint are saved on the ImportHistory
+    after every chunk, which is what the progress view polls.
+    """
+    from .models import ImportHistory
+    from .services.import_service import execute_import
+
+    try:
+        history = ImportHistory.all_objects.select_related("created_by").get(
+            pk=import_history_id
+        )
+    except ImportHistory.DoesNotExist:
+        logger.error("ImportHistory %s not found", import_history_id)
+        return
+
+    if history.status != "queued":
+        logger.info("Import %s is '%s', skipping", history.pk, history.status)
+        return
+
+    result = execute_import(history)
+    logger.info(
+        "Import %s finished as %s: %s rows, %s rows/s",
+        history.pk,
+        history.status,
+        result["total_rows"],
+        history.rows_per_second,
+    )
+    return history.status
+
+
+@shared_task
+def recover_stale_imports():
+    """
+    Requeue imports whose worker died while running them.
+
+    A running import saves its checkpoint, and with it ``updated_at``, after
+    every chunk. An import still ``processing`` without a checkpoint for
+    ``HORILLA_IMPORT_STALE_AFTER`` seconds (1800) is queued again and resumes
+    after its last committed row, or is marked failed once it was started
+    ``HORILLA_IMPORT_MAX_ATTEMPTS`` times (3).
+    """
+    from .models import ImportHistory
+    from .services.import_service import notify_import_finished
+
+    stale_after = getattr(settings, "HORILLA_IMPORT_STALE_AFTER", 1800)
+    max_attempts = getattr(settings, "HORILLA_IMPORT_MAX_ATTEMPTS", 3)
+    now = timezone.now()
+    stale = ImportHistory.all_objects.filter(
+        status="processing", updated_at__lt=now - timedelta(seconds=stale_after)
+    )
+    requeued = failed = 0
+    for history in stale:
+        # Claim the row unless its worker saved a checkpoint meanwhile.
+        claim = ImportHistory.all_objects.filter(
+            pk=history.pk, status="processing", updated_at=history.updated_at
+        )
+        if history.attempts >= max_attempts:
+            errors = list(history.error_summary or [])[-4:] + [
+                "The import stopped responding and was abandoned"
+            ]
+            if claim.update(
+                status="failed", finished_at=now, updated_at=now, error_summary=errors
+            ):
+                history.status = "failed"
+                notify_import_finished(history)
+                failed += 1
+            continue
+
+        if not claim.update(status="queued", updated_at=now):
+            continue
+        try:
+            task = run_import.delay(history.pk)
+        except Exception as e:
+            logger.warning("Could not requeue import %s: %s", history.pk, e)
+            # Retried by the next run once it is stale again.
+            ImportHistory.all_objects.filter(pk=history.pk).update(status="processing")
+            continue
+        ImportHistory.all_objects.filter(pk=history.pk).update(task_id=task.id)
+        requeued += 1
+
+    if requeued or failed:
+        logger.info("Requeued %s stale imports, abandoned %s", requeued, failed)
+    return {"requeued": requeued, "failed": failed}
+
+
+@shared_task(bind=True)
+def reconvert_company_currency(self, company_id, conversion_rate):
+    """
+    Re-convert a company's stored amounts after a base currency change.
+
+    Progress is published as the ``PROGRESS`` state with ``done``/``total``
+    model fields; the result is the audit summary of rows per field.
+    Not retried: a second run would convert the amounts twice.
+    """
+    from .services.currency_conversion import reconvert_company_amounts
+
+    def progress(done, total, label):
+        self.update_state(
+            state="PROGRESS",
+            meta={"done": done, "total": total, "current": label},
+        )
+
+    summary = reconvert_company_amounts(company_id, conversion_rate, progress)
+    logger.info(
+        "Currency re-conversion of company %s finished: %s rows in %ss",
+        company_id,
+        summary["rows"],
+        summary["seconds"],
+    )
+    return summary
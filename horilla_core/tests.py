@@ -1 +1,90 @@
-# Create your core tests here.
+"""
+Tests for horilla_core
+"""
+
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from horilla.auth.models import User
+from horilla_core.models import Company, FieldPermission
+from horilla_core.services import field_permission_matrix
+
+
+class FieldPermissionMatrixTests(TestCase):
+    """Test case for the compiled field-permission matrices"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="matrixuser", email="matrix@example.com", password="password123"
+        )
+        self.content_type = ContentType.objects.get_for_model(Company)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.permission = FieldPermission.objects.create(
+                user=self.user,
+                content_type=self.content_type,
+                field_name="name",
+                permission_type="readwrite",
+            )
+
+    def matrix(self):
+        """Return the user's matrix on Company"""
+        return field_permission_matrix.get_user_matrix(self.user, Company)
+
+    def test_revoked_permission_is_not_read_after_commit(self):
+        """A permission revoked in a committed transaction is not served"""
+        self.assertEqual(self.matrix()["name"], "readwrite")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.permission.permission_type = "hidden"
+            self.permission.save()
+
+        self.assertEqual(self.matrix()["name"], "hidden")
+
+    def test_deleted_permission_is_not_read_after_commit(self):
+        """A deleted permission is no longer part of the matrix"""
+        self.assertIn("name", self.matrix())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.permission.delete()
+
+        self.assertNotIn("name", self.matrix())
+
+    def test_version_is_bumped_on_commit_only(self):
+        """A matrix read before the commit is retired once it commits"""
+        self.matrix()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            FieldPermission.objects.filter(pk=self.permission.pk).update(
+                permission_type="readonly"
+            )
+            self.permission.save(update_fields=["updated_at"])
+            # Reading inside the transaction compiles the pre-commit rows
+            # under the old version.
+            self.matrix()
+        self.assertTrue(callbacks)
+        self.assertEqual(self.matrix()["name"], "readonly")
+
+    def test_process_matrices_expire(self):
+        """Process-local matrices are reloaded after the process timeout"""
+        self.assertEqual(self.matrix()["name"], "readwrite")
+        # A change whose bump only reached another process's cache.
+        FieldPermission.objects.filter(pk=self.permission.pk).update(
+            permission_type="hidden"
+        )
+        self.assertEqual(self.matrix()["name"], "readwrite")
+
+        # The cached copy is kept no longer than the process timeout either.
+        version = field_permission_matrix.field_permission_version()
+        field_permission_matrix.cache.delete(
+            field_permission_matrix.MATRIX_KEY.format(
+                version, "user", self.user.pk, self.content_type.pk
+            )
+        )
+        timeout = field_permission_matrix.local_timeout() + 1
+        now = field_permission_matrix.time.monotonic() + timeout
+        with mock.patch.object(
+            field_permission_matrix.time, "monotonic", return_value=now
+        ):
+            self.assertEqual(self.matrix()["name"], "hidden")
@@ -565,6 +565,21 @@ urlpatterns = [
     path("step2/", import_data.ImportStep2View.as_view(), name="import_step2"),
     path("step3/", import_data.ImportStep3View.as_view(), name="import_step3"),
     path("step4/", import_data.ImportStep4View.as_view(), name="import_step4"),
+    path(
+        "import-dry-run/",
+        import_data.ImportDryRunView.as_view(),
+        name="import_dry_run",
+    ),
+    path(
+        "import-progress/<int:pk>/",
+        import_data.ImportProgressView.as_view(),
+        name="import_progress",
+    ),
+    path(
+        "import-cancel/<int:pk>/",
+        import_data.ImportCancelView.as_view(),
+        name="import_cancel",
+    ),
     path(
         "get-fields/", import_data.GetModelFieldsView.as_view(), name="get_model_fields"
     ),
@@ -824,6 +839,11 @@ urlpatterns = [
         export_data_views.ScheduleExportDeleteView.as_view(),
         name="schedule_export_delete",
     ),
+    path(
+        "scheduled-export-download/<str:token>/",
+        export_data_views.ScheduledExportDownloadView.as_view(),
+        name="scheduled_export_download",
+    ),
     # Version  info urls
     path(
         "version-info-view/",
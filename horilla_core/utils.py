@@ -9,12 +9,13 @@ from dateutil.parser import parse
 
 # Third-party imports (Django)
 from django.apps import apps
-from django.contrib.contenttypes.models import ContentType
 from django.db import models, transaction
 from django.db.models import QuerySet
 
 # First-party / Horilla imports
-from horilla_core.models import FieldPermission, MultipleCurrency, RecycleBin
+from horilla_core.models import RecycleBin
+from horilla_core.services.currency_service import get_currency_formatter
+from horilla_core.services.field_permission_matrix import get_user_matrix
 from horilla_utils.middlewares import _thread_local
 
 logger = logging.getLogger(__name__)
@@ -303,34 +304,7 @@ def get_currency_display_value(obj, field_name, user):
     Returns:
         Formatted currency string like "USD 100.00" or "EUR 85.00 (USD 100.00)"
     """
-    value = getattr(obj, field_name, None)
-
-    if value is None or value == "":
-        return ""
-
-    company = getattr(obj, "company", None)
-    if not company and hasattr(user, "company"):
-        company = user.company
-
-    if not company:
-        return str(value)
-
-    # Get currencies
-    default_currency = MultipleCurrency.get_default_currency(company)
-    user_currency = MultipleCurrency.get_user_currency(user)
-
-    if not default_currency:
-        return str(value)
-
-    # If user currency is same as default or not set, just show default
-    if not user_currency or user_currency.pk == default_currency.pk:
-        return default_currency.display_with_symbol(value)
-
-    converted_amount = user_currency.convert_from_default(value)
-    user_display = user_currency.display_with_symbol(converted_amount)
-    default_display = default_currency.display_with_symbol(value)
-
-    return f"{default_display} ({user_display})"
+    return get_currency_formatter(user).display(obj, field_name)
 
 
 def get_user_field_permission(user, model, field_name):
@@ -347,28 +321,7 @@ def get_user_field_permission(user, model, field_name):
     if user.is_superuser:
         return "readwrite"
 
-    content_type = ContentType.objects.get_for_model(model)
-
-    user_perm = FieldPermission.objects.filter(
-        user=user, content_type=content_type, field_name=field_name
-    ).first()
-
-    if user_perm:
-        return user_perm.permission_type
-
-    if hasattr(user, "role") and user.role:
-        role_perm = FieldPermission.objects.filter(
-            role=user.role, content_type=content_type, field_name=field_name
-        ).first()
-
-        if role_perm:
-            return role_perm.permission_type
-
-    model_defaults = getattr(model, "default_field_permissions", {})
-    if field_name in model_defaults:
-        return model_defaults[field_name]
-
-    return "readwrite"
+    return get_user_matrix(user, model).get(field_name, "readwrite")
 
 
 def get_field_permissions_for_model(user, model):
@@ -376,34 +329,14 @@ def get_field_permissions_for_model(user, model):
     Get all field permissions for a model for a specific user
     Returns a dictionary: {field_name: permission_type}
 
-    This is optimized to reduce database queries by fetching
-    all permissions at once instead of one by one.
+    Served from the compiled field-permission matrices, so repeated calls
+    for the same user and model do not query the database.
     """
 
     if user.is_superuser:
         return {}
 
-    content_type = ContentType.objects.get_for_model(model)
-    permissions_dict = {}
-
-    user_perms = FieldPermission.objects.filter(user=user, content_type=content_type)
-    for perm in user_perms:
-        permissions_dict[perm.field_name] = perm.permission_type
-
-    if hasattr(user, "role") and user.role:
-        role_perms = FieldPermission.objects.filter(
-            role=user.role, content_type=content_type
-        )
-        for perm in role_perms:
-            if perm.field_name not in permissions_dict:
-                permissions_dict[perm.field_name] = perm.permission_type
-
-    model_defaults = getattr(model, "default_field_permissions", {})
-    for field_name, default_value in model_defaults.items():
-        if field_name not in permissions_dict:
-            permissions_dict[field_name] = default_value
-
-    return permissions_dict
+    return get_user_matrix(user, model)
 
 
 def filter_hidden_fields(user, model, fields_list):
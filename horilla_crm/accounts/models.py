@@ -5,6 +5,8 @@ Models for managing accounts in the CRM system, including account details,
 from django.apps import apps
 from django.conf import settings
 from django.db import models
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
 from django.urls import reverse_lazy
@@ -157,6 +159,9 @@ class Account(HorillaCoreModel):
 
     CURRENCY_FIELDS = ["annual_revenue"]
 
+    TYPEAHEAD_FIELDS = ["name"]
+    TYPEAHEAD_LABEL = Concat("name", Value(" - "), Cast("pk", CharField()))
+
     class Meta:
         """Meta options for the Account model."""
 
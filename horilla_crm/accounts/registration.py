@@ -3,5 +3,8 @@ Feature registration for Accounts app.
 """
 
 from horilla.registry.feature import register_model_for_feature
+from horilla.registry.money_registry import register_money_fields
 
 register_model_for_feature(app_label="accounts", model_name="Account", all=True)
+
+register_money_fields(app_label="accounts", model_name="Account")
@@ -0,0 +1,44 @@
+"""
+Management command to recalculate campaign metrics from their members and
+opportunities, e.g. after records were loaded with signals bypassed
+
+Usage:
+python manage.py recalculate_campaign_metrics
+
+Options:
+python manage.py recalculate_campaign_metrics --company-id=1  # Specific company
+python manage.py recalculate_campaign_metrics --campaign-id=2  # Specific campaign
+"""
+
+from django.core.management.base import BaseCommand
+
+from horilla_crm.campaigns.metrics import refresh_campaign_metrics
+from horilla_crm.campaigns.models import Campaign
+
+
+class Command(BaseCommand):
+    help = "Recalculate campaign member and opportunity metrics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--company-id",
+            type=int,
+            help="Recalculate campaigns of a specific company only",
+        )
+        parser.add_argument(
+            "--campaign-id",
+            type=int,
+            help="Recalculate a specific campaign only",
+        )
+
+    def handle(self, *args, **options):
+        campaigns = Campaign.all_objects.all()
+        if options.get("company_id"):
+            campaigns = campaigns.filter(company_id=options["company_id"])
+        if options.get("campaign_id"):
+            campaigns = campaigns.filter(pk=options["campaign_id"])
+
+        updated = refresh_campaign_metrics(campaigns.values_list("pk", flat=True))
+        self.stdout.write(
+            self.style.SUCCESS(f"Recalculated metrics of {updated} campaigns")
+        )
@@ -0,0 +1,164 @@
+"""
+Campaign metrics for Horilla CRM
+
+A campaign's member and opportunity counters (leads, converted leads,
+contacts, responses, opportunities, won opportunities and their values) are
+recomputed with a single UPDATE per chunk of campaigns, whose columns are
+conditional aggregates over the campaign's members and opportunities.
+
+Member, opportunity and lead signals do not recompute right away: they call
+``schedule_campaign_metrics``, which collects the affected campaigns and
+recomputes each of them once when the transaction commits. Code saving
+many records outside a transaction can wrap the work in
+``campaign_metrics_batch`` to get one recomputation for the batch. Imports
+write with bulk operations that bypass the signals; their campaigns are
+scheduled once the import finishes (see ``horilla_crm.campaigns.signals``).
+"""
+
+# Standard library imports
+import logging
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+
+# Third-party imports (Django)
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import (
+    Count,
+    DecimalField,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+# First-party / Horilla imports
+from horilla.utils.commit_batch import CommitBatch
+from horilla_crm.campaigns.models import Campaign, CampaignMember
+from horilla_crm.opportunities.models import Opportunity
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+WON = Q(stage__is_final=True)
+
+# Campaign field: (model, aggregate) computed per campaign.
+CAMPAIGN_METRICS = {
+    "leads_in_campaign": (CampaignMember, Count("pk", filter=Q(member_type="lead"))),
+    "converted_leads_in_campaign": (
+        CampaignMember,
+        Count("pk", filter=Q(member_type="lead", lead__is_convert=True)),
+    ),
+    "contacts_in_campaign": (
+        CampaignMember,
+        Count("pk", filter=Q(member_type="contact")),
+    ),
+    "responses_in_campaign": (
+        CampaignMember,
+        Count("pk", filter=Q(member_status="responded")),
+    ),
+    "opportunities_in_campaign": (Opportunity, Count("pk")),
+    "won_opportunities_in_campaign": (Opportunity, Count("pk", filter=WON)),
+    "value_opportunities": (Opportunity, Sum("amount")),
+    "value_won_opportunities": (Opportunity, Sum("amount", filter=WON)),
+}
+
+CAMPAIGN_FIELDS = {
+    CampaignMember: "campaign",
+    Opportunity: "primary_campaign_source",
+}
+
+
+def _metric_expression(model, aggregate):
+    """Correlated subquery computing ``aggregate`` for the outer campaign"""
+    field = CAMPAIGN_FIELDS[model]
+    if isinstance(aggregate, Sum):
+        output_field, default = (
+            DecimalField(max_digits=18, decimal_places=2),
+            Decimal("0"),
+        )
+    else:
+        output_field, default = IntegerField(), 0
+    rows = (
+        model.all_objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(metric=aggregate)
+        .values("metric")
+    )
+    return Coalesce(
+        Subquery(rows, output_field=output_field),
+        Value(default, output_field=output_field),
+    )
+
+
+def refresh_campaign_metrics(campaign_ids):
+    """
+    Recompute the metrics of the given campaigns.
+
+    Campaigns are updated in chunks of ``HORILLA_CAMPAIGN_METRICS_CHUNK_SIZE``
+    (500), one UPDATE statement per chunk.
+
+    Returns:
+        int: Number of campaigns updated
+    """
+    campaign_ids = sorted({pk for pk in campaign_ids if pk})
+    chunk_size = getattr(settings, "HORILLA_CAMPAIGN_METRICS_CHUNK_SIZE", 500)
+    metrics = {
+        name: _metric_expression(model, aggregate)
+        for name, (model, aggregate) in CAMPAIGN_METRICS.items()
+    }
+    updated = 0
+    for start in range(0, len(campaign_ids), chunk_size):
+        updated += Campaign.all_objects.filter(
+            pk__in=campaign_ids[start : start + chunk_size]
+        ).update(**metrics)
+    return updated
+
+
+def _refresh_pending(campaign_ids):
+    try:
+        refresh_campaign_metrics(campaign_ids)
+    except Exception as e:
+        logger.error("Error updating campaign metrics: %s", e)
+
+
+_pending = CommitBatch(_refresh_pending)
+
+
+def schedule_campaign_metrics(campaign_ids, using=DEFAULT_DB_ALIAS):
+    """
+    Recompute the metrics of the given campaigns once the current
+    transaction commits (right away in autocommit mode), running once for
+    all campaigns scheduled in the same transaction or batch.
+    """
+    campaign_ids = {pk for pk in campaign_ids if pk}
+    if not campaign_ids:
+        return
+    batch = getattr(_state, "batch", None)
+    if batch is not None:
+        batch.update(campaign_ids)
+        return
+    _pending.add(campaign_ids, using=using)
+
+
+@contextmanager
+def campaign_metrics_batch():
+    """
+    Collect the campaigns scheduled inside the block and recompute them once
+    when the outermost batch exits (or when its transaction commits).
+    """
+    if getattr(_state, "batch", None) is not None:
+        yield
+        return
+    _state.batch = set()
+    try:
+        yield
+    finally:
+        campaign_ids, _state.batch = _state.batch, None
+    schedule_campaign_metrics(campaign_ids)
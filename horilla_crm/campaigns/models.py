@@ -207,28 +207,6 @@ class CampaignMember(HorillaCoreModel):
             return self.campaign.get_campaign_type_display()
         return ""
 
-    def save(self, *args, **kwargs):
-        """
-        Override save method to update campaign's responses_in_campaign when member_status is 'responded'.
-        """
-        is_new = not self.pk
-        old_status = None
-        if not is_new:
-            try:
-                old_instance = CampaignMember.objects.get(pk=self.pk)
-                old_status = old_instance.member_status
-            except CampaignMember.DoesNotExist:
-                pass
-
-        super().save(*args, **kwargs)
-
-        if self.campaign and (is_new or old_status != self.member_status):
-            if self.member_status == "responded":
-                self.campaign.responses_in_campaign = self.campaign.members.filter(
-                    member_status="responded"
-                ).count()
-                self.campaign.save(update_fields=["responses_in_campaign"])
-
 
 class Campaign(HorillaCoreModel):
     """
@@ -471,41 +449,10 @@ class Campaign(HorillaCoreModel):
         Recalculate all campaign metrics and update the fields.
         Useful for migrations or manual corrections.
         """
-        from django.db.models import Sum
-
-        # Leads and converted leads
-        self.leads_in_campaign = self.members.filter(member_type="lead").count()
-        self.converted_leads_in_campaign = self.members.filter(
-            member_type="lead", lead__is_convert=True
-        ).count()
-        # Contacts
-        self.contacts_in_campaign = self.members.filter(member_type="contact").count()
-        # Opportunities
-        opportunities = self.opportunities.all()
-        self.opportunities_in_campaign = opportunities.count()
-        won_opps_by_final = opportunities.filter(stage__is_final=True)
-        self.won_opportunities_in_campaign = won_opps_by_final.count()
-        # Opportunity values
-        value_opps = opportunities.aggregate(total=Sum("amount"))["total"] or 0
-        value_won_opps = (
-            opportunities.filter(stage__is_final=True).aggregate(total=Sum("amount"))[
-                "total"
-            ]
-            or 0
-        )
-        self.value_opportunities = value_opps
-        self.value_won_opportunities = value_won_opps
-        self.responses_in_campaign = self.members.filter(
-            member_status="responded"
-        ).count()
-        self.save(
-            update_fields=[
-                "leads_in_campaign",
-                "converted_leads_in_campaign",
-                "contacts_in_campaign",
-                "opportunities_in_campaign",
-                "won_opportunities_in_campaign",
-                "value_opportunities",
-                "value_won_opportunities",
-            ]
+        from horilla_crm.campaigns.metrics import (
+            CAMPAIGN_METRICS,
+            refresh_campaign_metrics,
         )
+
+        refresh_campaign_metrics([self.pk])
+        self.refresh_from_db(fields=list(CAMPAIGN_METRICS))
@@ -3,5 +3,8 @@ Feature registration for Campaigns app.
 """
 
 from horilla.registry.feature import register_model_for_feature
+from horilla.registry.money_registry import register_money_fields
 
 register_model_for_feature(app_label="campaigns", model_name="Campaign", all=True)
+
+register_money_fields(app_label="campaigns", model_name="Campaign")
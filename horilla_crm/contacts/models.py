@@ -5,6 +5,8 @@ Models for managing contacts in the CRM system, including contact details,
 from django.apps import apps
 from django.conf import settings
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Concat, Trim
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
 from django.urls import reverse_lazy
@@ -95,6 +97,9 @@ class Contact(HorillaCoreModel):
 
     OWNER_FIELDS = ["contact_owner"]
 
+    TYPEAHEAD_FIELDS = ["first_name", "last_name", "email"]
+    TYPEAHEAD_LABEL = Trim(Concat("first_name", Value(" "), "last_name"))
+
     class Meta:
         """Meta options for the Contact model."""
 
@@ -46,6 +46,15 @@ class ForecastConfig(AppConfig):
             __import__("horilla_crm.forecast.menu")
             __import__("horilla_crm.forecast.signals")
 
+            from django.conf import settings
+
+            from .celery_schedules import HORILLA_FORECAST_BEAT_SCHEDULE
+
+            if not hasattr(settings, "CELERY_BEAT_SCHEDULE"):
+                settings.CELERY_BEAT_SCHEDULE = {}
+
+            settings.CELERY_BEAT_SCHEDULE.update(HORILLA_FORECAST_BEAT_SCHEDULE)
+
         except Exception as e:
             import logging
 
@@ -0,0 +1,8 @@
+from celery.schedules import crontab
+
+HORILLA_FORECAST_BEAT_SCHEDULE = {
+    "reconcile-forecast-facts-nightly": {
+        "task": "horilla_crm.forecast.tasks.reconcile_facts",
+        "schedule": crontab(minute=30, hour=2),  # Every day at 02:30
+    },
+}
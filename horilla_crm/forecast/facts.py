@@ -0,0 +1,400 @@
+"""
+Forecast fact table maintenance for Horilla CRM
+
+ForecastFact rows hold the opportunity totals (amount, expected revenue,
+deal count and their won-stage counterparts) per company, forecast type,
+period, owner and forecast category. They are kept up to date from
+opportunity saves and deletes by applying the difference between the
+opportunity's contribution before and after the change, and are repaired
+by ``reconcile_forecast_facts`` for changes that bypass signals (bulk
+updates, stage or period edits, forecast condition changes). Opportunity
+imports and base currency re-conversions reconcile their company's facts
+when they finish (see ``horilla_crm.forecast.signals``).
+
+Signal handlers queue reconciliations with ``schedule_fact_reconciliation``,
+which runs the ``reconcile_facts`` task once per committed transaction for
+all forecast types and companies it named.
+
+Forecast views read values with ``get_fact_values``, so their cost depends
+on periods and users rather than on the number of opportunities.
+"""
+
+# Standard library imports
+import logging
+import time
+from decimal import Decimal
+
+# Third-party imports (Django)
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    BooleanField,
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+
+# First-party / Horilla imports
+from horilla.utils.commit_batch import CommitBatch
+from horilla_core.models import Period
+from horilla_crm.forecast.models import ForecastFact, ForecastType
+from horilla_crm.forecast.utils import ForecastCalculator
+from horilla_crm.opportunities.models import Opportunity
+
+logger = logging.getLogger(__name__)
+
+FACT_MEASURES = (
+    "amount",
+    "expected_revenue",
+    "deal_count",
+    "won_amount",
+    "won_expected_revenue",
+    "won_count",
+)
+
+FACT_KEY = ("company_id", "forecast_type_id", "period_id", "owner_id", "category")
+
+
+def _forecast_type_conditions(company_id, forecast_type_ids=None):
+    """Return ``[(forecast_type, conditions Q or None)]`` of active forecast types"""
+    forecast_types = ForecastType.all_objects.filter(
+        is_active=True, company_id=company_id
+    )
+    if forecast_type_ids is not None:
+        forecast_types = forecast_types.filter(pk__in=forecast_type_ids)
+    calculator = ForecastCalculator()
+    return [
+        (forecast_type, calculator.build_conditions_query(forecast_type))
+        for forecast_type in forecast_types
+    ]
+
+
+def _close_date_period(company_id, close_date):
+    return (
+        Period.all_objects.filter(
+            company_id=company_id,
+            start_date__lte=close_date,
+            end_date__gte=close_date,
+        )
+        .order_by("-start_date")
+        .values_list("id", flat=True)
+        .first()
+    )
+
+
+def opportunity_fact_state(opportunity_id):
+    """
+    Read what an opportunity contributes to the fact table, as stored.
+
+    Returns:
+        dict: Fact keys mapped to measure deltas; empty when the
+        opportunity is missing or has no owner or period
+    """
+    if not opportunity_id:
+        return {}
+    row = (
+        Opportunity.all_objects.filter(pk=opportunity_id)
+        .values(
+            "company_id",
+            "owner_id",
+            "close_date",
+            "forecast_category",
+            "amount",
+            "expected_revenue",
+            "stage__stage_type",
+        )
+        .first()
+    )
+    if not row or not all(row[f] for f in ("company_id", "owner_id", "close_date")):
+        return {}
+    period_id = _close_date_period(row["company_id"], row["close_date"])
+    if not period_id:
+        return {}
+
+    forecast_types = _forecast_type_conditions(row["company_id"])
+    conditional = {
+        f"matches_{forecast_type.pk}": Case(
+            When(conditions, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
+        for forecast_type, conditions in forecast_types
+        if conditions
+    }
+    matches = {}
+    if conditional:
+        matches = (
+            Opportunity.all_objects.filter(pk=opportunity_id)
+            .annotate(**conditional)
+            .values(*conditional)
+            .first()
+            or {}
+        )
+
+    amount = row["amount"] or Decimal("0")
+    expected_revenue = row["expected_revenue"] or Decimal("0")
+    won = row["stage__stage_type"] == "won"
+    measures = {
+        "amount": amount,
+        "expected_revenue": expected_revenue,
+        "deal_count": 1,
+        "won_amount": amount if won else Decimal("0"),
+        "won_expected_revenue": expected_revenue if won else Decimal("0"),
+        "won_count": 1 if won else 0,
+    }
+
+    state = {}
+    for forecast_type, conditions in forecast_types:
+        if conditions and not matches.get(f"matches_{forecast_type.pk}"):
+            continue
+        key = (
+            row["company_id"],
+            forecast_type.pk,
+            period_id,
+            row["owner_id"],
+            row["forecast_category"] or "",
+        )
+        state[key] = measures
+    return state
+
+
+def apply_fact_change(old_state, new_state):
+    """
+    Move an opportunity's contribution from ``old_state`` to ``new_state``
+    (as returned by ``opportunity_fact_state``) with one increment per
+    changed fact row.
+    """
+    deltas = {}
+    for sign, state in ((-1, old_state), (1, new_state)):
+        for key, measures in (state or {}).items():
+            delta = deltas.setdefault(key, dict.fromkeys(FACT_MEASURES, 0))
+            for measure, value in measures.items():
+                delta[measure] += sign * value
+
+    for key, delta in deltas.items():
+        if not any(delta.values()):
+            continue
+        lookup = dict(zip(FACT_KEY, key))
+        increments = {measure: F(measure) + value for measure, value in delta.items()}
+        if ForecastFact.objects.filter(**lookup).update(**increments):
+            if delta["deal_count"] < 0:
+                # Drop rows no opportunity contributes to any more.
+                ForecastFact.objects.filter(**lookup, deal_count=0).delete()
+            continue
+        try:
+            with transaction.atomic():
+                ForecastFact.objects.create(**lookup, **delta)
+        except IntegrityError:
+            # Created concurrently; add to that row instead.
+            ForecastFact.objects.filter(**lookup).update(**increments)
+
+
+def compute_forecast_facts(forecast_type, conditions=None):
+    """
+    Aggregate the fact rows of ``forecast_type`` from its opportunities.
+
+    Returns:
+        dict: {(company_id, forecast_type_id, period_id, owner_id, category): measures}
+    """
+    close_date_period = Period.all_objects.filter(
+        company_id=OuterRef("company_id"),
+        start_date__lte=OuterRef("close_date"),
+        end_date__gte=OuterRef("close_date"),
+    ).order_by("-start_date")
+
+    opportunities = Opportunity.all_objects.filter(
+        company_id=forecast_type.company_id, owner__isnull=False
+    )
+    if conditions:
+        opportunities = opportunities.filter(conditions)
+
+    won = Q(stage__stage_type="won")
+    rows = (
+        opportunities.annotate(fact_period=Subquery(close_date_period.values("id")[:1]))
+        .filter(fact_period__isnull=False)
+        .values("owner_id", "fact_period", "forecast_category")
+        .annotate(
+            fact_amount=Sum("amount"),
+            fact_expected_revenue=Sum("expected_revenue"),
+            fact_deal_count=Count("id"),
+            fact_won_amount=Sum("amount", filter=won),
+            fact_won_expected_revenue=Sum("expected_revenue", filter=won),
+            fact_won_count=Count("id", filter=won),
+        )
+        .order_by()
+    )
+
+    facts = {}
+    for row in rows:
+        key = (
+            forecast_type.company_id,
+            forecast_type.pk,
+            row["fact_period"],
+            row["owner_id"],
+            row["forecast_category"] or "",
+        )
+        facts[key] = {measure: row[f"fact_{measure}"] or 0 for measure in FACT_MEASURES}
+    return facts
+
+
+def reconcile_forecast_facts(company_id=None, forecast_type_ids=None, progress=None):
+    """
+    Rebuild the expected fact rows from opportunities and repair any drift:
+    update changed rows, create missing ones and delete stale ones.
+
+    Args:
+        company_id: Only reconcile this company's forecast types
+        forecast_type_ids: Only reconcile these forecast types
+        progress: Optional callable ``progress(done, total, label)`` called
+            after each forecast type
+
+    Returns:
+        dict: ``{"forecast_types", "facts", "updated", "created", "deleted", "seconds"}``
+    """
+    started = time.monotonic()
+    forecast_types = ForecastType.all_objects.filter(is_active=True)
+    if company_id:
+        forecast_types = forecast_types.filter(company_id=company_id)
+    if forecast_type_ids is not None:
+        forecast_types = forecast_types.filter(pk__in=forecast_type_ids)
+    forecast_types = list(forecast_types)
+
+    summary = {
+        "forecast_types": len(forecast_types),
+        "facts": 0,
+        "updated": 0,
+        "created": 0,
+        "deleted": 0,
+    }
+    calculator = ForecastCalculator()
+    for done, forecast_type in enumerate(forecast_types, 1):
+        expected = compute_forecast_facts(
+            forecast_type, calculator.build_conditions_query(forecast_type)
+        )
+        to_update, stale = [], []
+        for fact in ForecastFact.objects.filter(forecast_type=forecast_type):
+            key = tuple(getattr(fact, field) for field in FACT_KEY)
+            measures = expected.pop(key, None)
+            if measures is None:
+                stale.append(fact.pk)
+            elif any(getattr(fact, m) != value for m, value in measures.items()):
+                for measure, value in measures.items():
+                    setattr(fact, measure, value)
+                to_update.append(fact)
+            else:
+                summary["facts"] += 1
+
+        with transaction.atomic():
+            ForecastFact.objects.filter(pk__in=stale).delete()
+            ForecastFact.objects.bulk_update(
+                to_update, list(FACT_MEASURES), batch_size=1000
+            )
+            ForecastFact.objects.bulk_create(
+                [
+                    ForecastFact(**dict(zip(FACT_KEY, key)), **measures)
+                    for key, measures in expected.items()
+                ],
+                batch_size=1000,
+            )
+
+        summary["facts"] += len(to_update) + len(expected)
+        summary["updated"] += len(to_update)
+        summary["created"] += len(expected)
+        summary["deleted"] += len(stale)
+        if progress:
+            progress(done, len(forecast_types), forecast_type.name)
+
+    summary["seconds"] = round(time.monotonic() - started, 3)
+    return summary
+
+
+def _queue_reconciliations(items):
+    company_ids = {value for kind, value in items if kind == "company"}
+    forecast_type_ids = sorted(
+        value for kind, value in items if kind == "forecast_type"
+    )
+    if None in company_ids:
+        runs = [{}]
+    else:
+        runs = [{"company_id": company_id} for company_id in sorted(company_ids)]
+        if forecast_type_ids:
+            runs.append({"forecast_type_ids": forecast_type_ids})
+
+    # Imported here: the task module imports this module.
+    from horilla_crm.forecast.tasks import reconcile_facts
+
+    for kwargs in runs:
+        try:
+            reconcile_facts.delay(**kwargs)
+            continue
+        except Exception as e:
+            logger.warning("Could not queue forecast fact reconciliation: %s", e)
+        try:
+            reconcile_forecast_facts(**kwargs)
+        except Exception as e:
+            logger.error("Error reconciling forecast facts: %s", e)
+
+
+_pending_reconciliations = CommitBatch(_queue_reconciliations)
+
+
+def schedule_fact_reconciliation(company_id=None, forecast_type_ids=None):
+    """
+    Queue the reconciliation of ``forecast_type_ids``, or of every forecast
+    type of ``company_id`` (all companies when None), once the current
+    transaction commits. Requests of one transaction share one task per
+    company and one for the forecast types.
+    """
+    if forecast_type_ids is not None:
+        items = [("forecast_type", pk) for pk in forecast_type_ids if pk]
+    else:
+        items = [("company", company_id)]
+    _pending_reconciliations.add(items)
+
+
+def get_fact_values(forecast_type, period_ids, owner_id=None):
+    """
+    Forecast values of ``forecast_type`` per owner and period, read from the
+    fact table with the type's measure and included categories.
+
+    Returns:
+        dict: {(owner_id, period_id): {"pipeline", "best_case", "commit",
+        "closed", "actual"}}
+    """
+    if forecast_type.is_quantity_based:
+        measure, won_measure = "deal_count", "won_count"
+    elif forecast_type.is_revenue_expected_based:
+        measure, won_measure = "expected_revenue", "won_expected_revenue"
+    else:
+        measure, won_measure = "amount", "won_amount"
+
+    included = {
+        "pipeline": forecast_type.include_pipeline,
+        "best_case": forecast_type.include_best_case,
+        "commit": forecast_type.include_commit,
+        "closed": forecast_type.include_closed,
+    }
+
+    facts = ForecastFact.objects.filter(
+        forecast_type=forecast_type, period_id__in=period_ids
+    )
+    if owner_id:
+        facts = facts.filter(owner_id=owner_id)
+
+    values_map = {}
+    for owner, period, category, value, won_value in facts.values_list(
+        "owner_id", "period_id", "category", measure, won_measure
+    ):
+        values = values_map.setdefault(
+            (owner, period),
+            {"pipeline": 0, "best_case": 0, "commit": 0, "closed": 0, "actual": 0},
+        )
+        if included.get(category):
+            values[category] += value
+        values["actual"] += won_value
+    return values_map
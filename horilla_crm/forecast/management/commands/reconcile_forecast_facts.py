@@ -0,0 +1,53 @@
+"""
+Management command to rebuild the forecast fact table from opportunities
+migrate queues the first build of forecast types without facts; run this
+when no Celery worker is available, or to repair drift from changes that
+bypass signals (the nightly task does the same)
+
+Usage:
+python manage.py reconcile_forecast_facts
+
+Options:
+python manage.py reconcile_forecast_facts --company-id=1  # Specific company
+python manage.py reconcile_forecast_facts --forecast-type-id=2  # Specific forecast type
+"""
+
+from django.core.management.base import BaseCommand
+
+from horilla_crm.forecast.facts import reconcile_forecast_facts
+
+
+class Command(BaseCommand):
+    help = "Rebuild forecast facts from opportunities and repair any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--company-id",
+            type=int,
+            help="Reconcile forecast types of a specific company only",
+        )
+        parser.add_argument(
+            "--forecast-type-id",
+            type=int,
+            help="Reconcile a specific forecast type only",
+        )
+
+    def handle(self, *args, **options):
+        forecast_type_id = options.get("forecast_type_id")
+
+        def progress(done, total, label):
+            self.stdout.write(f"  [{done}/{total}] {label}")
+
+        summary = reconcile_forecast_facts(
+            options.get("company_id"),
+            [forecast_type_id] if forecast_type_id else None,
+            progress,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {summary['facts']} facts for "
+                f"{summary['forecast_types']} forecast types: "
+                f"{summary['updated']} updated, {summary['created']} created, "
+                f"{summary['deleted']} deleted in {summary['seconds']}s"
+            )
+        )
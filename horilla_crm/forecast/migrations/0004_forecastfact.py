@@ -0,0 +1,136 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forecast", "0003_alter_forecastcondition_operator"),
+        ("horilla_core", "0011_recentlyviewed_unique_item"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ForecastFact",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "category",
+                    models.CharField(max_length=50, verbose_name="Forecast Category"),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=18,
+                        verbose_name="Amount",
+                    ),
+                ),
+                (
+                    "expected_revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=18,
+                        verbose_name="Expected Revenue",
+                    ),
+                ),
+                ("deal_count", models.IntegerField(default=0, verbose_name="Deals")),
+                (
+                    "won_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=18,
+                        verbose_name="Won Amount",
+                    ),
+                ),
+                (
+                    "won_expected_revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=18,
+                        verbose_name="Won Expected Revenue",
+                    ),
+                ),
+                ("won_count", models.IntegerField(default=0, verbose_name="Won Deals")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "company",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="horilla_core.company",
+                        verbose_name="Company",
+                    ),
+                ),
+                (
+                    "forecast_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facts",
+                        to="forecast.forecasttype",
+                        verbose_name="Forecast Type",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="forecast_facts",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Owner",
+                    ),
+                ),
+                (
+                    "period",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="forecast_facts",
+                        to="horilla_core.period",
+                        verbose_name="Period",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Forecast Fact",
+                "verbose_name_plural": "Forecast Facts",
+                "indexes": [
+                    models.Index(
+                        fields=["forecast_type", "period", "owner"],
+                        name="forecast_fo_forecas_5dd632_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "company",
+                            "forecast_type",
+                            "period",
+                            "owner",
+                            "category",
+                        ),
+                        name="unique_forecast_fact",
+                    )
+                ],
+            },
+        ),
+    ]
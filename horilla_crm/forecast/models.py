@@ -13,6 +13,7 @@ from django.utils.translation import gettext_lazy as _
 from horilla.registry.permission_registry import permission_exempt_model
 from horilla.utils.choices import OPERATOR_CHOICES
 from horilla_core.models import (
+    Company,
     FiscalYearInstance,
     HorillaCoreModel,
     Period,
@@ -613,3 +614,78 @@ class ForecastTargetUser(HorillaCoreModel):
 
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.forecast_target.name}"
+
+
+@permission_exempt_model
+class ForecastFact(models.Model):
+    """
+    Opportunity totals of one owner in one period for a forecast type and
+    forecast category.
+
+    Kept up to date from opportunity changes and repaired by reconciliation
+    (see horilla_crm.forecast.facts); forecast views read these rows instead
+    of aggregating opportunities.
+    """
+
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name=_("Company"),
+    )
+    forecast_type = models.ForeignKey(
+        ForecastType,
+        on_delete=models.CASCADE,
+        related_name="facts",
+        verbose_name=_("Forecast Type"),
+    )
+    period = models.ForeignKey(
+        Period,
+        on_delete=models.CASCADE,
+        related_name="forecast_facts",
+        verbose_name=_("Period"),
+    )
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="forecast_facts",
+        verbose_name=_("Owner"),
+    )
+    category = models.CharField(max_length=50, verbose_name=_("Forecast Category"))
+    amount = models.DecimalField(
+        max_digits=18, decimal_places=2, default=0, verbose_name=_("Amount")
+    )
+    expected_revenue = models.DecimalField(
+        max_digits=18, decimal_places=2, default=0, verbose_name=_("Expected Revenue")
+    )
+    deal_count = models.IntegerField(default=0, verbose_name=_("Deals"))
+    won_amount = models.DecimalField(
+        max_digits=18, decimal_places=2, default=0, verbose_name=_("Won Amount")
+    )
+    won_expected_revenue = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Won Expected Revenue"),
+    )
+    won_count = models.IntegerField(default=0, verbose_name=_("Won Deals"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        """Meta options for ForecastFact model."""
+
+        verbose_name = _("Forecast Fact")
+        verbose_name_plural = _("Forecast Facts")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "forecast_type", "period", "owner", "category"],
+                name="unique_forecast_fact",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["forecast_type", "period", "owner"]),
+        ]
+
+    def __str__(self):
+        return f"{self.forecast_type} - {self.period} - {self.owner} - {self.category}"
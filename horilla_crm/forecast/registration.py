@@ -3,9 +3,24 @@ Feature registration for Forecast app.
 """
 
 from horilla.registry.feature import register_model_for_feature
+from horilla.registry.money_registry import register_money_fields
 
 register_model_for_feature(
     app_label="forecast",
     model_name="ForecastType",
     features=["import_data", "export_data"],
 )
+
+register_money_fields(
+    app_label="forecast",
+    model_name="Forecast",
+    fields=[
+        "target_amount",
+        "pipeline_amount",
+        "best_case_amount",
+        "commit_amount",
+        "closed_amount",
+        "actual_amount",
+    ],
+    company_lookup="owner__company",
+)
@@ -2,64 +2,29 @@
 
 import logging
 
-from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 
 from horilla.auth.models import User
 from horilla_core.models import Period
-from horilla_core.signals import company_currency_changed
-from horilla_crm.forecast.models import Forecast, ForecastType
+from horilla_core.signals import amounts_reconverted, import_finished
+from horilla_crm.forecast.facts import (
+    apply_fact_change,
+    opportunity_fact_state,
+    schedule_fact_reconciliation,
+)
+from horilla_crm.forecast.models import ForecastCondition, ForecastType
 from horilla_crm.forecast.utils import ForecastCalculator
 from horilla_crm.opportunities.models import Opportunity
 from horilla_keys.models import ShortcutKey
 
 
-@receiver(company_currency_changed)
-def update_forecast_on_currency_change(sender, **kwargs):
-    """
-    Updates Forecast revenue amounts when a company's currency changes.
-    """
-    company = kwargs.get("company")
-    conversion_rate = kwargs.get("conversion_rate")
-
-    if not company or not conversion_rate:
-        return
-
-    forecasts_to_update = []
-
-    revenue_fields = [
-        "target_amount",
-        "pipeline_amount",
-        "best_case_amount",
-        "commit_amount",
-        "closed_amount",
-        "actual_amount",
-    ]
-
-    forecasts = Forecast.objects.filter(owner__company=company).only(
-        "id", *revenue_fields
-    )
-
-    for forecast in forecasts:
-        needs_update = False
-
-        for field in revenue_fields:
-            value = getattr(forecast, field)
-            if value is not None:
-                setattr(forecast, field, value * conversion_rate)
-                needs_update = True
-
-        if needs_update:
-            forecasts_to_update.append(forecast)
-
-    if forecasts_to_update:
-        Forecast.objects.bulk_update(
-            forecasts_to_update,
-            revenue_fields,
-            batch_size=500,
-        )
-
-
 @receiver(pre_save, sender=Opportunity)
 def track_opportunity_changes(sender, instance, **kwargs):
     """
@@ -303,6 +268,93 @@ def update_forecast_on_opportunity_delete(sender, instance, **kwargs):
         logging.error("Error updating forecast on opportunity delete: %s", e)
 
 
+@receiver(pre_save, sender=Opportunity)
+@receiver(pre_delete, sender=Opportunity)
+def capture_forecast_facts(sender, instance, **kwargs):
+    """
+    Remember what the stored opportunity contributes to the forecast facts
+    so the change can be applied as a delta afterwards
+    """
+    try:
+        instance._forecast_fact_state = opportunity_fact_state(instance.pk)
+    except Exception as e:
+        logging.error("Error reading forecast facts of opportunity: %s", e)
+
+
+@receiver(post_save, sender=Opportunity)
+@receiver(post_delete, sender=Opportunity)
+def update_forecast_facts(sender, instance, **kwargs):
+    """
+    Move the opportunity's contribution in the forecast facts from its old
+    owner/period/category/amounts to the new ones
+    """
+    if "_forecast_fact_state" not in instance.__dict__:
+        return
+    old_state = instance.__dict__.pop("_forecast_fact_state")
+    try:
+        new_state = (
+            opportunity_fact_state(instance.pk)
+            if kwargs.get("signal") is post_save
+            else {}
+        )
+        apply_fact_change(old_state, new_state)
+    except Exception as e:
+        logging.error("Error updating forecast facts of opportunity: %s", e)
+
+
+@receiver(post_save, sender=ForecastType)
+@receiver(post_save, sender=ForecastCondition)
+@receiver(post_delete, sender=ForecastCondition)
+def reconcile_facts_on_forecast_type_change(sender, instance, **kwargs):
+    """
+    Rebuild a forecast type's facts once a change to the type or its
+    conditions commits, since it can change which opportunities count
+    """
+    forecast_type_id = (
+        instance.pk if sender is ForecastType else instance.forecast_type_id
+    )
+    schedule_fact_reconciliation(forecast_type_ids=[forecast_type_id])
+
+
+@receiver(import_finished, sender=Opportunity)
+def reconcile_facts_after_import(sender, company=None, **kwargs):
+    """
+    Rebuild the company's forecast facts after an opportunity import, whose
+    bulk writes bypass the opportunity signals that maintain them
+    """
+    schedule_fact_reconciliation(company_id=company.pk if company else None)
+
+
+@receiver(amounts_reconverted)
+def reconcile_facts_after_reconversion(sender, company_id, **kwargs):
+    """
+    Rebuild the company's forecast facts once its opportunity amounts were
+    re-converted to a new base currency
+    """
+    schedule_fact_reconciliation(company_id=company_id)
+
+
+@receiver(post_migrate)
+def backfill_forecast_facts(sender, **kwargs):
+    """
+    Queue the first reconciliation of active forecast types that have no
+    facts yet, e.g. right after the fact table was installed
+    """
+    if sender.name != "horilla_crm.forecast":
+        return
+    try:
+        forecast_type_ids = list(
+            ForecastType.all_objects.filter(is_active=True, facts__isnull=True)
+            .values_list("pk", flat=True)
+            .distinct()
+        )
+    except Exception as e:
+        logging.warning("Could not look up forecast types without facts: %s", e)
+        return
+    if forecast_type_ids:
+        schedule_fact_reconciliation(forecast_type_ids=forecast_type_ids)
+
+
 @receiver(post_save, sender=User)
 def create_forecast_shortcuts(sender, instance, created, **kwargs):
     predefined = [
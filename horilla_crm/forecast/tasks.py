@@ -0,0 +1,95 @@
+"""
+Celery tasks for the forecast module.
+"""
+
+import logging
+import time
+
+from celery import shared_task
+
+from horilla.auth.models import User
+from horilla_core.models import FiscalYearInstance
+
+from .facts import reconcile_forecast_facts
+from .models import ForecastType
+from .utils import ForecastCalculator
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True)
+def generate_forecasts(
+    self, fiscal_year_id=None, user_ids=None, forecast_type_ids=None
+):
+    """
+    Create or update a fiscal year's forecasts in batches.
+
+    Progress is published as the ``PROGRESS`` state with ``done``/``total``
+    forecasts and the rows written per second so far; the result is the
+    generation summary.
+    """
+    fiscal_year = (
+        FiscalYearInstance.all_objects.filter(pk=fiscal_year_id).first()
+        if fiscal_year_id
+        else None
+    )
+    calculator = ForecastCalculator(fiscal_year=fiscal_year)
+    users = User.objects.filter(pk__in=user_ids) if user_ids else None
+    forecast_types = (
+        ForecastType.all_objects.filter(pk__in=forecast_type_ids)
+        if forecast_type_ids
+        else None
+    )
+    started = time.monotonic()
+
+    def progress(done, total, label):
+        elapsed = time.monotonic() - started
+        self.update_state(
+            state="PROGRESS",
+            meta={
+                "done": done,
+                "total": total,
+                "current": label,
+                "rows_per_second": round(done / elapsed, 1) if elapsed else done,
+            },
+        )
+
+    summary = calculator.bulk_generate_forecasts(
+        users, forecast_types=forecast_types, progress=progress
+    )
+    logger.info(
+        "Generated %s forecasts (%s created, %s updated) in %ss, %s rows/s",
+        summary["forecasts"],
+        summary["created"],
+        summary["updated"],
+        summary["seconds"],
+        summary["rows_per_second"],
+    )
+    return summary
+
+
+@shared_task(bind=True)
+def reconcile_facts(self, company_id=None, forecast_type_ids=None):
+    """
+    Repair drift between the forecast fact table and opportunities.
+
+    Progress is published as the ``PROGRESS`` state with ``done``/``total``
+    forecast types; the result is the reconciliation summary.
+    """
+
+    def progress(done, total, label):
+        self.update_state(
+            state="PROGRESS",
+            meta={"done": done, "total": total, "current": label},
+        )
+
+    summary = reconcile_forecast_facts(company_id, forecast_type_ids, progress)
+    logger.info(
+        "Reconciled %s forecast facts: %s updated, %s created, %s deleted in %ss",
+        summary["facts"],
+        summary["updated"],
+        summary["created"],
+        summary["deleted"],
+        summary["seconds"],
+    )
+    return summary
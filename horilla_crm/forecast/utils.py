@@ -14,13 +14,22 @@ Features:
 - Caches condition queries for efficiency.
 """
 
-from django.db.models import Q, Sum
+import logging
+import time
+from bisect import bisect_right
+
+from django.conf import settings
+from django.db import NotSupportedError, transaction
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
 
 from horilla.auth.models import User
 from horilla_core.models import FiscalYearInstance, Period
 from horilla_crm.forecast.models import Forecast, ForecastTarget, ForecastType
 from horilla_crm.opportunities.models import Opportunity
 
+logger = logging.getLogger(__name__)
+
 
 class ForecastCalculator:
     """
@@ -118,75 +127,17 @@ class ForecastCalculator:
         if not forecasts:
             return
 
-        # Group forecasts by user and period for efficient querying
-        user_period_forecasts = {}
-        for forecast in forecasts:
-            key = (forecast.owner_id, forecast.period_id)
-            user_period_forecasts[key] = forecast
-
-        # Get all opportunities for all users/periods in single query
-        user_ids = list(set(f.owner_id for f in forecasts))
-        period_data = {}
-        for forecast in forecasts:
-            if forecast.period_id not in period_data:
-                period_data[forecast.period_id] = {
-                    "start_date": forecast.period.start_date,
-                    "end_date": forecast.period.end_date,
-                }
-
-        # Build conditions query once and cache it
-        conditions_query = self.get_cached_conditions_query(forecast_type)
-
-        # Get all relevant opportunities in bulk
-        opportunities_query = Q(owner_id__in=user_ids)
-
-        # Add date range conditions for all periods
-        date_conditions = Q()
-        for period_info in period_data.values():
-            date_conditions |= Q(
-                close_date__range=[period_info["start_date"], period_info["end_date"]]
-            )
-        opportunities_query &= date_conditions
-
-        if conditions_query:
-            opportunities_query &= conditions_query
-
-        opportunities = Opportunity.objects.filter(opportunities_query).values(
-            "id",
-            "owner_id",
-            "close_date",
-            "amount",
-            "expected_revenue",
-            "forecast_category",
-            "stage__stage_type",
+        values_map = self.aggregate_forecast_values(
+            set(f.owner_id for f in forecasts),
+            set(f.period_id for f in forecasts),
+            forecast_type,
         )
 
-        # Group opportunities by user and period
-        user_period_opportunities = {}
-        for opp in opportunities:
-            # Find which period this opportunity belongs to
-            for forecast in forecasts:
-                if (
-                    forecast.owner_id == opp["owner_id"]
-                    and forecast.period.start_date
-                    <= opp["close_date"]
-                    <= forecast.period.end_date
-                ):
-
-                    key = (opp["owner_id"], forecast.period_id)
-                    if key not in user_period_opportunities:
-                        user_period_opportunities[key] = []
-                    user_period_opportunities[key].append(opp)
-                    break
-
         # Calculate values for each forecast
         forecasts_to_update = []
         for forecast in forecasts:
-            key = (forecast.owner_id, forecast.period_id)
-            user_opportunities = user_period_opportunities.get(key, [])
-
-            values = self.calculate_values_from_opportunities(
-                user_opportunities, forecast_type
+            values = values_map.get(
+                (forecast.owner_id, forecast.period_id), self.empty_values()
             )
 
             # Update forecast fields based on type
@@ -229,6 +180,142 @@ class ForecastCalculator:
                 forecasts_to_update, fields_to_update, batch_size=1000
             )
 
+    def empty_values(self):
+        """Forecast values of an owner/period without opportunities"""
+        return {"pipeline": 0, "best_case": 0, "commit": 0, "closed": 0, "actual": 0}
+
+    def get_opportunities_query(self, owner_ids, forecast_type):
+        """Opportunities of the owners that count towards the forecast type"""
+        query = Q(owner_id__in=owner_ids)
+        conditions_query = self.get_cached_conditions_query(forecast_type)
+        if conditions_query:
+            query &= conditions_query
+        return query
+
+    def aggregate_forecast_values(self, owner_ids, period_ids, forecast_type):
+        """
+        Calculate forecast values for every owner/period pair in one grouped query
+
+        Each opportunity is matched to the period whose date range contains
+        its close date and the rows are grouped by (owner, period) with
+        conditional sums for pipeline, best case, commit, closed and actual.
+        Falls back to matching periods in Python where the database cannot
+        run the query.
+
+        Returns:
+            dict: {(owner_id, period_id): values}
+        """
+        owner_ids = list(owner_ids)
+        period_ids = list(period_ids)
+        if not owner_ids or not period_ids:
+            return {}
+
+        if getattr(settings, "HORILLA_FORECAST_DB_AGGREGATION", True):
+            try:
+                return self._aggregate_forecast_values_in_db(
+                    owner_ids, period_ids, forecast_type
+                )
+            except NotSupportedError as e:
+                logger.info("Aggregating forecasts in Python: %s", e)
+        return self._aggregate_forecast_values_in_python(
+            owner_ids, period_ids, forecast_type
+        )
+
+    def _aggregate_forecast_values_in_db(self, owner_ids, period_ids, forecast_type):
+        """Group opportunities by (owner, close date period) in the database"""
+        if forecast_type.is_quantity_based:
+
+            def total(query):
+                return Count("id", filter=query)
+
+        else:
+            field = (
+                "expected_revenue"
+                if forecast_type.is_revenue_expected_based
+                else "amount"
+            )
+
+            def total(query):
+                return Sum(field, filter=query)
+
+        included = {
+            "pipeline": forecast_type.include_pipeline,
+            "best_case": forecast_type.include_best_case,
+            "commit": forecast_type.include_commit,
+            "closed": forecast_type.include_closed,
+        }
+        aggregates = {
+            category: total(Q(forecast_category=category))
+            for category, include in included.items()
+            if include
+        }
+        aggregates["actual"] = total(Q(stage__stage_type="won"))
+
+        close_date_period = Period.objects.filter(
+            id__in=period_ids,
+            start_date__lte=OuterRef("close_date"),
+            end_date__gte=OuterRef("close_date"),
+        ).order_by("-start_date")
+
+        rows = (
+            Opportunity.objects.filter(
+                self.get_opportunities_query(owner_ids, forecast_type)
+            )
+            .annotate(close_date_period=Subquery(close_date_period.values("id")[:1]))
+            .filter(close_date_period__isnull=False)
+            .values("owner_id", "close_date_period")
+            .annotate(**aggregates)
+            .order_by()
+        )
+
+        values_map = {}
+        for row in rows:
+            values = self.empty_values()
+            for key in aggregates:
+                values[key] = row[key] or 0
+            values_map[(row["owner_id"], row["close_date_period"])] = values
+        return values_map
+
+    def _aggregate_forecast_values_in_python(
+        self, owner_ids, period_ids, forecast_type
+    ):
+        """Match opportunities to periods with an index of period start dates"""
+        periods = list(
+            Period.objects.filter(id__in=period_ids)
+            .order_by("start_date")
+            .values_list("start_date", "end_date", "id")
+        )
+        if not periods:
+            return {}
+        starts = [start_date for start_date, _end_date, _id in periods]
+
+        opportunities = Opportunity.objects.filter(
+            self.get_opportunities_query(owner_ids, forecast_type),
+            close_date__range=[starts[0], max(end for _s, end, _id in periods)],
+        ).values(
+            "id",
+            "owner_id",
+            "close_date",
+            "amount",
+            "expected_revenue",
+            "forecast_category",
+            "stage__stage_type",
+        )
+
+        grouped = {}
+        for opp in opportunities:
+            # Latest period starting on or before the close date
+            index = bisect_right(starts, opp["close_date"]) - 1
+            if index < 0 or periods[index][1] < opp["close_date"]:
+                continue
+            key = (opp["owner_id"], periods[index][2])
+            grouped.setdefault(key, []).append(opp)
+
+        return {
+            key: self.calculate_values_from_opportunities(opps, forecast_type)
+            for key, opps in grouped.items()
+        }
+
     def get_cached_conditions_query(self, forecast_type):
         """
         Cache conditions query to avoid rebuilding for each forecast
@@ -668,17 +755,161 @@ class ForecastCalculator:
         else:
             return target.target_amount if target else 0
 
-    def bulk_generate_forecasts(self, users=None, periods=None):
-        """Bulk generate forecasts for multiple users and periods"""
+    def bulk_generate_forecasts(
+        self, users=None, periods=None, forecast_types=None, progress=None
+    ):
+        """
+        Create or update forecasts for users x forecast types x periods in batches
+
+        Targets are loaded in one query, opportunities are aggregated once per
+        forecast type and forecasts are written with bulk_create/bulk_update,
+        giving the same values as create_or_update_period_forecast.
+
+        Args:
+            users: Users to forecast; defaults to all active users
+            periods: Periods to forecast; defaults to the fiscal year's periods
+            forecast_types: Defaults to all active forecast types
+            progress: Optional callable ``progress(done, total, label)`` called
+                after each forecast type is written
+
+        Returns:
+            dict: ``{"forecasts", "created", "updated", "seconds", "rows_per_second"}``
+        """
+        started = time.monotonic()
         if not users:
             users = User.objects.filter(is_active=True)
 
         if not periods:
             periods = Period.objects.filter(quarter__fiscal_year=self.fiscal_year)
 
-        forecast_types = ForecastType.objects.filter(is_active=True)
+        if forecast_types is None:
+            forecast_types = ForecastType.objects.filter(is_active=True)
+
+        users = list(users)
+        forecast_types = list(forecast_types)
+        periods = list(
+            Period.all_objects.filter(pk__in=[period.pk for period in periods])
+            .select_related("quarter")
+            .order_by("period_number")
+        )
+        user_ids = [user.pk for user in users]
+        period_ids = [period.pk for period in periods]
+        total = len(users) * len(periods) * len(forecast_types)
+        summary = {"forecasts": 0, "created": 0, "updated": 0}
+
+        # Latest active target per user and period, as get_target_for_period
+        targets = {}
+        for target in ForecastTarget.objects.filter(
+            assigned_to_id__in=user_ids, period_id__in=period_ids, is_active=True
+        ):
+            targets.setdefault((target.assigned_to_id, target.period_id), target)
+
+        # Existing forecasts by the fields create_or_update_period_forecast looks up
+        existing = {}
+        for forecast in Forecast.objects.filter(
+            owner_id__in=user_ids,
+            period_id__in=period_ids,
+            forecast_type__in=forecast_types,
+        ):
+            key = (
+                forecast.company_id,
+                forecast.owner_id,
+                forecast.forecast_type_id,
+                forecast.period_id,
+                forecast.quarter_id,
+                forecast.fiscal_year_id,
+            )
+            existing.setdefault(key, []).append(forecast)
 
-        for user in users:
-            for forecast_type in forecast_types:
+        for forecast_type in forecast_types:
+            values_map = self.aggregate_forecast_values(
+                user_ids, period_ids, forecast_type
+            )
+            if forecast_type.is_quantity_based:
+                value_fields = {
+                    "pipeline": "pipeline_quantity",
+                    "best_case": "best_case_quantity",
+                    "commit": "commit_quantity",
+                    "closed": "closed_quantity",
+                    "actual": "actual_quantity",
+                }
+            else:
+                value_fields = {
+                    "pipeline": "pipeline_amount",
+                    "best_case": "best_case_amount",
+                    "commit": "commit_amount",
+                    "closed": "closed_amount",
+                    "actual": "actual_amount",
+                }
+
+            now = timezone.now()
+            forecasts_to_create = []
+            forecasts_to_update = []
+            for user in users:
                 for period in periods:
-                    self.create_or_update_period_forecast(user, forecast_type, period)
+                    target = targets.get((user.pk, period.pk))
+                    target_amount = target.target_amount if target else 0
+                    target_quantity = (
+                        getattr(target, "quantity_target", 0) if target else 0
+                    )
+                    forecasts = existing.get(
+                        (
+                            user.company_id,
+                            user.pk,
+                            forecast_type.pk,
+                            period.pk,
+                            period.quarter_id,
+                            period.quarter.fiscal_year_id,
+                        )
+                    )
+                    if forecasts:
+                        forecasts_to_update.extend(forecasts)
+                    else:
+                        forecasts = [
+                            Forecast(
+                                company_id=user.company_id,
+                                owner=user,
+                                forecast_type=forecast_type,
+                                period=period,
+                                quarter=period.quarter,
+                                fiscal_year_id=period.quarter.fiscal_year_id,
+                                name=f"{forecast_type.name} - {period.name}",
+                                target_amount=target_amount,
+                                target_quantity=target_quantity,
+                            )
+                        ]
+                        forecasts_to_create.extend(forecasts)
+
+                    values = values_map.get((user.pk, period.pk), self.empty_values())
+                    for forecast in forecasts:
+                        for key, field in value_fields.items():
+                            setattr(forecast, field, values[key])
+                        if forecast_type.is_quantity_based:
+                            if not forecast.target_quantity:
+                                forecast.target_quantity = target_quantity
+                        elif not forecast.target_amount:
+                            forecast.target_amount = target_amount
+                        forecast.updated_at = now
+
+            with transaction.atomic():
+                Forecast.objects.bulk_create(forecasts_to_create, batch_size=1000)
+                Forecast.objects.bulk_update(
+                    forecasts_to_update,
+                    list(value_fields.values())
+                    + ["target_amount", "target_quantity", "updated_at"],
+                    batch_size=1000,
+                )
+
+            summary["created"] += len(forecasts_to_create)
+            summary["updated"] += len(forecasts_to_update)
+            summary["forecasts"] = summary["created"] + summary["updated"]
+            if progress:
+                progress(summary["forecasts"], total, forecast_type.name)
+
+        summary["seconds"] = round(time.monotonic() - started, 3)
+        summary["rows_per_second"] = (
+            round(summary["forecasts"] / summary["seconds"], 1)
+            if summary["seconds"]
+            else summary["forecasts"]
+        )
+        return summary
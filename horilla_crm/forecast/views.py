@@ -24,6 +24,7 @@ from horilla.auth.models import User
 from horilla.exceptions import HorillaHttp404
 from horilla_core.decorators import htmx_required, permission_required_or_denied
 from horilla_core.models import Company, FiscalYearInstance, Period
+from horilla_crm.forecast.facts import get_fact_values
 from horilla_crm.forecast.models import Forecast, ForecastTarget, ForecastType
 from horilla_crm.forecast.utils import ForecastCalculator
 from horilla_crm.opportunities.models import Opportunity
@@ -528,8 +529,14 @@ class ForecastTypeView(TemplateView):
                 owner__is_active=True
             ).prefetch_related("owner")
 
+        # Pipeline, best case, commit, closed and actual come from the fact table
+        fact_values = get_fact_values(
+            forecast_type, [period.id for period in periods_list], user_id
+        )
+
         forecasts_by_period = {}
         for forecast in forecast_queryset:
+            self.apply_fact_values(forecast, forecast_type, fact_values)
             period_id = forecast.period_id
             if period_id not in forecasts_by_period:
                 forecasts_by_period[period_id] = []
@@ -537,11 +544,19 @@ class ForecastTypeView(TemplateView):
 
         # Get trend data - this is crucial for single users
         trend_data = (
-            self.get_bulk_trend_data(periods_list, forecast_type, user_id)
+            self.get_bulk_trend_data(
+                periods_list, forecast_type, user_id, fact_values=fact_values
+            )
             if periods_list
             else {}
         )
 
+        all_active_users = (
+            []
+            if user_id
+            else list(User.objects.select_related("role").filter(is_active=True))
+        )
+
         period_forecasts = []
         for period in periods_list:
             user_forecasts = forecasts_by_period.get(period.id, [])
@@ -637,21 +652,16 @@ class ForecastTypeView(TemplateView):
             else:
                 users_with_data = []
                 users_without_data = []
-                all_active_users = User.objects.select_related("role").filter(
-                    is_active=True
-                )
-                user_targets = self.get_target_for_period_bulk(
-                    [period], forecast_type, None
-                )
                 user_target_map = {
                     target.assigned_to_id: target
-                    for target in user_targets.get(period.id, [])
+                    for target in targets_data.get(period.id, [])
                 }
+                forecasts_by_owner = {}
+                for user_forecast in user_forecasts:
+                    forecasts_by_owner.setdefault(user_forecast.owner_id, user_forecast)
 
                 for user in all_active_users:
-                    user_forecast = next(
-                        (f for f in user_forecasts if f.owner_id == user.id), None
-                    )
+                    user_forecast = forecasts_by_owner.get(user.id)
                     user_specific_target = user_target_map.get(user.id)
 
                     if user_forecast:
@@ -800,6 +810,13 @@ class ForecastTypeView(TemplateView):
 
         return period_forecasts
 
+    def apply_fact_values(self, forecast, forecast_type, fact_values):
+        """Set the forecast's pipeline/best case/commit/closed/actual from facts"""
+        values = fact_values.get((forecast.owner_id, forecast.period_id), {})
+        suffix = "quantity" if forecast_type.is_quantity_based else "amount"
+        for key in ("pipeline", "best_case", "commit", "closed", "actual"):
+            setattr(forecast, f"{key}_{suffix}", values.get(key, 0))
+
     def create_empty_user_forecast_with_owner(
         self, period, forecast_type, user_id, currency_symbol, target=None
     ):
@@ -973,94 +990,44 @@ class ForecastTypeView(TemplateView):
             ),
         }
 
-    def get_bulk_trend_data(self, periods, forecast_type, user_id=None):
+    def get_bulk_trend_data(
+        self, periods, forecast_type, user_id=None, fact_values=None
+    ):
         """
         Properly handle both single user and multi-user individual trends
         """
         if len(periods) < 2:
             return {}
 
-        query_params = {
-            "forecast_type": forecast_type,
-            "fiscal_year": periods[0].quarter.fiscal_year,
-            "period__in": periods,
-        }
-        if user_id:
-            query_params["owner_id"] = user_id
-
-        all_forecasts = Forecast.objects.filter(**query_params).values(
-            "period_id",
-            "period__period_number",
-            "owner_id",
-            "commit_quantity" if forecast_type.is_quantity_based else "commit_amount",
-            (
-                "best_case_quantity"
-                if forecast_type.is_quantity_based
-                else "best_case_amount"
-            ),
-            (
-                "pipeline_quantity"
-                if forecast_type.is_quantity_based
-                else "pipeline_amount"
-            ),
-            "closed_quantity" if forecast_type.is_quantity_based else "closed_amount",
-        )
-
-        field_suffix = "quantity" if forecast_type.is_quantity_based else "amount"
+        if fact_values is None:
+            fact_values = get_fact_values(
+                forecast_type, [period.id for period in periods], user_id
+            )
+        period_numbers = {period.id: period.period_number for period in periods}
 
         period_data = {}
         user_period_data = {}
 
-        for forecast in all_forecasts:
-            period_id = forecast["period_id"]
-            owner_id = forecast["owner_id"]
-
+        for (owner_id, period_id), values in fact_values.items():
             if period_id not in period_data:
                 period_data[period_id] = {
-                    "period_number": forecast["period__period_number"],
+                    "period_number": period_numbers.get(period_id),
                     "commit": 0,
                     "best_case": 0,
                     "pipeline": 0,
                     "closed": 0,
                 }
 
-            period_data[period_id]["commit"] += (
-                forecast.get(f"commit_{field_suffix}", 0) or 0
-            )
-            period_data[period_id]["best_case"] += (
-                forecast.get(f"best_case_{field_suffix}", 0) or 0
-            )
-            period_data[period_id]["pipeline"] += (
-                forecast.get(f"pipeline_{field_suffix}", 0) or 0
-            )
-            period_data[period_id]["closed"] += (
-                forecast.get(f"closed_{field_suffix}", 0) or 0
-            )
+            for key in ("commit", "best_case", "pipeline", "closed"):
+                period_data[period_id][key] += values[key]
 
-            if owner_id not in user_period_data:
-                user_period_data[owner_id] = {}
-
-            if period_id not in user_period_data[owner_id]:
-                user_period_data[owner_id][period_id] = {
-                    "period_number": forecast["period__period_number"],
-                    "commit": 0,
-                    "best_case": 0,
-                    "pipeline": 0,
-                    "closed": 0,
-                }
-
-            user_period_data[owner_id][period_id]["commit"] = (
-                forecast.get(f"commit_{field_suffix}", 0) or 0
-            )
-            user_period_data[owner_id][period_id]["best_case"] = (
-                forecast.get(f"best_case_{field_suffix}", 0) or 0
-            )
-            user_period_data[owner_id][period_id]["pipeline"] = (
-                forecast.get(f"pipeline_{field_suffix}", 0) or 0
-            )
-            user_period_data[owner_id][period_id]["closed"] = (
-                forecast.get(f"closed_{field_suffix}", 0) or 0
-            )
+            user_period_data.setdefault(owner_id, {})[period_id] = {
+                "period_number": period_numbers.get(period_id),
+                "commit": values["commit"],
+                "best_case": values["best_case"],
+                "pipeline": values["pipeline"],
+                "closed": values["closed"],
+            }
 
         # Calculate trends
         trend_results = {}
@@ -1123,6 +1090,7 @@ class ForecastTypeView(TemplateView):
                 ),
                 "user_data": user_period_data,
                 "previous_period_id": previous_period.id,
+                "previous_period": previous_period,
             }
 
         return trend_results
@@ -1207,7 +1175,9 @@ class ForecastTypeView(TemplateView):
                 )
 
                 try:
-                    previous_period = Period.objects.get(id=previous_period_id)
+                    previous_period = period_trend_data.get(
+                        "previous_period"
+                    ) or Period.objects.get(id=previous_period_id)
                     forecast.commit_change_text = self.format_change_text(
                         current_user_data["commit"],
                         previous_user_data["commit"],
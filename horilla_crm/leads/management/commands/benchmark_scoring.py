@@ -0,0 +1,104 @@
+"""
+Management command to benchmark lead/opportunity/account/contact scoring
+
+Scores the same records with the interpreted rules (the model methods,
+querying criteria and conditions per record) and with the compiled scoring
+program, then saves them in a rolled-back transaction the way an import or
+bulk edit does, and reports time and queries for each.
+
+Usage:
+python manage.py benchmark_scoring lead
+python manage.py benchmark_scoring opportunity --rows=5000
+"""
+
+# Standard library imports
+import time
+
+# Third-party imports (Django)
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+# First-party / Horilla imports
+from horilla_crm.leads.models import ScoringRule
+from horilla_crm.leads.scoring_program import bump_scoring_version
+from horilla_crm.leads.signals import get_models_for_module
+from horilla_crm.leads.utils import compute_score
+
+
+def interpreted_score(instance):
+    """Score ``instance`` by querying and evaluating the rules directly."""
+    score = 0
+    module = instance._meta.model_name
+    for rule in ScoringRule.objects.filter(module=module, is_active=True):
+        for criterion in rule.criteria.all().order_by("order"):
+            if criterion.evaluate_conditions(instance):
+                points = criterion.points
+                score += -points if criterion.operation_type == "sub" else points
+    return score
+
+
+class Command(BaseCommand):
+    help = "Benchmark interpreted and compiled scoring, and saving scored records"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "module", choices=["lead", "opportunity", "account", "contact"]
+        )
+        parser.add_argument(
+            "--rows", type=int, default=1000, help="Number of records to use"
+        )
+
+    def measure(self, label, rows, func):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        rate = rows / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{label:<20} {rows} rows in {elapsed:.3f}s ({rate:,.0f} rows/s), "
+            f"{len(queries)} queries ({len(queries) / rows:.2f} per row)"
+        )
+
+    def handle(self, *args, **options):
+        models = get_models_for_module(options["module"])
+        if not models:
+            raise CommandError(f"No scored model found for {options['module']}")
+        model = models[0]
+        instances = list(model.objects.all()[: options["rows"]])
+        if not instances:
+            raise CommandError(f"No {model._meta.verbose_name} records to score")
+        rows = len(instances)
+
+        with transaction.atomic():
+            self.measure(
+                "Interpreted rules",
+                rows,
+                lambda: [interpreted_score(instance) for instance in instances],
+            )
+            bump_scoring_version()
+            self.measure(
+                "Compiled program",
+                rows,
+                lambda: [compute_score(instance) for instance in instances],
+            )
+            self.measure(
+                "Bulk save",
+                rows,
+                lambda: [instance.save() for instance in instances],
+            )
+            transaction.set_rollback(True)
+
+        mismatched = sum(
+            interpreted_score(instance) != compute_score(instance)
+            for instance in instances
+        )
+        if mismatched:
+            self.stdout.write(
+                self.style.WARNING(f"{mismatched} records scored differently")
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Benchmark finished on {connection.vendor}; no changes were kept"
+            )
+        )
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0007_remove_lead_email_message_id_lead_message_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RescoringRequest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(max_length=100, unique=True, verbose_name="Key"),
+                ),
+                (
+                    "requested",
+                    models.PositiveBigIntegerField(default=0, verbose_name="Requested"),
+                ),
+                (
+                    "covered",
+                    models.PositiveBigIntegerField(default=0, verbose_name="Covered"),
+                ),
+                (
+                    "running_since",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Running Since"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Rescoring Request",
+                "verbose_name_plural": "Rescoring Requests",
+            },
+        ),
+    ]
@@ -13,6 +13,8 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import EmailValidator
 from django.db import models, transaction
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat
 from django.db.models.signals import post_delete, pre_save
 from django.dispatch import receiver
 from django.urls import reverse_lazy
@@ -287,6 +289,8 @@ class Lead(HorillaCoreModel):
 
     OWNER_FIELDS = ["lead_owner"]
     CURRENCY_FIELDS = ["annual_revenue"]
+    TYPEAHEAD_FIELDS = ["title", "first_name", "last_name", "email"]
+    TYPEAHEAD_LABEL = Concat("title", Value("-"), Cast("pk", CharField()))
 
     class Meta:
         """Meta class for Lead model"""
@@ -717,3 +721,33 @@ class EmailActivityScoring(HorillaCoreModel):
 
     def __str__(self):
         return f"{self.activity_type} - {self.points} points"
+
+
+@permission_exempt_model
+class RescoringRequest(models.Model):
+    """
+    Rescoring bookkeeping of one module for one company (or all companies).
+
+    ``requested`` is incremented whenever a scoring rule change commits and
+    a rescoring run records the value it covers in ``covered``. The row is
+    locked to start a run and ``running_since`` marks the run in progress,
+    so requests that arrive meanwhile are folded into a follow-up run of the
+    same worker and runs of one module never overlap (see
+    ``horilla_crm.leads.signals.run_module_rescoring``).
+    """
+
+    key = models.CharField(max_length=100, unique=True, verbose_name=_("Key"))
+    requested = models.PositiveBigIntegerField(default=0, verbose_name=_("Requested"))
+    covered = models.PositiveBigIntegerField(default=0, verbose_name=_("Covered"))
+    running_since = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("Running Since")
+    )
+
+    class Meta:
+        """Meta options for RescoringRequest model."""
+
+        verbose_name = _("Rescoring Request")
+        verbose_name_plural = _("Rescoring Requests")
+
+    def __str__(self):
+        return self.key
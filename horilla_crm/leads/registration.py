@@ -3,6 +3,7 @@ Feature registration for Leads app.
 """
 
 from horilla.registry.feature import register_model_for_feature
+from horilla.registry.money_registry import register_money_fields
 
 register_model_for_feature(
     app_label="leads",
@@ -11,3 +12,5 @@ register_model_for_feature(
 )
 
 register_model_for_feature(app_label="leads", model_name="Lead", all=True)
+
+register_money_fields(app_label="leads", model_name="Lead")
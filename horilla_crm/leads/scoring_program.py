@@ -0,0 +1,203 @@
+"""
+Compiled scoring programs for lead, opportunity, account and contact scores.
+
+``compute_score`` runs on every save of a scored record. Instead of
+querying the module's active rules, their criteria and conditions each
+time, the rules are compiled once into a program of plain tuples::
+
+    ((points, ((logical_operator, field, predicate, condition_id), ...)), ...)
+
+where ``points`` is already negated for "sub" criteria and ``predicate``
+tests the field's string value. Programs are compiled per module and
+active company, kept per process and retired through a version token in
+the shared cache whenever a rule, criterion or condition changes (see
+``horilla_crm.leads.signals``). Programs are recompiled after
+``HORILLA_PROCESS_CACHE_TIMEOUT`` seconds as well, so a process that cannot
+see the token (per-process cache backend) picks up rule changes (see
+``horilla.utils.process_cache``). Running a program only reads the instance.
+"""
+
+# Standard library imports
+import logging
+import time
+import uuid
+
+# Third-party imports (Django)
+from django.core.cache import cache
+
+# First-party / Horilla imports
+from horilla.utils.process_cache import local_timeout
+from horilla_crm.leads.models import ScoringCondition, ScoringCriterion
+from horilla_utils.middlewares import _thread_local
+
+logger = logging.getLogger(__name__)
+
+SCORING_VERSION_KEY = "leads:scoring_program:version"
+
+_programs = {"version": None, "loaded_at": 0.0, "entries": {}}
+
+
+def scoring_version():
+    """Return the current scoring program version token."""
+    version = cache.get(SCORING_VERSION_KEY)
+    if version is None:
+        cache.add(SCORING_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(SCORING_VERSION_KEY)
+    return version
+
+
+def bump_scoring_version():
+    """Retire every compiled scoring program."""
+    cache.set(SCORING_VERSION_KEY, uuid.uuid4().hex, None)
+    _programs.update(version=None, entries={})
+
+
+def _never(value):
+    return False
+
+
+def _numeric(value, compare):
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return _never
+
+    def predicate(field_value):
+        try:
+            return compare(float(field_value), number)
+        except (ValueError, TypeError):
+            return False
+
+    return predicate
+
+
+def compile_predicate(operator, value):
+    """
+    Return a function of the field's string value implementing
+    ``ScoringCondition.evaluate`` for ``operator`` and ``value``.
+    """
+    lowered = value.lower()
+    if operator == "equals":
+        return lambda field_value: field_value == value
+    if operator == "not_equals":
+        return lambda field_value: field_value != value
+    if operator == "contains":
+        return lambda field_value: lowered in field_value.lower()
+    if operator == "not_contains":
+        return lambda field_value: lowered not in field_value.lower()
+    if operator == "starts_with":
+        return lambda field_value: field_value.lower().startswith(lowered)
+    if operator == "ends_with":
+        return lambda field_value: field_value.lower().endswith(lowered)
+    if operator == "greater_than":
+        return _numeric(value, lambda a, b: a > b)
+    if operator == "greater_than_equal":
+        return _numeric(value, lambda a, b: a >= b)
+    if operator == "less_than":
+        return _numeric(value, lambda a, b: a < b)
+    if operator == "less_than_equal":
+        return _numeric(value, lambda a, b: a <= b)
+    if operator == "is_empty":
+        return lambda field_value: not field_value or field_value.strip() == ""
+    if operator == "is_not_empty":
+        return lambda field_value: bool(field_value and field_value.strip())
+    return _never
+
+
+def compile_program(module, company_id=None):
+    """
+    Compile the active rules of ``module`` into a scoring program.
+
+    With ``company_id`` only that company's rules, criteria and conditions
+    are used, as the company-filtered managers do for an active company.
+    """
+    scope = {"company_id": company_id} if company_id else {}
+    criteria = ScoringCriterion.all_objects.filter(
+        rule__module=module, rule__is_active=True, **scope
+    )
+    if company_id:
+        criteria = criteria.filter(rule__company_id=company_id)
+    criteria = list(
+        criteria.order_by("order", "id").values_list("pk", "points", "operation_type")
+    )
+
+    conditions = {}
+    rows = (
+        ScoringCondition.all_objects.filter(
+            criterion_id__in=[pk for pk, _points, _operation in criteria], **scope
+        )
+        .order_by("order", "id")
+        .values_list(
+            "criterion_id", "logical_operator", "field", "operator", "value", "pk"
+        )
+    )
+    for criterion_id, logical_operator, field, operator, value, pk in rows:
+        conditions.setdefault(criterion_id, []).append(
+            (logical_operator, field, compile_predicate(operator, value), pk)
+        )
+
+    program = []
+    for pk, points, operation_type in criteria:
+        # A criterion without conditions never matches.
+        if pk in conditions:
+            program.append(
+                (
+                    -points if operation_type == "sub" else points,
+                    tuple(conditions[pk]),
+                )
+            )
+    return tuple(program)
+
+
+def _active_company_id():
+    request = getattr(_thread_local, "request", None)
+    company = getattr(request, "active_company", None) if request else None
+    return company.pk if company else None
+
+
+def get_program(module):
+    """Return the compiled program of ``module`` for the active company."""
+    version = scoring_version()
+    now = time.monotonic()
+    if (
+        _programs["version"] != version
+        or now - _programs["loaded_at"] > local_timeout()
+    ):
+        _programs.update(version=version, loaded_at=now, entries={})
+
+    key = (module, _active_company_id())
+    program = _programs["entries"].get(key)
+    if program is None:
+        program = compile_program(*key)
+        _programs["entries"][key] = program
+    return program
+
+
+def _condition_matches(instance, field, predicate, condition_id):
+    try:
+        field_value = getattr(instance, field, None)
+        return predicate("" if field_value is None else str(field_value))
+    except Exception as e:
+        logger.error("Error evaluating scoring condition %s: %s", condition_id, e)
+        return False
+
+
+def run_program(program, instance):
+    """Return the score of ``instance`` under ``program``."""
+    score = 0
+    for points, conditions in program:
+        result = None
+        for logical_operator, field, predicate, condition_id in conditions:
+            if result is None:
+                result = _condition_matches(instance, field, predicate, condition_id)
+            elif logical_operator == "and":
+                result = result and _condition_matches(
+                    instance, field, predicate, condition_id
+                )
+            else:
+                result = result or _condition_matches(
+                    instance, field, predicate, condition_id
+                )
+        if result:
+            score += points
+    return score
@@ -4,24 +4,30 @@ Handles automatic updates when company-related events occur, e.g., currency chan
 """
 
 import logging
+import time
+from datetime import timedelta
 
 from django.apps import apps
+from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist
-from django.db import transaction
-from django.db.models import Case, F, IntegerField, Q, When
-from django.db.models.signals import post_save, pre_delete
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import Signal, receiver
 from django.http import HttpResponse
 from django.urls import reverse_lazy
+from django.utils import timezone
 
 from horilla.auth.models import User
-from horilla_core.signals import company_created, company_currency_changed
+from horilla.utils.commit_batch import CommitBatch
+from horilla_core.signals import company_created
 from horilla_crm.leads.models import (
-    Lead,
+    RescoringRequest,
     ScoringCondition,
     ScoringCriterion,
     ScoringRule,
 )
+from horilla_crm.leads.scoring_program import bump_scoring_version
 from horilla_keys.models import ShortcutKey
 
 logger = logging.getLogger(__name__)
@@ -57,30 +63,6 @@ def handle_company_created(sender, instance, request, view, is_new, **kwargs):
     return None
 
 
-@receiver(company_currency_changed)
-def update_crm_on_currency_change(sender, **kwargs):
-    """
-    Updates Lead amounts when a company's currency changes.
-    """
-    company = kwargs.get("company")
-    conversion_rate = kwargs.get("conversion_rate")
-
-    leads_to_update = []
-    leads = (
-        Lead.objects.filter(company=company)
-        .select_related()
-        .only("id", "annual_revenue")
-    )
-
-    for lead in leads:
-        if lead.annual_revenue is not None:
-            lead.annual_revenue = lead.annual_revenue * conversion_rate
-            leads_to_update.append(lead)
-
-    if leads_to_update:
-        Lead.objects.bulk_update(leads_to_update, ["annual_revenue"], batch_size=1000)
-
-
 @receiver(post_save, sender=User)
 def create_leads_shortcuts(sender, instance, created, **kwargs):
     predefined = [
@@ -199,64 +181,202 @@ def build_query_from_conditions(criterion, Model):
     return query
 
 
-def update_all_scores_for_module(module):
+def build_score_expression(module, Model, company_id=None):
     """
-    Update score fields for instances matching active scoring rules' conditions
-    using direct database UPDATE queries.
+    Build the score of ``Model`` instances under the active rules of
+    ``module`` as one expression: the sum of
+    ``CASE WHEN <criterion conditions> THEN ±points ELSE 0 END`` over every
+    criterion, in rule and criterion order.
+    """
+    criteria = ScoringCriterion.all_objects.filter(
+        rule__module=module, rule__is_active=True
+    ).select_related("rule")
+    if company_id:
+        criteria = criteria.filter(rule__company_id=company_id)
+
+    expression = Value(0)
+    for criterion in criteria.order_by("rule_id", "order", "id"):
+        query = build_query_from_conditions(criterion, Model)
+        if not query:
+            continue
+        points = criterion.points
+        if criterion.operation_type == "sub":
+            points = -points
+        expression += Case(
+            When(query, then=Value(points)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    return expression
+
+
+def update_all_scores_for_module(module, company_id=None, progress=None):
+    """
+    Recompute score fields of the module's records from its active scoring
+    rules, one ``UPDATE ... SET score = <sum of cases>`` per chunk of rows.
 
     Args:
         module: String (e.g., 'lead', 'opportunity') indicating the module.
+        company_id: Only rescore this company's records with its rules
+        progress: Optional callable ``progress(done, total, label)`` called
+            after each chunk
+
+    Returns:
+        dict: ``{"module", "rows", "chunks", "seconds"}``
     """
-    models = get_models_for_module(module)
-    for Model in models:
+    chunk_size = getattr(settings, "HORILLA_RESCORING_CHUNK_SIZE", 2000)
+    summary = {"module": module, "rows": 0, "chunks": 0}
+    started = time.monotonic()
+
+    for Model in get_models_for_module(module):
         score_field = get_score_field(Model)
         if not score_field:
             continue
 
-        with transaction.atomic():
+        expression = build_score_expression(module, Model, company_id)
+        queryset = Model._base_manager.order_by("pk")
+        if company_id:
+            queryset = queryset.filter(company_id=company_id)
+        total = queryset.count()
+        label = Model._meta.model_name
+        done = 0
+        last_pk = None
+
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            pks = list(chunk.values_list("pk", flat=True)[:chunk_size])
+            if not pks:
+                break
             try:
-                Model.objects.update(**{score_field: 0})
-                logger.info(
-                    f"Reset {score_field} to 0 for all {Model._meta.model_name} instances"
+                Model._base_manager.filter(pk__in=pks).update(
+                    **{score_field: expression}
                 )
             except Exception as e:
                 logger.error(
-                    f"Error resetting {score_field} for {Model._meta.model_name}: {e}"
+                    f"Error updating {score_field} for {Model._meta.model_name}: {e}"
                 )
                 raise
+            last_pk = pks[-1]
+            done += len(pks)
+            summary["chunks"] += 1
+            if progress:
+                progress(done, total, label)
+
+        summary["rows"] += done
+        logger.info(f"Rescored {score_field} for {done} {label} instances")
+
+    summary["seconds"] = round(time.monotonic() - started, 3)
+    return summary
+
+
+def rescoring_key(module, company_id):
+    """Return the ``RescoringRequest`` key of ``module`` for ``company_id``."""
+    return f"{module}:{company_id or 'all'}"
+
+
+def run_module_rescoring(module, company_id=None, progress=None):
+    """
+    Rescore ``module`` until every committed request is covered.
+
+    The module's ``RescoringRequest`` row is locked to start a run. When a
+    run is already in progress (started less than
+    ``HORILLA_RESCORING_LOCK_TIMEOUT`` seconds ago) or every request is
+    covered, nothing is done: the running worker checks for new requests
+    before it releases the module.
+
+    Returns:
+        dict: Summary of the last run, or None when nothing was run
+    """
+    key = rescoring_key(module, company_id)
+    lock_timeout = getattr(settings, "HORILLA_RESCORING_LOCK_TIMEOUT", 3600)
+    summary = None
+    while True:
+        with transaction.atomic():
+            state = RescoringRequest.objects.select_for_update().filter(key=key).first()
+            if state is None:
+                return summary
+            now = timezone.now()
+            if summary is None and state.running_since:
+                if now - state.running_since < timedelta(seconds=lock_timeout):
+                    return None
+            if state.covered >= state.requested:
+                state.running_since = None
+                state.save(update_fields=["running_since"])
+                return summary
+            covering = state.requested
+            state.running_since = now
+            state.save(update_fields=["running_since"])
+
+        try:
+            summary = update_all_scores_for_module(module, company_id, progress)
+        except Exception:
+            RescoringRequest.objects.filter(key=key).update(running_since=None)
+            raise
+        RescoringRequest.objects.filter(key=key, covered__lt=covering).update(
+            covered=covering
+        )
+
+
+def request_module_rescoring(module, company_id=None):
+    """
+    Record a committed rescoring request for ``module`` and start a run.
+
+    With ``HORILLA_RESCORING_ASYNC`` (the default) the run is queued after
+    ``HORILLA_RESCORING_DEBOUNCE`` seconds, so changes committed meanwhile
+    are covered by it and the queued runs that follow have nothing left to
+    do; otherwise it runs right away.
+    """
+    key = rescoring_key(module, company_id)
+    RescoringRequest.objects.get_or_create(key=key)
+    RescoringRequest.objects.filter(key=key).update(requested=F("requested") + 1)
+
+    if getattr(settings, "HORILLA_RESCORING_ASYNC", True):
+        # Imported here: the task module imports these signal helpers.
+        from horilla_crm.leads.tasks import rescore_module
+
+        debounce = getattr(settings, "HORILLA_RESCORING_DEBOUNCE", 5)
+        try:
+            rescore_module.apply_async((module, company_id), countdown=debounce)
+            return
+        except Exception as e:
+            logger.warning(f"Could not queue rescoring of {module}: {e}")
+
+    run_module_rescoring(module, company_id)
+
 
-            rules = ScoringRule.objects.filter(module=module, is_active=True)
-            if not rules.exists():
-                continue
-
-            for rule in rules:
-                for criterion in rule.criteria.all().order_by("order"):
-                    query = build_query_from_conditions(criterion, Model)
-                    if not query:
-                        continue
-
-                    points = criterion.points
-                    if criterion.operation_type == "sub":
-                        points = -points
-
-                    try:
-                        Model.objects.filter(query).update(
-                            **{
-                                score_field: Case(
-                                    When(query, then=F(score_field) + points),
-                                    default=F(score_field),
-                                    output_field=IntegerField(),
-                                )
-                            }
-                        )
-                        logger.info(
-                            f"Updated {score_field} for {Model._meta.model_name} instances matching criterion {criterion.id}"
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Error updating {score_field} for {Model._meta.model_name} with criterion {criterion.id}: {e}"
-                        )
-                        raise
+def _request_pending(modules):
+    for module, company_id in modules:
+        try:
+            request_module_rescoring(module, company_id)
+        except Exception as e:
+            logger.error(f"Error requesting rescoring of {module}: {e}")
+
+
+_pending_rescoring = CommitBatch(_request_pending)
+
+
+def schedule_module_rescoring(module, company_id=None, using=DEFAULT_DB_ALIAS):
+    """
+    Rescore the module once the current transaction commits (right away in
+    autocommit mode), requesting each module and company once per
+    transaction however many rules, criteria and conditions it changed.
+    """
+    _pending_rescoring.add([(module, company_id)], using=using)
+
+
+@receiver(post_save, sender=ScoringRule)
+@receiver(post_delete, sender=ScoringRule)
+@receiver(post_save, sender=ScoringCriterion)
+@receiver(post_delete, sender=ScoringCriterion)
+@receiver(post_save, sender=ScoringCondition)
+@receiver(post_delete, sender=ScoringCondition)
+def retire_scoring_programs(sender, **kwargs):
+    """
+    Recompile scoring programs after a rule, criterion or condition change:
+    right away in this process and again for every process once committed.
+    """
+    bump_scoring_version()
+    transaction.on_commit(bump_scoring_version)
 
 
 @receiver(post_save, sender=ScoringRule)
@@ -264,9 +384,9 @@ def update_all_scores_for_module(module):
 def handle_rule_change(sender, instance, **kwargs):
     """
     Signal handler triggered when a scoring rule is created, updated, or deleted.
-    Automatically triggers recalculation of all scores for the associated module.
+    Schedules a recalculation of all scores for the associated module.
     """
-    update_all_scores_for_module(instance.module)
+    schedule_module_rescoring(instance.module, instance.company_id)
 
 
 @receiver(post_save, sender=ScoringCriterion)
@@ -274,9 +394,9 @@ def handle_rule_change(sender, instance, **kwargs):
 def handle_criterion_change(sender, instance, **kwargs):
     """
     Signal handler triggered when a scoring criterion is created, updated, or deleted.
-    Ensures scores are recalculated for all modules affected by this criterion.
+    Schedules a recalculation of scores for all modules affected by this criterion.
     """
-    update_all_scores_for_module(instance.rule.module)
+    schedule_module_rescoring(instance.rule.module, instance.rule.company_id)
 
 
 @receiver(post_save, sender=ScoringCondition)
@@ -284,6 +404,7 @@ def handle_criterion_change(sender, instance, **kwargs):
 def handle_condition_change(sender, instance, **kwargs):
     """
     Signal handler triggered when a scoring condition is created, updated, or deleted.
-    Rebuilds and applies scoring rules to update scores for affected module instances.
+    Schedules a rescoring of the affected module once the change commits.
     """
-    update_all_scores_for_module(instance.criterion.rule.module)
+    rule = instance.criterion.rule
+    schedule_module_rescoring(rule.module, rule.company_id)
@@ -64,6 +64,38 @@ def fetch_emails_to_leads():
     }
 
 
+@shared_task(bind=True)
+def rescore_module(self, module, company_id=None):
+    """
+    Recompute the scores of a module's records after scoring rule changes.
+
+    Runs of one module and company are serialized and deduplicated through
+    its ``RescoringRequest`` row, so a queued run whose requests were
+    already covered returns None. Progress is published as the
+    ``PROGRESS`` state with ``done``/``total`` rows of the model being
+    rescored; the result is the run summary.
+    """
+    from .signals import run_module_rescoring
+
+    def progress(done, total, label):
+        self.update_state(
+            state="PROGRESS",
+            meta={"done": done, "total": total, "current": label},
+        )
+
+    summary = run_module_rescoring(module, company_id, progress)
+    if summary is None:
+        return None
+    logger.info(
+        "Rescored %s %s records in %s chunks in %ss",
+        summary["rows"],
+        module,
+        summary["chunks"],
+        summary["seconds"],
+    )
+    return summary
+
+
 def fetch_from_imap(config):
     """Fetch emails using IMAP for standard mail configurations."""
     imap_conf = {
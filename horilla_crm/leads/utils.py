@@ -1,4 +1,4 @@
-from horilla_crm.leads.models import ScoringRule
+from horilla_crm.leads.scoring_program import get_program, run_program
 
 
 def compute_score(instance):
@@ -13,21 +13,11 @@ def compute_score(instance):
         int: The computed score (sum of points from matching criteria).
 
     Logic:
-        - Filters active rules for the instance's module (e.g., 'lead').
-        - For each rule, evaluates criteria in order.
+        - Takes the compiled program of active rules for the instance's module
+          (e.g., 'lead'), compiled once and cached until a rule changes.
+        - For each criterion, evaluates its conditions in order.
         - If a criterion's conditions are met, adds/subtracts points based on operation_type.
         - Returns the total score.
     """
     module = instance._meta.model_name  # e.g., 'lead', 'opportunity'
-    rules = ScoringRule.objects.filter(module=module, is_active=True)
-    score = 0
-
-    for rule in rules:
-        for criterion in rule.criteria.all().order_by("order"):
-            if criterion.evaluate_conditions(instance):
-                points = criterion.points
-                if criterion.operation_type == "sub":
-                    points = -points
-                score += points
-
-    return score
+    return run_program(get_program(module), instance)
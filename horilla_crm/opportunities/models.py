@@ -385,6 +385,8 @@ class Opportunity(HorillaCoreModel):
 
     OWNER_FIELDS = ["owner"]
     CURRENCY_FIELDS = ["amount", "expected_revenue"]
+    TYPEAHEAD_FIELDS = ["name"]
+    TYPEAHEAD_LABEL = "name"
 
     class Meta:
         """Meta options for Opportunity model."""
@@ -3,6 +3,7 @@ Feature registration for Opportunities app.
 """
 
 from horilla.registry.feature import register_model_for_feature
+from horilla.registry.money_registry import register_money_fields
 
 register_model_for_feature(
     app_label="opportunities",
@@ -23,3 +24,5 @@ register_model_for_feature(
     model_name="OpportunitySplit",
     features=["report_choices"],
 )
+
+register_money_fields(app_label="opportunities", model_name="Opportunity")
@@ -8,14 +8,14 @@ from decimal import Decimal
 
 from django.apps import apps
 from django.db import models
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import Signal, receiver
 from django.http import HttpResponse
 from django.shortcuts import render
 from django.urls import reverse_lazy
 
 from horilla.auth.models import User
-from horilla_core.signals import company_currency_changed
+from horilla.utils.layout_context import bump_layout_version
 from horilla_crm.leads.signals import lead_stage_created
 from horilla_crm.opportunities.models import (
     Opportunity,
@@ -73,45 +73,6 @@ def handle_lead_stage_group_created(
     )
 
 
-@receiver(company_currency_changed)
-def update_crm_on_currency_change(sender, **kwargs):
-    """
-    Updates Opportunity amounts when a company's currency changes.
-    """
-    company = kwargs.get("company")
-    conversion_rate = kwargs.get("conversion_rate")
-
-    opportunities_to_update = []
-    opportunities = (
-        Opportunity.objects.filter(company=company)
-        .select_related()
-        .only("id", "amount", "expected_revenue")
-    )
-
-    for opportunity in opportunities:
-        needs_update = False
-
-        if opportunity.amount is not None:
-            opportunity.amount = opportunity.amount * conversion_rate
-            needs_update = True
-
-        if opportunity.expected_revenue is not None:
-            opportunity.expected_revenue = (
-                opportunity.expected_revenue * conversion_rate
-            )
-            needs_update = True
-
-        if needs_update:
-            opportunities_to_update.append(opportunity)
-
-    if opportunities_to_update:
-        Opportunity.objects.bulk_update(
-            opportunities_to_update,
-            ["amount", "expected_revenue"],
-            batch_size=1000,
-        )
-
-
 @receiver(post_save, sender=User)
 def create_opportunity_shortcuts(sender, instance, created, **kwargs):
     predefined = [
@@ -284,3 +245,10 @@ def create_opportunity_contact_role(sender, instance, created, **kwargs):
                 )
             except Contact.DoesNotExist:
                 print(f"Contact with id {contact_id} does not exist")
+
+
+@receiver(post_save, sender=OpportunitySettings)
+@receiver(post_delete, sender=OpportunitySettings)
+def retire_layout_context_on_settings_change(sender, **kwargs):
+    """Team selling and split settings decide which menus are shown."""
+    bump_layout_version()
@@ -0,0 +1,231 @@
+"""
+Page-level planning of row action permissions.
+
+List and kanban rows filter their actions through ``has_action_permission``,
+which repeats the same ``has_perm`` calls and owner lookups for every row
+and action. :class:`ActionPermissionPlanner` evaluates the model-level part
+of each action once per page and annotates row ownership on the queryset::
+
+    planner = ActionPermissionPlanner(user, Lead, [actions, col_attrs])
+    queryset = planner.annotate(queryset)   # adds ``is_owned`` columns
+    planner.allowed_actions(actions, row)   # dict lookups per row
+
+Ownership is one boolean per distinct ``owner_field`` set: ForeignKey and
+one-to-one fields are compared by column, matching the per-row
+``getattr(obj, field) == user`` check; many-to-many fields never own a row.
+Rows that were not annotated fall back to comparing ForeignKey IDs without
+loading the owner. Actions that need an intermediate model are
+left to the per-row check in the template tags.
+"""
+
+# Standard library
+import logging
+
+# Third-party
+from django.core.exceptions import FieldDoesNotExist
+from django.db import NotSupportedError
+from django.db.models import BooleanField, Case, Q, Value, When
+
+logger = logging.getLogger(__name__)
+
+ALLOW = "allow"
+DENY = "deny"
+OWNER = "owner"
+METHOD = "method"
+PER_ROW = "per_row"
+
+
+def _owner_fields(action):
+    owner_field = action.get("owner_field")
+    if not owner_field:
+        return ()
+    if isinstance(owner_field, (list, tuple)):
+        return tuple(owner_field)
+    return (owner_field,)
+
+
+def _iter_actions(value):
+    """Yield the action dicts found in nested lists and ``{name: attrs}`` maps."""
+    if isinstance(value, dict):
+        if any(key in value for key in ("permission", "own_permission", "owner_field")):
+            yield value
+        else:
+            for item in value.values():
+                yield from _iter_actions(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_actions(item)
+
+
+class ActionPermissionPlanner:
+    """Evaluates action permissions for one user and model once per page."""
+
+    annotation_prefix = "is_owned"
+
+    def __init__(self, user, model, actions=()):
+        self.user = user
+        self.model = model
+        self._plans = {}
+        self._annotations = {}
+        for action in _iter_actions(list(actions)):
+            fields = _owner_fields(action)
+            if action.get("own_permission") and fields:
+                self._annotation_name(fields)
+
+    def _annotation_name(self, fields):
+        if fields not in self._annotations:
+            index = len(self._annotations)
+            self._annotations[fields] = (
+                self.annotation_prefix
+                if not index
+                else f"{self.annotation_prefix}_{index}"
+            )
+        return self._annotations[fields]
+
+    def _ownership_condition(self, field_name):
+        """
+        Ownership is a foreign key or one-to-one field holding the user, as
+        in ``getattr(obj, field) == user``; other fields never match.
+        """
+        field = self.model._meta.get_field(field_name)
+        if field.many_to_one or (field.one_to_one and field.concrete):
+            return Q(**{field.attname: self.user.pk})
+        return None
+
+    def annotate(self, queryset):
+        """Add one ownership boolean per owner-field set to ``queryset``."""
+        annotations = {}
+        for fields, name in self._annotations.items():
+            if hasattr(self.model, name):
+                continue
+            try:
+                conditions = [self._ownership_condition(field) for field in fields]
+            except FieldDoesNotExist:
+                continue
+            conditions = [condition for condition in conditions if condition]
+            if not conditions:
+                annotations[name] = Value(False, output_field=BooleanField())
+                continue
+            annotations[name] = Case(
+                *[When(condition, then=Value(True)) for condition in conditions],
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        if (
+            not annotations
+            or not self.user.is_authenticated
+            or not hasattr(queryset, "annotate")
+        ):
+            return queryset
+        try:
+            return queryset.annotate(**annotations)
+        except (NotSupportedError, TypeError) as e:
+            logger.debug("Could not annotate ownership on %s: %s", self.model, e)
+            return queryset
+
+    def _compile(self, action):
+        """Reduce ``action`` to a page-wide decision or a per-row ownership test."""
+        user = self.user
+        perm = action.get("permission")
+        own_perm = action.get("own_permission")
+        owner_field = action.get("owner_field")
+        owner_method = action.get("owner_method")
+        perms = action.get("permissions", [])
+        perm_logic = action.get("permission_logic", "OR")
+
+        if not perm and not own_perm and not owner_field or user.is_superuser:
+            return ALLOW, None
+        if action.get("intermediate_model"):
+            return PER_ROW, None
+
+        if own_perm and not owner_field and not owner_method:
+            raise ValueError(
+                f"Action '{action.get('action')}' must define BOTH "
+                "'own_permission' and ('owner_field' OR 'owner_method')."
+            )
+        if owner_field and owner_method:
+            raise ValueError(
+                f"Action '{action.get('action')}' cannot define BOTH "
+                "'owner_field' AND 'owner_method'. Use only one."
+            )
+
+        if perm and user.has_perm(perm):
+            return ALLOW, None
+
+        if perms:
+            perm_checks = [user.has_perm(p) for p in perms]
+            if perm_logic.upper() == "OR":
+                if any(perm_checks):
+                    return ALLOW, None
+            elif perm_logic.upper() == "AND":
+                if all(perm_checks):
+                    return ALLOW, None
+            else:
+                raise ValueError(
+                    f"Invalid permission_logic '{perm_logic}'. Must be 'OR' or 'AND'."
+                )
+
+        if own_perm and user.has_perm(own_perm):
+            if owner_method:
+                return METHOD, owner_method
+            return OWNER, _owner_fields(action)
+        return DENY, None
+
+    def plan(self, action):
+        """Return the compiled ``(kind, argument)`` pair of ``action``."""
+        entry = self._plans.get(id(action))
+        # The action is stored with its plan so its id cannot be reused.
+        if entry is None or entry[0] is not action:
+            entry = (action, self._compile(action))
+            self._plans[id(action)] = entry
+        return entry[1]
+
+    def is_owned(self, obj, fields):
+        """Return True when the user is in one of ``fields`` of ``obj``."""
+        name = self._annotations.get(fields)
+        if name and name in obj.__dict__:
+            return bool(obj.__dict__[name])
+        for field_name in fields:
+            try:
+                field = obj._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                field = None
+            if field is not None and (field.many_to_many or field.one_to_many):
+                continue
+            if field is not None and field.concrete and field.is_relation:
+                if getattr(obj, field.attname, None) == self.user.pk:
+                    return True
+            elif getattr(obj, field_name, None) == self.user:
+                return True
+        return False
+
+    def allows(self, action, obj):
+        """
+        Return whether ``action`` is allowed on ``obj``, or None when the
+        action needs the full per-row check (intermediate models).
+        """
+        kind, argument = self.plan(action)
+        if kind == ALLOW:
+            return True
+        if kind == DENY:
+            return False
+        if kind == PER_ROW:
+            return None
+        if obj is None:
+            return False
+        if kind == METHOD:
+            if not hasattr(obj, argument):
+                raise ValueError(
+                    f"Object {obj.__class__.__name__} does not have method '{argument}'"
+                )
+            method = getattr(obj, argument)
+            return bool(callable(method) and method(self.user))
+        return self.is_owned(obj, argument)
+
+    def allowed_actions(self, actions, obj):
+        """Return the actions of ``actions`` allowed on ``obj``."""
+        return [action for action in actions if self.allows(action, obj)]
+
+    def grants_page_wide(self, actions):
+        """Return True when one of ``actions`` is allowed regardless of the row."""
+        return any(self.plan(action)[0] == ALLOW for action in actions)
@@ -28,6 +28,10 @@ class HorillaGenericsConfig(AppConfig):
                 ),
             )
             __import__("horilla_generics.signals")
+
+            from horilla_generics.typeahead import watch_typeahead_models
+
+            watch_typeahead_models()
         except Exception as e:
             import logging
 
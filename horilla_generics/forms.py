@@ -2866,6 +2866,20 @@ class HorillaHistoryForm(forms.Form):
             ]
         return history_by_date
 
+    def filter_queryset(self, queryset, date_field):
+        """Apply the selected date filter to a queryset on ``date_field``.
+
+        If the form is invalid or no date is selected, the queryset is returned
+        unchanged.
+        """
+        if not self.is_valid():
+            return queryset
+
+        filter_date = self.cleaned_data.get("filter_date")
+        if filter_date:
+            return queryset.filter(**{date_field: filter_date})
+        return queryset
+
 
 class RowFieldWidget(forms.MultiWidget):
     """Multi-widget for rendering multiple fields in a single row layout."""
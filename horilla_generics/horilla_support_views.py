@@ -19,9 +19,7 @@ from django.apps import apps
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.cache import cache
-from django.core.paginator import Paginator
 from django.db import IntegrityError, models
-from django.db.models import CharField, Q, TextField
 from django.db.models.fields import Field
 from django.http import HttpResponse, HttpResponseRedirect, JsonResponse, QueryDict
 from django.shortcuts import get_object_or_404, render
@@ -45,6 +43,7 @@ from horilla_core.utils import filter_hidden_fields
 from horilla_generics.views import HorillaKanbanView
 
 # Local imports
+from . import typeahead
 from .forms import ColumnSelectionForm, KanbanGroupByForm, SaveFilterListForm
 
 logger = logging.getLogger(__name__)
@@ -1436,7 +1435,7 @@ class HorillaSelect2DataView(LoginRequiredMixin, View):
             page = int(page)
         except ValueError:
             page = 1
-        per_page = 10
+        per_page = typeahead.TYPEAHEAD_PER_PAGE
 
         queryset = None
 
@@ -1497,49 +1496,23 @@ class HorillaSelect2DataView(LoginRequiredMixin, View):
                 id_list = [
                     int(id.strip()) for id in ids.split(",") if id.strip().isdigit()
                 ]
-                if id_list:
-                    queryset = queryset.filter(pk__in=id_list)
-                    results = [
-                        {
-                            "id": obj.pk,
-                            "text": str(obj) or f"Unnamed {model_name} {obj.pk}",
-                        }
-                        for obj in queryset
-                    ]
-                    return JsonResponse(
-                        {"results": results, "pagination": {"more": False}}
-                    )
-                # else:
-                return JsonResponse({"results": [], "pagination": {"more": False}})
+                results = typeahead.resolve_labels(queryset, id_list) if id_list else []
+                return JsonResponse({"results": results, "pagination": {"more": False}})
             except Exception:
                 return JsonResponse({"results": [], "pagination": {"more": False}})
 
-        if search_term:
-            search_fields = [
-                f.name
-                for f in model._meta.fields
-                if isinstance(f, (CharField, TextField)) and f.name != "id"
-            ]
-            if search_fields:
-                query = Q()
-                for field in search_fields:
-                    query |= Q(**{f"{field}__icontains": search_term})
-                queryset = queryset.filter(query)
-            else:
-                queryset = queryset.none()
-        else:
-            queryset = queryset.order_by("pk")
-
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        cursor = request.GET.get("cursor", "").strip()
+        cursor = int(cursor) if cursor.isdigit() and page > 1 else None
 
-        results = [
-            {"id": obj.pk, "text": str(obj) or f"Unnamed {model_name} {obj.pk}"}
-            for obj in page_obj.object_list
-        ]
+        results, more, next_cursor = typeahead.search(
+            queryset, search_term, cursor=cursor, page=page, per_page=per_page
+        )
 
         return JsonResponse(
-            {"results": results, "pagination": {"more": page_obj.has_next()}}
+            {
+                "results": results,
+                "pagination": {"more": more, "cursor": next_cursor},
+            }
         )
 
     def _get_filter_class_from_request(self, request, app_label, model_name):
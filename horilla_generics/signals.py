@@ -5,10 +5,11 @@ Defines signal receivers to keep caches and related state in sync.
 """
 
 from django.core.cache import cache
-from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
 from django.dispatch import receiver
 
 from horilla_core.models import ListColumnVisibility
+from horilla_generics.typeahead import ensure_typeahead_indexes
 
 # Define your horilla_generics signals here
 
@@ -20,3 +21,13 @@ def clear_cache_on_delete(sender, instance, **kwargs):
     """
     cache_key = f"visible_columns_{instance.user.id}_{instance.app_label}_{instance.model_name}_{instance.context}_{instance.url_name}"
     cache.delete(cache_key)
+
+
+@receiver(post_migrate)
+def create_typeahead_indexes(sender, using="default", **kwargs):
+    """
+    Create the select2 typeahead indexes once all apps have been migrated.
+    """
+    if sender.name != "horilla_generics":
+        return
+    ensure_typeahead_indexes(using=using)
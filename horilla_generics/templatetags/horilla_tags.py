@@ -29,7 +29,7 @@ from django.utils.translation import gettext_lazy as _
 from horilla.auth.models import User
 from horilla.menu.sub_section_menu import get_sub_section_menu
 from horilla.registry.asset_registry import get_registered_html, get_registered_js
-from horilla_core.models import MultipleCurrency
+from horilla_core.services.currency_service import get_currency_formatter
 from horilla_core.utils import get_currency_display_value
 from horilla_utils.middlewares import _thread_local
 
@@ -991,14 +991,7 @@ def format_currency(value, user):
     """
     Template filter for currency formatting
     """
-    if not value:
-        return ""
-
-    user_currency = MultipleCurrency.get_user_currency(user)
-    if user_currency:
-        return user_currency.display_with_symbol(value)
-
-    return str(value)
+    return get_currency_formatter(user).format(value)
 
 
 @register.filter
@@ -1291,6 +1284,14 @@ def has_action_permission(action, context):
     return False
 
 
+def _action_planner(context, user):
+    """Return the view's action planner when it was built for ``user``."""
+    planner = context.get("action_planner")
+    if planner is not None and planner.user == user:
+        return planner
+    return None
+
+
 @register.simple_tag(takes_context=True)
 def filter_actions_by_permission(context, actions, data):
     """
@@ -1311,9 +1312,17 @@ def filter_actions_by_permission(context, actions, data):
     if not user:
         return []
 
+    planner = _action_planner(context, user)
     filtered_actions = []
 
     for action in actions:
+        if planner is not None:
+            allowed = planner.allows(action, data)
+            if allowed is not None:
+                if allowed:
+                    filtered_actions.append(action)
+                continue
+
         action_context = {
             "user": user,
             "object": data,
@@ -1358,6 +1367,10 @@ def has_any_actions_for_queryset(context, actions, queryset):
     if not actions:
         return False
 
+    planner = _action_planner(context, user)
+    if planner is not None and planner.grants_page_wide(actions):
+        return True
+
     for action in actions:
         perm = action.get("permission")
         if perm and user.has_perm(perm):
@@ -1370,6 +1383,13 @@ def has_any_actions_for_queryset(context, actions, queryset):
         action_context = {"user": user, "object": obj}
 
         for action in actions:
+            if planner is not None:
+                allowed = planner.allows(action, obj)
+                if allowed is not None:
+                    if allowed:
+                        return True
+                    continue
+
             # Handle intermediate model lookup automatically
             intermediate_model_name = action.get("intermediate_model")
             if intermediate_model_name:
@@ -0,0 +1,285 @@
+"""
+Typeahead backend for Select2 dropdowns.
+
+Models can opt in by declaring the fields that should be searched and an
+optional label expression that renders the option text in SQL instead of
+calling ``__str__`` on every row::
+
+    class Contact(HorillaCoreModel):
+        TYPEAHEAD_FIELDS = ["first_name", "last_name", "email"]
+        TYPEAHEAD_LABEL = Concat("first_name", Value(" "), "last_name")
+
+Short terms only match the start of declared fields that get a typeahead
+index. Models that do not declare anything fall back to a substring search
+of every ``CharField``/``TextField`` and labelling with ``str(obj)``. In
+both cases
+results are paginated by keyset (``pk > cursor``) with a LIMIT+1 probe for
+the "more" flag, so no COUNT or OFFSET query is issued.
+"""
+
+# Standard library
+import hashlib
+import logging
+from functools import cached_property, lru_cache
+
+# Third-party
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.db.models import CharField, F, Q, TextField
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+TYPEAHEAD_PER_PAGE = 10
+TYPEAHEAD_CONTAINS_MIN_LENGTH = 3
+LABEL_ANNOTATION = "_typeahead_label"
+
+
+def _label_cache_timeout():
+    return getattr(settings, "TYPEAHEAD_LABEL_CACHE_TIMEOUT", 600)
+
+
+class TypeaheadSpec:
+    """Resolved typeahead configuration for a single model."""
+
+    def __init__(self, model):
+        self.model = model
+        self.declared = hasattr(model, "TYPEAHEAD_FIELDS")
+        if self.declared:
+            self.search_fields = list(model.TYPEAHEAD_FIELDS)
+        else:
+            self.search_fields = [
+                f.name
+                for f in model._meta.fields
+                if isinstance(f, (CharField, TextField)) and f.name != "id"
+            ]
+        label = getattr(model, "TYPEAHEAD_LABEL", None)
+        self.label_expression = F(label) if isinstance(label, str) else label
+
+    @cached_property
+    def indexed_fields(self):
+        """
+        Declared search fields that are concrete columns of the model table,
+        i.e. the fields :func:`ensure_typeahead_indexes` creates indexes for.
+        """
+        if not self.declared:
+            return []
+        fields = []
+        for field_name in self.search_fields:
+            try:
+                field = self.model._meta.get_field(field_name)
+            except Exception:
+                continue
+            if getattr(field, "concrete", False) and field.model is self.model:
+                fields.append(field)
+        return fields
+
+    @property
+    def label_key_prefix(self):
+        """Cache key prefix for labels of this model."""
+        return f"typeahead_label:{self.model._meta.label_lower}"
+
+    def label_cache_key(self, pk):
+        """Cache key holding the label of a single object."""
+        return f"{self.label_key_prefix}:{pk}"
+
+    def search_filter(self, term):
+        """
+        Build the search condition for ``term``.
+
+        Fields are matched by substring, which PostgreSQL serves from the
+        trigram index created by :func:`ensure_typeahead_indexes`. Terms
+        shorter than ``TYPEAHEAD_CONTAINS_MIN_LENGTH`` use a prefix match on
+        the indexed fields instead, which the btree index can serve.
+        """
+        if not self.search_fields:
+            return None
+        prefix_fields = set()
+        if len(term) < TYPEAHEAD_CONTAINS_MIN_LENGTH:
+            prefix_fields = {field.name for field in self.indexed_fields}
+        query = Q()
+        for field in self.search_fields:
+            lookup = "istartswith" if field in prefix_fields else "icontains"
+            query |= Q(**{f"{field}__{lookup}": term})
+        return query
+
+    def rows(self, queryset):
+        """Yield ``(pk, label)`` pairs for ``queryset``."""
+        model_name = self.model._meta.model_name
+        if self.label_expression is not None:
+            queryset = queryset.annotate(
+                **{LABEL_ANNOTATION: self.label_expression}
+            ).values_list("pk", LABEL_ANNOTATION)
+            for pk, label in queryset:
+                yield pk, label or f"Unnamed {model_name} {pk}"
+        else:
+            for obj in queryset:
+                yield obj.pk, str(obj) or f"Unnamed {model_name} {obj.pk}"
+
+
+@lru_cache(maxsize=None)
+def get_typeahead_spec(model):
+    """Return the (cached) :class:`TypeaheadSpec` for ``model``."""
+    return TypeaheadSpec(model)
+
+
+def search(queryset, term="", cursor=None, page=1, per_page=TYPEAHEAD_PER_PAGE):
+    """
+    Return one page of select2 results for ``queryset``.
+
+    ``cursor`` is the last primary key of the previous page. When a client
+    does not send it (older select2 callers only send ``page``) the page is
+    located by slicing instead, still without a COUNT query.
+
+    Returns a tuple ``(results, more, next_cursor)``.
+    """
+    spec = get_typeahead_spec(queryset.model)
+    if term:
+        condition = spec.search_filter(term)
+        if condition is None:
+            return [], False, None
+        queryset = queryset.filter(condition)
+
+    queryset = queryset.order_by("pk")
+    if cursor is not None:
+        queryset = queryset.filter(pk__gt=cursor)[: per_page + 1]
+    else:
+        offset = (max(page, 1) - 1) * per_page
+        queryset = queryset[offset : offset + per_page + 1]
+
+    rows = list(spec.rows(queryset))
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    results = [{"id": pk, "text": label} for pk, label in rows]
+    next_cursor = rows[-1][0] if more else None
+    return results, more, next_cursor
+
+
+def resolve_labels(queryset, ids):
+    """
+    Return select2 results for the given primary keys.
+
+    Visibility is still checked against ``queryset`` with a cheap ``pk``-only
+    query; only the label rendering is served from the cache.
+    """
+    spec = get_typeahead_spec(queryset.model)
+    visible_ids = list(
+        queryset.filter(pk__in=ids).order_by("pk").values_list("pk", flat=True)
+    )
+    if not visible_ids:
+        return []
+
+    # Only models connected by watch_typeahead_models() at startup are
+    # invalidated from every process, so only their labels are cached.
+    if not spec.declared:
+        labels = dict(spec.rows(spec.model._base_manager.filter(pk__in=visible_ids)))
+        return [{"id": pk, "text": labels[pk]} for pk in visible_ids if pk in labels]
+
+    keys = {pk: spec.label_cache_key(pk) for pk in visible_ids}
+    cached = cache.get_many(list(keys.values()))
+    labels = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+    missing = [pk for pk in visible_ids if pk not in labels]
+    if missing:
+        fresh = dict(spec.rows(spec.model._base_manager.filter(pk__in=missing)))
+        labels.update(fresh)
+        cache.set_many(
+            {keys[pk]: label for pk, label in fresh.items()},
+            _label_cache_timeout(),
+        )
+
+    return [{"id": pk, "text": labels[pk]} for pk in visible_ids if pk in labels]
+
+
+def invalidate_label(sender, instance, **kwargs):
+    """Drop the cached label of ``instance`` when it is saved or deleted."""
+    cache.delete(get_typeahead_spec(sender).label_cache_key(instance.pk))
+
+
+@lru_cache(maxsize=None)
+def watch_model(model):
+    """Connect label invalidation for ``model`` (idempotent)."""
+    uid = f"typeahead_label_{model._meta.label_lower}"
+    post_save.connect(invalidate_label, sender=model, dispatch_uid=uid)
+    post_delete.connect(invalidate_label, sender=model, dispatch_uid=uid)
+
+
+def typeahead_models():
+    """Return every installed model that declares ``TYPEAHEAD_FIELDS``."""
+    return [m for m in apps.get_models() if hasattr(m, "TYPEAHEAD_FIELDS")]
+
+
+def watch_typeahead_models():
+    """
+    Connect label invalidation for every model in :func:`typeahead_models`.
+
+    Called from ``HorillaGenericsConfig.ready`` so saves made by any web
+    worker or Celery process drop the cached labels.
+    """
+    for model in typeahead_models():
+        watch_model(model)
+
+
+def _index_name(table, column, suffix):
+    digest = hashlib.md5(f"{table}.{column}".encode()).hexdigest()[:10]
+    return f"ta_{table[:30]}_{digest}_{suffix}"
+
+
+def _index_statements(vendor, quote, table, column, trigram=True):
+    if vendor == "postgresql":
+        statements = [
+            f"CREATE INDEX IF NOT EXISTS {quote(_index_name(table, column, 'pfx'))} "
+            f"ON {quote(table)} (UPPER({quote(column)}::text) text_pattern_ops)"
+        ]
+        if trigram:
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {quote(_index_name(table, column, 'trgm'))} "
+                f"ON {quote(table)} USING gin (UPPER({quote(column)}::text) gin_trgm_ops)"
+            )
+        return statements
+    if vendor == "sqlite":
+        return [
+            f"CREATE INDEX IF NOT EXISTS {quote(_index_name(table, column, 'pfx'))} "
+            f"ON {quote(table)} ({quote(column)} COLLATE NOCASE)"
+        ]
+    return []
+
+
+def ensure_typeahead_indexes(using="default", **kwargs):
+    """
+    Create prefix (and on PostgreSQL trigram) indexes for typeahead fields.
+
+    Statements are idempotent, so this is safe to run after every migrate.
+    Fields that are not concrete columns on the model table are skipped.
+    """
+    connection = connections[using]
+    vendor = connection.vendor
+    quote = connection.ops.quote_name
+    trigram = False
+
+    if vendor == "postgresql":
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            trigram = True
+        except DatabaseError as e:
+            logger.warning("[Typeahead] pg_trgm extension unavailable: %s", e)
+
+    for model in typeahead_models():
+        table = model._meta.db_table
+        for field in get_typeahead_spec(model).indexed_fields:
+            for sql in _index_statements(
+                vendor, quote, table, field.column, trigram=trigram
+            ):
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(sql)
+                except DatabaseError as e:
+                    logger.warning(
+                        "[Typeahead] Could not create index on %s.%s: %s",
+                        table,
+                        field.column,
+                        e,
+                    )
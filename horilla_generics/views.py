@@ -12,6 +12,7 @@ import inspect
 import json
 import logging
 import re
+from datetime import timezone as dt_timezone
 from decimal import Decimal, InvalidOperation
 
 # Standard library
@@ -45,6 +46,7 @@ from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.db import IntegrityError, models, transaction
 from django.db.models import Case, ForeignKey, Max, Q, When
 from django.db.models.fields.related import ManyToManyField
+from django.db.models.functions import TruncDate
 from django.http import Http404, HttpResponse, QueryDict
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
@@ -83,6 +85,7 @@ from horilla_core.models import (
     RecycleBin,
 )
 from horilla_core.utils import filter_hidden_fields, get_field_permissions_for_model
+from horilla_generics.action_permissions import ActionPermissionPlanner
 from horilla_generics.forms import (
     HorillaAttachmentForm,
     HorillaHistoryForm,
@@ -2298,9 +2301,23 @@ class HorillaListView(ListView):
 
         return response
 
+    def get_action_planner(self):
+        """Return the planner that filters the row actions of this page."""
+        if not hasattr(self, "_action_planner"):
+            self._action_planner = ActionPermissionPlanner(
+                self.request.user,
+                self.model,
+                [self.actions, self.col_attrs, getattr(self, "kanban_attrs", None)],
+            )
+        return self._action_planner
+
     def get_context_data(self, **kwargs):
         """Enhance context with column and filtering information."""
+        if hasattr(self, "object_list"):
+            # Row ownership is selected with the page instead of per action.
+            self.object_list = self.get_action_planner().annotate(self.object_list)
         context = super().get_context_data(**kwargs)
+        context["action_planner"] = self.get_action_planner()
         if self.store_ordered_ids:
             context["ordered_ids_key"] = self.ordered_ids_key
             context["ordered_ids"] = self.request.session.get(self.ordered_ids_key, [])
@@ -3176,6 +3193,7 @@ class HorillaKanbanView(HorillaListView):
                         "id"
                     )
 
+            items = self.get_action_planner().annotate(items)
             paginate_by = getattr(self, "paginate_by", 10)
             paginator = Paginator(items, paginate_by)
             try:
@@ -3265,6 +3283,7 @@ class HorillaKanbanView(HorillaListView):
                 "model_name": self.model.__name__ if self.model else "",
                 "key": column_key,
                 "kanban_attrs": self.kanban_attrs,
+                "action_planner": self.get_action_planner(),
             }
 
             return HttpResponse(
@@ -5091,18 +5110,15 @@ class HorillaHistorySectionView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["model_name"] = self.model._meta.model_name
-        histories = self.get_object().full_histories
+        histories = self.object.full_history_queryset().annotate(
+            history_date=TruncDate("timestamp", tzinfo=dt_timezone.utc)
+        )
+        history_dates = (
+            histories.values_list("history_date", flat=True)
+            .distinct()
+            .order_by("-history_date")
+        )
 
-        history_by_date = []
-        date_dict = {}
-        for entry in histories:
-            date_key = entry.timestamp.date()
-            if date_key not in date_dict:
-                date_dict[date_key] = []
-            date_dict[date_key].append(entry)
-
-        sorted_dates = sorted(date_dict.keys(), reverse=True)
-        history_by_date = [(date, date_dict[date]) for date in sorted_dates]
         filter_form = self.filter_form_class(self.request.GET)
         filter_applied = False
         if self.request.GET:
@@ -5112,14 +5128,32 @@ class HorillaHistorySectionView(DetailView):
             )
 
             if filter_form.is_valid() and filter_applied:
-                history_by_date = filter_form.apply_filter(history_by_date)
+                history_dates = filter_form.filter_queryset(
+                    history_dates, "history_date"
+                )
 
-        paginator = Paginator(history_by_date, self.paginate_by)
+        # Pages hold whole days; only the entries of the page's days are loaded.
+        paginator = Paginator(history_dates, self.paginate_by)
         page_number = self.request.GET.get("page", 1)
         page_obj = paginator.get_page(page_number)
 
+        entries = list(
+            histories.filter(history_date__in=list(page_obj.object_list))
+            .select_related("content_type", "actor")
+            .order_by("-timestamp")
+        )
+        self.object.annotate_history_status(entries)
+        date_dict = {}
+        for entry in entries:
+            date_dict.setdefault(entry.history_date, []).append(entry)
+        page_obj.object_list = [
+            (date, date_dict[date])
+            for date in page_obj.object_list
+            if date in date_dict
+        ]
+
         context["page_obj"] = page_obj
-        context["actions"] = [str(entry).split()[0].lower() for entry in histories]
+        context["actions"] = [str(entry).split()[0].lower() for entry in entries]
         context["filter_form"] = filter_form
         context["filter_applied"] = filter_applied
 
@@ -2,14 +2,21 @@
 Celery beat schedule configuration for horilla_mail app.
 
 This module defines periodic tasks that are executed by Celery Beat,
-including scheduled email processing tasks.
+including scheduled email processing tasks and the nightly email directory
+sync.
 """
 
 from datetime import timedelta
 
+from celery.schedules import crontab
+
 HORILLA_BEAT_SCHEDULE = {
     "process-scheduled-mails-every-minute": {
         "task": "horilla_mail.tasks.process_scheduled_mails",
         "schedule": timedelta(seconds=10),
     },
+    "sync-email-directory-nightly": {
+        "task": "horilla_mail.tasks.sync_email_directory",
+        "schedule": crontab(minute=0, hour=2),  # Every day at 02:00
+    },
 }
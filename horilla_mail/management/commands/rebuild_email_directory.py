@@ -0,0 +1,82 @@
+# Third-party imports (Django)
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+
+# First-party / Horilla imports
+from horilla_mail.methods import get_email_directory_fields, split_email_addresses
+from horilla_mail.models import EmailDirectoryEntry, HorillaMail
+
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the email directory used for recipient suggestions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete all existing directory entries before rebuilding",
+        )
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            EmailDirectoryEntry.objects.all().delete()
+
+        for model in apps.get_models():
+            fields = get_email_directory_fields(model)
+            if not fields:
+                continue
+            created = self.index_model(model, fields)
+            self.stdout.write(f"{model._meta.label}: {created} addresses")
+
+        created = self.index_mails()
+        self.stdout.write(f"{HorillaMail._meta.label}: {created} addresses")
+        self.stdout.write(self.style.SUCCESS("Email directory rebuilt"))
+
+    def index_model(self, model, fields):
+        """Index every address held by ``model`` records."""
+        content_type = ContentType.objects.get_for_model(model)
+        has_company = any(f.name == "company" for f in model._meta.concrete_fields)
+        columns = ["pk", *(f.attname for f in fields)]
+        if has_company:
+            columns.append("company_id")
+
+        batch, created = [], 0
+        rows = model._base_manager.values_list(*columns).iterator(
+            chunk_size=BATCH_SIZE
+        )
+        for row in rows:
+            company_id = row[-1] if has_company else None
+            values = row[1 : len(fields) + 1]
+            addresses = set()
+            for value in values:
+                addresses |= split_email_addresses(value)
+            batch.extend(
+                EmailDirectoryEntry(
+                    address=address,
+                    content_type=content_type,
+                    object_id=row[0],
+                    company_id=company_id,
+                )
+                for address in addresses
+            )
+            if len(batch) >= BATCH_SIZE:
+                created += self.flush(batch)
+        return created + self.flush(batch)
+
+    def index_mails(self):
+        """Index mail recipients and their most recent send time."""
+        return EmailDirectoryEntry.objects.sync_mails(
+            HorillaMail.all_objects.all(), batch_size=BATCH_SIZE
+        )
+
+    @staticmethod
+    def flush(batch):
+        """Write and clear ``batch``; returns the number of entries written."""
+        count = len(batch)
+        if batch:
+            EmailDirectoryEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch.clear()
+        return count
@@ -19,3 +19,55 @@ def limit_content_types():
         includable_models.append(model._meta.model_name.lower())
 
     return models.Q(model__in=includable_models)
+
+
+EMAIL_DIRECTORY_EXCLUDED_MODELS = {
+    "session",
+    "contenttype",
+    "permission",
+    "group",
+    "logentry",
+    "horillamail",
+    "emaildirectoryentry",
+}
+
+
+def is_valid_email(email):
+    """
+    Basic email validation
+    """
+    if not email or len(email) < 5:
+        return False
+    parts = email.split("@")
+    if len(parts) != 2:
+        return False
+    return "." in parts[1]
+
+
+def split_email_addresses(value):
+    """
+    Split a comma or semicolon separated string into normalized addresses.
+
+    Returns a set of lowercased addresses that pass :func:`is_valid_email`.
+    """
+    if not value or "@" not in str(value):
+        return set()
+    parts = str(value).replace(";", ",").split(",")
+    return {p.strip().lower() for p in parts if is_valid_email(p.strip())}
+
+
+def get_email_directory_fields(model):
+    """
+    Return the concrete fields of ``model`` that hold email addresses.
+
+    A field qualifies when it is an ``EmailField`` or its name contains
+    "email", mirroring what the email suggestion box has always offered.
+    """
+    if model._meta.model_name in EMAIL_DIRECTORY_EXCLUDED_MODELS:
+        return []
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if not field.is_relation
+        and ("email" in field.name.lower() or field.__class__.__name__ == "EmailField")
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:38
+
+import django.db.models.deletion
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("horilla_core", "0006_alter_kanbangroupby_model_name"),
+        ("horilla_mail", "0003_horillamailtemplate_subject"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailDirectoryEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("address", models.CharField(db_index=True, max_length=254)),
+                ("object_id", models.PositiveIntegerField()),
+                ("last_used", models.DateTimeField(blank=True, null=True)),
+                (
+                    "company",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="horilla_core.company",
+                    ),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["company", "address"],
+                        name="horilla_mai_company_8dd590_idx",
+                    ),
+                    models.Index(
+                        fields=["company", "last_used"],
+                        name="horilla_mai_company_d0ca67_idx",
+                    ),
+                ],
+                "unique_together": {("address", "content_type", "object_id")},
+            },
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+    ]
@@ -2,19 +2,31 @@
 
 import mimetypes
 import re
+from itertools import islice
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import F, Max, Q
 from django.template import engines
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
-from horilla_core.models import HorillaContentType, HorillaCoreModel, upload_path
+from horilla.registry.permission_registry import permission_exempt_model
+from horilla_core.models import (
+    Company,
+    HorillaContentType,
+    HorillaCoreModel,
+    upload_path,
+)
 from horilla_mail.encryption_utils import decrypt_password
 from horilla_mail.fields import EncryptedCharField
-from horilla_mail.methods import limit_content_types
+from horilla_mail.methods import (
+    get_email_directory_fields,
+    limit_content_types,
+    split_email_addresses,
+)
 from horilla_utils.methods import render_template
 from horilla_utils.middlewares import _thread_local
 
@@ -407,3 +419,246 @@ class HorillaMailTemplate(HorillaCoreModel):
         if self.content_type:
             return self.content_type.model_class()._meta.verbose_name.title()
         return "General"
+
+
+class EmailDirectoryManager(models.Manager):
+    """
+    Manager for EmailDirectoryEntry to keep the directory in sync and query it.
+    """
+
+    def sync_instance(self, instance):
+        """Replace the directory entries sourced from ``instance``."""
+        fields = get_email_directory_fields(instance.__class__)
+        if not fields or instance.pk is None:
+            return
+        addresses = set()
+        for field in fields:
+            addresses |= split_email_addresses(getattr(instance, field.attname, None))
+
+        content_type = ContentType.objects.get_for_model(instance.__class__)
+        entries = self.filter(content_type=content_type, object_id=instance.pk)
+        existing = set(entries.values_list("address", flat=True))
+        if existing - addresses:
+            entries.filter(address__in=existing - addresses).delete()
+        if addresses - existing:
+            company_id = getattr(instance, "company_id", None)
+            self.bulk_create(
+                [
+                    self.model(
+                        address=address,
+                        content_type=content_type,
+                        object_id=instance.pk,
+                        company_id=company_id,
+                    )
+                    for address in addresses - existing
+                ],
+                ignore_conflicts=True,
+            )
+
+    def sync_queryset(self, queryset, batch_size=2000):
+        """
+        Replace the directory entries sourced from every record of
+        ``queryset`` with a few queries per batch of records, for records
+        written without model signals. Returns the number of records synced.
+        """
+        model = queryset.model
+        fields = get_email_directory_fields(model)
+        if not fields:
+            return 0
+        content_type = ContentType.objects.get_for_model(model)
+        has_company = any(f.name == "company" for f in model._meta.concrete_fields)
+        columns = ["pk", *(f.attname for f in fields)]
+        if has_company:
+            columns.append("company_id")
+
+        rows = queryset.order_by().values_list(*columns).iterator(chunk_size=batch_size)
+        synced = 0
+        while batch := list(islice(rows, batch_size)):
+            wanted = {}
+            for row in batch:
+                company_id = row[-1] if has_company else None
+                for value in row[1 : len(fields) + 1]:
+                    for address in split_email_addresses(value):
+                        wanted[(row[0], address)] = company_id
+
+            entries = self.filter(
+                content_type=content_type, object_id__in=[row[0] for row in batch]
+            )
+            existing = {
+                (object_id, address): pk
+                for pk, object_id, address in entries.values_list(
+                    "pk", "object_id", "address"
+                )
+            }
+            stale = [pk for key, pk in existing.items() if key not in wanted]
+            if stale:
+                self.filter(pk__in=stale).delete()
+            self.bulk_create(
+                [
+                    self.model(
+                        address=address,
+                        content_type=content_type,
+                        object_id=object_id,
+                        company_id=company_id,
+                    )
+                    for (object_id, address), company_id in wanted.items()
+                    if (object_id, address) not in existing
+                ],
+                ignore_conflicts=True,
+            )
+            synced += len(batch)
+        return synced
+
+    def remove_instance(self, instance):
+        """Drop the directory entries sourced from ``instance``."""
+        content_type = ContentType.objects.get_for_model(instance.__class__)
+        self.filter(content_type=content_type, object_id=instance.pk).delete()
+
+    def record_mail(self, mail):
+        """
+        Record the recipients of ``mail``.
+
+        Addresses not yet known in the mail's company are added with the mail
+        as their source; once the mail has been sent, ``last_used`` is bumped
+        for every entry of those addresses.
+        """
+        addresses = set()
+        for value in (mail.to, mail.cc, mail.bcc):
+            addresses |= split_email_addresses(value)
+        if not addresses:
+            return
+
+        scoped = self.filter(company_id=mail.company_id, address__in=addresses)
+        known = set(scoped.values_list("address", flat=True))
+        if addresses - known:
+            content_type = ContentType.objects.get_for_model(mail.__class__)
+            self.bulk_create(
+                [
+                    self.model(
+                        address=address,
+                        content_type=content_type,
+                        object_id=mail.pk,
+                        company_id=mail.company_id,
+                    )
+                    for address in addresses - known
+                ],
+                ignore_conflicts=True,
+            )
+        if mail.mail_status == "sent" and mail.sent_at:
+            scoped.filter(
+                Q(last_used__isnull=True) | Q(last_used__lt=mail.sent_at)
+            ).update(last_used=mail.sent_at)
+
+    def sync_mails(self, queryset, batch_size=2000):
+        """
+        Record the recipients of every mail of ``queryset`` like
+        ``record_mail``, with a few queries per batch of mails, for mails
+        written without model signals. Returns the number of mails synced.
+        """
+        content_type = ContentType.objects.get_for_model(queryset.model)
+        rows = (
+            queryset.order_by()
+            .values_list(
+                "pk", "to", "cc", "bcc", "company_id", "mail_status", "sent_at"
+            )
+            .iterator(chunk_size=batch_size)
+        )
+        synced = 0
+        while batch := list(islice(rows, batch_size)):
+            seen = {}
+            for pk, to, cc, bcc, company_id, status, sent_at in batch:
+                used = sent_at if status == "sent" else None
+                addresses = set()
+                for value in (to, cc, bcc):
+                    addresses |= split_email_addresses(value)
+                for address in addresses:
+                    source, last_used = seen.get((company_id, address), (pk, None))
+                    if used and (last_used is None or used > last_used):
+                        last_used = used
+                    seen[(company_id, address)] = (source, last_used)
+
+            known = {}
+            entries = self.filter(address__in={address for _, address in seen})
+            for company_id, address, last_used in entries.values_list(
+                "company_id", "address", "last_used"
+            ):
+                if (company_id, address) in seen:
+                    current = known.get((company_id, address))
+                    if last_used and (current is None or last_used > current):
+                        current = last_used
+                    known[(company_id, address)] = current
+
+            for key, (source, last_used) in seen.items():
+                if key in known and last_used:
+                    if known[key] is None or last_used > known[key]:
+                        company_id, address = key
+                        self.filter(company_id=company_id, address=address).filter(
+                            Q(last_used__isnull=True) | Q(last_used__lt=last_used)
+                        ).update(last_used=last_used)
+            self.bulk_create(
+                [
+                    self.model(
+                        address=address,
+                        content_type=content_type,
+                        object_id=source,
+                        company_id=company_id,
+                        last_used=last_used,
+                    )
+                    for (company_id, address), (source, last_used) in seen.items()
+                    if (company_id, address) not in known
+                ],
+                ignore_conflicts=True,
+            )
+            synced += len(batch)
+        return synced
+
+    def suggest(self, prefix="", company=None, exclude=None, limit=15):
+        """
+        Return up to ``limit`` distinct addresses starting with ``prefix``,
+        most recently used first.
+        """
+        queryset = self.all()
+        if company:
+            queryset = queryset.filter(Q(company=company) | Q(company__isnull=True))
+        if prefix:
+            queryset = queryset.filter(address__startswith=prefix.strip().lower())
+        if exclude:
+            queryset = queryset.exclude(address__in=exclude)
+        return list(
+            queryset.values("address")
+            .annotate(used=Max("last_used"))
+            .order_by(F("used").desc(nulls_last=True), "address")
+            .values_list("address", flat=True)[:limit]
+        )
+
+
+@permission_exempt_model
+class EmailDirectoryEntry(models.Model):
+    """
+    Normalized email address index used for recipient suggestions.
+    """
+
+    address = models.CharField(max_length=254, db_index=True)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    source = GenericForeignKey("content_type", "object_id")
+    company = models.ForeignKey(
+        Company, on_delete=models.CASCADE, null=True, blank=True
+    )
+    last_used = models.DateTimeField(null=True, blank=True)
+    all_objects = models.Manager()
+    objects = EmailDirectoryManager()
+
+    class Meta:
+        """
+        Meta options for the EmailDirectoryEntry model.
+        """
+
+        unique_together = ["address", "content_type", "object_id"]
+        indexes = [
+            models.Index(fields=["company", "address"]),
+            models.Index(fields=["company", "last_used"]),
+        ]
+
+    def __str__(self):
+        return self.address
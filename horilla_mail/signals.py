@@ -2,10 +2,20 @@
 horilla_mail signals module
 """
 
-from django.db.models.signals import post_delete
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.dispatch import receiver
 
-from horilla_mail.models import HorillaMailAttachment
+from horilla_core.services.import_service import imported_records
+from horilla_core.signals import import_finished
+from horilla_mail.methods import get_email_directory_fields
+from horilla_mail.models import EmailDirectoryEntry, HorillaMail, HorillaMailAttachment
+from horilla_mail.tasks import sync_email_directory as sync_email_directory_task
+
+logger = logging.getLogger(__name__)
 
 # Define your horilla_mail signals here
 
@@ -17,3 +27,66 @@ def auto_delete_file_on_delete(sender, instance, **kwargs):
         storage, path = instance.file.storage, instance.file.path
         if storage.exists(path):
             storage.delete(path)
+
+
+@receiver(post_save, sender=HorillaMail)
+def record_mail_recipients(sender, instance, **kwargs):
+    """Add mail recipients to the email directory and bump their last use."""
+    EmailDirectoryEntry.objects.record_mail(instance)
+
+
+def sync_email_directory(sender, instance, **kwargs):
+    """Refresh the email directory entries sourced from a saved record."""
+    EmailDirectoryEntry.objects.sync_instance(instance)
+
+
+def remove_from_email_directory(sender, instance, **kwargs):
+    """Drop the email directory entries sourced from a deleted record."""
+    EmailDirectoryEntry.objects.remove_instance(instance)
+
+
+@receiver(import_finished)
+def sync_imported_email_directory(sender, company=None, since=None, **kwargs):
+    """Index the addresses of records written by an import."""
+    if get_email_directory_fields(sender):
+        EmailDirectoryEntry.objects.sync_queryset(
+            imported_records(sender, company, since)
+        )
+
+
+def _queue_email_directory_sync():
+    try:
+        sync_email_directory_task.delay()
+        return
+    except Exception as e:
+        logger.warning("Could not queue email directory sync: %s", e)
+    try:
+        sync_email_directory_task()
+    except Exception as e:
+        logger.error("Error syncing email directory: %s", e)
+
+
+@receiver(post_migrate)
+def populate_email_directory(sender, **kwargs):
+    """
+    Queue the first sync of the email directory while it is still empty,
+    e.g. right after the directory table was installed
+    """
+    if sender.name != "horilla_mail":
+        return
+    try:
+        if EmailDirectoryEntry.all_objects.exists():
+            return
+    except Exception as e:
+        logger.warning("Could not look up email directory entries: %s", e)
+        return
+    transaction.on_commit(_queue_email_directory_sync)
+
+
+for _model in apps.get_models():
+    if get_email_directory_fields(_model):
+        _uid = f"email_directory_{_model._meta.label_lower}"
+        post_save.connect(sync_email_directory, sender=_model, dispatch_uid=_uid)
+        post_delete.connect(
+            remove_from_email_directory, sender=_model, dispatch_uid=_uid
+        )
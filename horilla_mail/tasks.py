@@ -199,6 +199,29 @@ def process_scheduled_mails():
     return f"Queued {count} mails"
 
 
+@shared_task
+def sync_email_directory():
+    """
+    Nightly sync of the email directory with the records it indexes, picking
+    up changes made without model signals (queryset updates, bulk writes)
+    and the recipients of mails
+    """
+    from django.apps import apps
+
+    from horilla_mail.methods import get_email_directory_fields
+    from horilla_mail.models import EmailDirectoryEntry, HorillaMail
+
+    synced = 0
+    for model in apps.get_models():
+        if get_email_directory_fields(model):
+            synced += EmailDirectoryEntry.objects.sync_queryset(
+                model._base_manager.all()
+            )
+    synced += EmailDirectoryEntry.objects.sync_mails(HorillaMail.all_objects.all())
+    logger.info("Synced email directory entries of %s records", synced)
+    return f"Synced {synced} records"
+
+
 @shared_task
 def send_mail_async(mail_id, context=None):
     """
@@ -26,6 +26,7 @@ from django.views.generic import TemplateView
 from horilla_core.decorators import htmx_required, permission_required_or_denied
 from horilla_generics.views import HorillaSingleDeleteView
 from horilla_mail.models import (
+    EmailDirectoryEntry,
     HorillaMail,
     HorillaMailAttachment,
     HorillaMailConfiguration,
@@ -572,89 +573,6 @@ class EmailSuggestionView(LoginRequiredMixin, View):
     View to get email suggestions (updated to work with pills)
     """
 
-    def get_all_emails_from_models(self):
-        """
-        Extract all email addresses from all models in the project
-        """
-        all_emails = set()
-
-        for model in apps.get_models():
-            model_name = model._meta.model_name.lower()
-            if model_name in [
-                "session",
-                "contenttype",
-                "permission",
-                "group",
-                "logentry",
-            ]:
-                continue
-
-            for field in model._meta.get_fields():
-                if (
-                    "email" in field.name.lower()
-                    or field.__class__.__name__ == "EmailField"
-                ):
-
-                    try:
-                        values = model.objects.values_list(
-                            field.name, flat=True
-                        ).distinct()
-                        for value in values:
-                            if value and "@" in str(value):
-                                self._extract_emails_from_string(str(value), all_emails)
-                    except Exception:
-                        continue
-
-        try:
-            for field_name in ["to", "cc", "bcc"]:
-                try:
-                    email_values = HorillaMail.objects.values_list(
-                        field_name, flat=True
-                    ).distinct()
-                    for email_string in email_values:
-                        if email_string:
-                            self._extract_emails_from_string(email_string, all_emails)
-                except Exception:
-                    continue
-
-        except ImportError:
-            pass
-
-        valid_emails = []
-        for email in all_emails:
-            if self._is_valid_email(email):
-                valid_emails.append(email.lower())
-
-        return sorted(list(set(valid_emails)))
-
-    def _extract_emails_from_string(self, email_string, email_set):
-        """
-        Extract individual emails from a string that might contain multiple emails
-        """
-        if "," in email_string:
-            emails = [email.strip() for email in email_string.split(",")]
-            email_set.update(emails)
-        elif ";" in email_string:
-            emails = [email.strip() for email in email_string.split(";")]
-            email_set.update(emails)
-        else:
-            email_set.add(email_string.strip())
-
-    def _is_valid_email(self, email):
-        """
-        Basic email validation
-        """
-        if not email or len(email) < 5:
-            return False
-        if "@" not in email:
-            return False
-        parts = email.split("@")
-        if len(parts) != 2:
-            return False
-        if "." not in parts[1]:
-            return False
-        return True
-
     def get(self, request, *args, **kwargs):
         """
         Return email suggestions based on search query
@@ -669,36 +587,12 @@ class EmailSuggestionView(LoginRequiredMixin, View):
                 e.strip().lower() for e in current_email_list.split(",") if e.strip()
             ]
 
-        all_emails = self.get_all_emails_from_models()
-
-        available_emails = [
-            email for email in all_emails if email.lower() not in existing_emails
-        ]
-
-        if current_input:
-            search_lower = current_input.lower()
-            filtered_emails = [
-                email for email in available_emails if search_lower in email.lower()
-            ]
-            exact_matches = [e for e in filtered_emails if e.lower() == search_lower]
-            starts_with = [
-                e
-                for e in filtered_emails
-                if e.lower().startswith(search_lower) and e not in exact_matches
-            ]
-            contains = [
-                e
-                for e in filtered_emails
-                if search_lower in e.lower()
-                and e not in exact_matches
-                and e not in starts_with
-            ]
-
-            filtered_emails = exact_matches + starts_with + contains
-        else:
-            filtered_emails = available_emails[:10]
-
-        filtered_emails = filtered_emails[:15]
+        filtered_emails = EmailDirectoryEntry.objects.suggest(
+            prefix=current_input,
+            company=getattr(request, "active_company", None),
+            exclude=existing_emails,
+            limit=15 if current_input else 10,
+        )
 
         context = {
             "emails": filtered_emails,
@@ -14,6 +14,7 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from horilla.utils.layout_context import bump_user_layout_version
 from horilla_core.api.docs import BULK_DELETE_DOCS, BULK_UPDATE_DOCS, SEARCH_FILTER_DOCS
 from horilla_core.api.mixins import BulkOperationsMixin, SearchFilterMixin
 from horilla_notifications.api.docs import NOTIFICATION_API_DOCS
@@ -91,7 +92,23 @@ class NotificationViewSet(
     @action(detail=False, methods=["post"])
     def bulk_update(self, request):
         """Update multiple notifications in a single request"""
-        return super().bulk_update(request)
+        # queryset.update() sends no signals, so retire the recipients'
+        # cached layouts (unread counts) here. They are read before the
+        # update, which may change the fields the filters select on.
+        ids = request.data.get("ids", [])
+        filters = request.data.get("filters", {})
+        user_ids = set()
+        if ids or filters:
+            queryset = self.get_queryset()
+            if ids:
+                queryset = queryset.filter(id__in=ids)
+            queryset = self._apply_filters_to_queryset(queryset, filters)
+            user_ids = set(queryset.values_list("user_id", flat=True).distinct())
+
+        response = super().bulk_update(request)
+        if response.status_code == status.HTTP_200_OK:
+            bump_user_layout_version(*user_ids)
+        return response
 
     @swagger_auto_schema(
         request_body=bulk_delete_body, operation_description=BULK_DELETE_DOCS
@@ -105,6 +122,7 @@ class NotificationViewSet(
     def mark_all_as_read(self, request):
         """Mark all notifications as read for the current user"""
         Notification.objects.filter(user=request.user, read=False).update(read=True)
+        bump_user_layout_version(request.user.pk)
         return Response(
             {"status": "success", "message": "All notifications marked as read"},
             status=status.HTTP_200_OK,
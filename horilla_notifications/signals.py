@@ -1,9 +1,11 @@
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.urls import reverse
 
+from horilla.utils.layout_context import bump_user_layout_version
+
 from .models import Notification
 
 
@@ -24,3 +26,10 @@ def send_notification(sender, instance, created, **kwargs):
                 ),
             },
         )
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def retire_notification_layout_context(sender, instance, **kwargs):
+    """Unread notifications are part of the recipient's cached layout."""
+    bump_user_layout_version(instance.user_id)
@@ -7,6 +7,7 @@ from django.utils.decorators import method_decorator
 from django.views import View
 
 # First-party / Horilla imports
+from horilla.utils.layout_context import bump_user_layout_version
 from horilla_core.decorators import htmx_required
 
 # Local application imports
@@ -27,6 +28,7 @@ class MarkNotificationReadView(LoginRequiredMixin, View):
 class MarkAllNotificationsReadView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         Notification.objects.filter(user=request.user, read=False).update(read=True)
+        bump_user_layout_version(request.user.pk)
         messages.success(request, "All notifications marked as read.")
         unread_notifications = Notification.objects.filter(
             user=request.user, read=False
@@ -899,6 +899,7 @@ function initializeSelect2Pagination() {
                         const requestData = {
                             q: params.term || '',
                             page: params.page || 1,
+                            cursor: params.page > 1 ? $this.data('select2-cursor') : undefined,
                             field_name: fieldName,
                             form_class: $this.data('form-class'),
                             dependency_value: dependencyValue,
@@ -918,6 +919,7 @@ function initializeSelect2Pagination() {
                     },
                     processResults: function (data, params) {
                         params.page = params.page || 1;
+                        $this.data('select2-cursor', data.pagination && data.pagination.cursor);
                         return {
                             results: data.results || [],
                             pagination: {